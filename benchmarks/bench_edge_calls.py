@@ -0,0 +1,87 @@
+"""
+Benchmarks the number of edge evaluations per second for the functions
+in `constrainthg.relations`, comparing a call path that inspects the
+signature of each method on every call (the previous behavior of
+`Edge.filtered_call`) against the precompiled argument binders.
+
+Run from the repository root with::
+
+    python benchmarks/bench_edge_calls.py
+"""
+
+from inspect import signature
+import time
+
+from constrainthg.hypergraph import Edge, Node
+import constrainthg.relations as R
+
+
+def signature_call(source_vals: dict, method):
+    """Calls the method by inspecting its signature on every call."""
+    args, kwargs = [], {}
+    remaining_keys = list(source_vals.keys())
+    has_var_args, has_var_kwargs = False, False
+    for p in signature(method).parameters.values():
+        if p.name in source_vals:
+            if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD):
+                args.append(source_vals[p.name])
+            elif p.kind == p.KEYWORD_ONLY:
+                kwargs[p.name] = source_vals[p.name]
+            remaining_keys.remove(p.name)
+        elif p.kind == p.VAR_POSITIONAL:
+            has_var_args = True
+        elif p.kind == p.VAR_KEYWORD:
+            has_var_kwargs = True
+    if has_var_kwargs:
+        kwargs.update({k: source_vals[k] for k in remaining_keys})
+    elif has_var_args:
+        args.extend([source_vals[k] for k in remaining_keys])
+    return method(*args, **kwargs)
+
+
+def signature_process(edge: Edge, source_vals: dict, source_indices: dict):
+    """Evaluates the edge by inspecting each method on every call."""
+    if not signature_call(source_indices, edge.index_via):
+        return None
+    if signature_call(source_vals, edge.via):
+        return signature_call(source_vals, edge.rel)
+    return None
+
+
+def rate(func, num_calls: int) -> float:
+    """Returns the number of calls to `func` per second."""
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        func()
+    return num_calls / (time.perf_counter() - start)
+
+
+def main(num_calls: int=20000):
+    relations = {
+        'Rsum': R.Rsum,
+        'Rmultiply': R.Rmultiply,
+        'Rsubtract': R.Rsubtract,
+        'Rdivide': R.Rdivide,
+        'Rmean': R.Rmean,
+        'Rincrement': R.Rincrement,
+        'Rfirst': R.Rfirst,
+        'equal': R.equal('s1'),
+    }
+    a, b, c = Node('A'), Node('B'), Node('C')
+    source_vals = {'s1': 3.0, 's2': 2.0}
+    source_indices = {'s1': 1, 's2': 1}
+
+    print(f'{"relation":>12} | {"signature / s":>14} | '
+          f'{"binder / s":>12} | {"speedup":>7}')
+    for name, rel in relations.items():
+        edge = Edge(name, {'s1': a, 's2': b}, c, rel)
+        before = rate(lambda: signature_process(edge, source_vals,
+                                                source_indices), num_calls)
+        after = rate(lambda: edge.process_values(source_vals,
+                                                 source_indices), num_calls)
+        print(f'{name:>12} | {before:>14,.0f} | {after:>12,.0f} | '
+              f'{after / before:>6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
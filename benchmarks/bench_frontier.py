@@ -0,0 +1,48 @@
+"""
+Benchmarks the search frontier used by the Pathfinder, reporting the
+number of pops per second as the number of open TNodes grows.
+
+Run from the repository root with::
+
+    python benchmarks/bench_frontier.py
+"""
+
+import random
+import time
+
+from constrainthg.hypergraph import Frontier, TNode
+
+
+def make_tnodes(num: int, num_indices: int=100, seed: int=0) -> list:
+    """Returns a list of TNodes with random indices and costs."""
+    rng = random.Random(seed)
+    tnodes = []
+    for i in range(num):
+        t = TNode(f'n#{i}', 'n', i, cost=float(rng.randint(0, 50)))
+        t.index = rng.randint(1, num_indices)
+        tnodes.append(t)
+    return tnodes
+
+
+def bench_pops(size: int, num_pops: int=2000) -> float:
+    """Returns the pops per second for a frontier holding `size` roots,
+    where each pop is followed by a push to hold the size constant."""
+    tnodes = make_tnodes(size + num_pops)
+    frontier = Frontier(tnodes[:size])
+    refill = iter(tnodes[size:])
+    start = time.perf_counter()
+    for _ in range(num_pops):
+        frontier.pop()
+        frontier.push(next(refill))
+    elapsed = time.perf_counter() - start
+    return num_pops / elapsed
+
+
+def main():
+    print(f'{"frontier size":>14} | {"pops / s":>12}')
+    for size in [10, 100, 1000, 10000, 100000]:
+        print(f'{size:>14} | {bench_pops(size):>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
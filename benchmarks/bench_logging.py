@@ -0,0 +1,48 @@
+"""
+Benchmarks the solve time of the pendulum demo at the WARNING logging
+level with and without debugging instrumentation (`debug_nodes` and
+`debug_edges`) requested, to show that the diagnostics are not built
+when they will not be logged.
+
+Run from the repository root with::
+
+    python benchmarks/bench_logging.py
+"""
+
+import logging
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'demos'))
+
+import demo_pendulum
+
+
+def time_solve(hg, repeats: int=5, **kwargs) -> float:
+    """Returns the fastest time (in seconds) to solve the pendulum."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        hg.solve('theta', min_index=100, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    hg = demo_pendulum.hg
+    logging.getLogger('constrainthg').setLevel(logging.WARNING)
+    cases = {
+        'no instrumentation': {},
+        'debug all nodes': {'debug_nodes': list(hg.nodes)},
+        'debug all edges': {'debug_edges': list(hg.edges)},
+        'debug everything': {'debug_nodes': list(hg.nodes),
+                             'debug_edges': list(hg.edges)},
+    }
+    print(f'{"case":>20} | {"solve time (ms)":>15}')
+    for name, kwargs in cases.items():
+        print(f'{name:>20} | {time_solve(hg, **kwargs) * 1000:>15.1f}')
+
+
+if __name__ == '__main__':
+    main()
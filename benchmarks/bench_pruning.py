@@ -0,0 +1,63 @@
+"""
+Benchmarks pruning the search to the edges the target depends on, for a
+synthetic hypergraph of 10,000 nodes where the target depends on only 1%
+of the nodes, comparing a search of every edge against a search of the
+target's ancestors.
+
+Run from the repository root with::
+
+    python benchmarks/bench_pruning.py
+"""
+
+import time
+
+from constrainthg.hypergraph import Hypergraph, Pathfinder
+import constrainthg.relations as R
+
+
+def make_hypergraph(num_nodes: int=10000, chain_length: int=100) -> Hypergraph:
+    """Returns a hypergraph of chains of nodes leading from a shared
+    source node 'S', where only the first chain leads to the target
+    'T'."""
+    hg = Hypergraph()
+    for c in range(num_nodes // chain_length):
+        prev = 'S'
+        for i in range(chain_length):
+            node = 'T' if c == 0 and i == chain_length - 1 else f'n{c}_{i}'
+            hg.add_edge({'s1': prev, 's2': 'K'}, node, R.Rsum)
+            prev = node
+    return hg
+
+
+def bench_search(hg: Hypergraph, prune: bool, num_runs: int=5) -> tuple:
+    """Returns the seconds per search and the number of explored TNodes
+    when searching for the target with and without pruning."""
+    relevant_edges = hg.get_ancestor_edges('T') if prune else None
+    start = time.perf_counter()
+    for _ in range(num_runs):
+        context, target, sources = hg.start_solve('T', {'S': 0, 'K': 1},
+                                                  True, None)
+        pf = Pathfinder(target, sources, hg.nodes, context=context,
+                        relevant_edges=relevant_edges)
+        t = pf.search(search_depth=100000)
+    elapsed = (time.perf_counter() - start) / num_runs
+    assert t.value == 100
+    return elapsed, pf.search_counter
+
+
+def main():
+    hg = make_hypergraph()
+    start = time.perf_counter()
+    num_edges = len(hg.get_ancestor_edges('T'))
+    elapsed = time.perf_counter() - start
+    print(f'{len(hg.nodes):,} nodes, {len(hg.edges):,} edges, '
+          f'{num_edges} ancestor edges of the target '
+          f'(found in {elapsed * 1000:.1f} ms)')
+    print(f'{"search":>10} | {"ms / solve":>10} | {"explored":>9}')
+    for name, prune in [('full', False), ('pruned', True)]:
+        elapsed, explored = bench_search(hg, prune)
+        print(f'{name:>10} | {elapsed * 1000:>10.1f} | {explored:>9,}')
+
+
+if __name__ == '__main__':
+    main()
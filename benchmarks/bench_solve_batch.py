@@ -0,0 +1,51 @@
+"""
+Benchmarks `Hypergraph.solve_batch` against looping `Hypergraph.solve`
+over the elements of a parameter sweep, for a chain of array-safe
+relations and for a chain including a non-vectorizable `via`.
+
+Run from the repository root with::
+
+    python benchmarks/bench_solve_batch.py
+"""
+
+import time
+
+import numpy as np
+
+from constrainthg.hypergraph import Hypergraph
+import constrainthg.relations as R
+
+
+def make_hypergraph(with_via: bool) -> Hypergraph:
+    """Returns a hypergraph computing a short chain of arithmetic."""
+    hg = Hypergraph()
+    hg.add_edge(['A', 'B'], 'C', R.Rmultiply)
+    hg.add_edge(['C', 'A'], 'D', R.Rsum)
+    via = (lambda s1: s1 >= 0) if with_via else None
+    hg.add_edge({'s1': 'D', 's2': 'B'}, 'E', R.Rsubtract, via=via)
+    hg.add_edge('E', 'F', R.Rnegate)
+    return hg
+
+
+def main(size: int=20000, num_looped: int=1000):
+    sweep = np.linspace(0., 10., size)
+    print(f'{"graph":>10} | {"solve / element (ms)":>20} | '
+          f'{"batch / element (ms)":>20} | {"speedup":>8}')
+    for with_via in (False, True):
+        hg = make_hypergraph(with_via)
+        start = time.perf_counter()
+        for a in sweep[:num_looped]:
+            hg.solve('F', {'A': a, 'B': 2.})
+        looped = (time.perf_counter() - start) / num_looped
+
+        start = time.perf_counter()
+        hg.solve_batch('F', {'A': sweep, 'B': 2.})
+        batched = (time.perf_counter() - start) / size
+
+        name = 'via' if with_via else 'array'
+        print(f'{name:>10} | {looped * 1e3:>20.4f} | {batched * 1e3:>20.4f} | '
+              f'{looped / batched:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
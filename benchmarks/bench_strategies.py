@@ -0,0 +1,102 @@
+"""
+Benchmarks the search strategies of `Hypergraph.solve` on the demos and
+on synthetic hypergraphs, reporting the solve time, the number of
+explored TNodes, and the cost of the solution found by each strategy.
+
+Run from the repository root with::
+
+    python benchmarks/bench_strategies.py
+"""
+
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'demos'))
+
+from constrainthg.hypergraph import Hypergraph
+import constrainthg.relations as R
+import demo_elevator
+import demo_pendulum
+
+STRATEGIES = ['index', 'astar', 'depth', 'breadth']
+
+
+def make_chains(num_chains: int=50, chain_length: int=20) -> Hypergraph:
+    """Returns a hypergraph of weighted chains of nodes leading from 'S'
+    to 'T', where the longest chains are the cheapest."""
+    hg = Hypergraph()
+    for c in range(num_chains):
+        prev = 'S'
+        length = 1 + c % chain_length
+        for i in range(length):
+            node = 'T' if i == length - 1 else f'n{c}_{i}'
+            hg.add_edge(prev, node, R.Rincrement,
+                        weight=float(chain_length - c % chain_length) / length)
+            prev = node
+    return hg
+
+
+def make_grid(size: int=30) -> Hypergraph:
+    """Returns an unweighted hypergraph of a grid, where each node is
+    the sum of the nodes to its left and below it."""
+    hg = Hypergraph(no_weights=True)
+    for i in range(size):
+        for j in range(size):
+            if i == 0 and j == 0:
+                continue
+            sources = {}
+            if i > 0:
+                sources['s1'] = f'{i - 1},{j}'
+            if j > 0:
+                sources['s2'] = f'{i},{j - 1}'
+            hg.add_edge(sources, f'{i},{j}', R.Rsum)
+    return hg
+
+
+def make_cases() -> dict:
+    """Returns the solves to benchmark, {name : (Hypergraph, kwargs)}."""
+    return {
+        'pendulum': (demo_pendulum.hg,
+                     dict(target='theta', min_index=100)),
+        'elevator': (demo_elevator.hg,
+                     dict(target='height', inputs=demo_elevator.inputs,
+                          min_index=50)),
+        'chains': (make_chains(), dict(target='T', inputs={'S': 0})),
+        'grid': (make_grid(), dict(target='29,29', inputs={'0,0': 1})),
+    }
+
+
+def bench_solve(hg: Hypergraph, strategy, kwargs: dict,
+                num_runs: int=3) -> tuple:
+    """Returns the seconds per solve, the number of explored TNodes, and
+    the cost of the solution, or None if the solve failed."""
+    try:
+        start = time.perf_counter()
+        for _ in range(num_runs):
+            hg.solve(strategy=strategy, **kwargs)
+        elapsed = (time.perf_counter() - start) / num_runs
+        t = hg.solve(strategy=strategy, memory_mode=True, **kwargs)
+    except Exception:
+        return None
+    if t is None:
+        return None
+    return elapsed, len(hg.solved_tnodes), t.cost
+
+
+def main():
+    print(f'{"case":>10} | {"strategy":>8} | {"ms / solve":>10} | '
+          f'{"explored":>9} | {"cost":>8}')
+    for name, (hg, kwargs) in make_cases().items():
+        for strategy in STRATEGIES:
+            result = bench_solve(hg, strategy, kwargs)
+            if result is None:
+                print(f'{name:>10} | {strategy:>8} | {"failed":>10} |')
+                continue
+            elapsed, explored, cost = result
+            print(f'{name:>10} | {strategy:>8} | {elapsed * 1000:>10.1f} | '
+                  f'{explored:>9,} | {cost:>8.4g}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Measures the scaling of `Hypergraph.sweep` with the number of worker
+processes, sweeping the initial angle of the pendulum demo.
+
+Run from the repository root with::
+
+    python benchmarks/bench_sweep.py
+"""
+
+from pathlib import Path
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'demos'))
+
+import demo_pendulum
+
+
+def main(num_elements: int=64, min_index: int=50):
+    hg = demo_pendulum.hg
+    inputs = [{'theta0': theta0}
+              for theta0 in np.linspace(0.1, 1.5, num_elements)]
+    num_cpus = multiprocessing.cpu_count()
+    worker_counts = sorted({1, 2, 4, 8, 16, num_cpus})
+    worker_counts = [w for w in worker_counts if w <= num_cpus]
+
+    print(f'{num_cpus} CPUs, {num_elements} solves of theta with '
+          f'min_index={min_index}')
+    print(f'{"workers":>7} | {"time (s)":>9} | {"speedup":>7} | '
+          f'{"efficiency":>10}')
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        hg.sweep('theta', inputs, workers=workers, min_index=min_index)
+        elapsed = time.perf_counter() - start
+        baseline = elapsed if baseline is None else baseline
+        speedup = baseline / elapsed
+        print(f'{workers:>7} | {elapsed:>9.3f} | {speedup:>6.2f}x | '
+              f'{speedup / workers:>10.0%}')
+
+
+if __name__ == '__main__':
+    main()
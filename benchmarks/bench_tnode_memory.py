@@ -0,0 +1,53 @@
+"""
+Measures the memory used per TNode when solving the demos, using
+`tracemalloc` to find the peak memory allocated during each solve. The
+peak covers all the state of the search, such as the edge sets, value
+histories, and found TNode stores, not just the TNode objects.
+
+Run from the repository root with::
+
+    python benchmarks/bench_tnode_memory.py
+"""
+
+from pathlib import Path
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'demos'))
+
+import demo_elevator
+import demo_pendulum
+
+
+CASES = {
+    'pendulum': (demo_pendulum.hg, 'theta', {}, 100),
+    'pendulum x4': (demo_pendulum.hg, 'theta', {}, 400),
+    'elevator': (demo_elevator.hg, 'height', demo_elevator.inputs, 50),
+}
+
+
+def measure(hg, target: str, inputs: dict, min_index: int) -> tuple:
+    """Returns the number of TNodes created and the peak memory (in
+    bytes) allocated while solving for the target."""
+    hg.clear()
+    tracemalloc.start()
+    hg.solve(target, inputs, min_index=min_index, search_depth=10**6)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    num_tnodes = next(hg.context.uids)
+    hg.clear()
+    return num_tnodes, peak
+
+
+def main():
+    print(f'{"demo":>14} | {"TNodes":>7} | {"peak (kB)":>10} | '
+          f'{"bytes / TNode":>13}')
+    for name, (hg, target, inputs, min_index) in CASES.items():
+        num_tnodes, peak = measure(hg, target, inputs, min_index)
+        per_tnode = peak / max(num_tnodes, 1)
+        print(f'{name:>14} | {num_tnodes:>7} | {peak / 1000:>10,.1f} | '
+              f'{per_tnode:>13,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -150,14 +150,14 @@ hg.add_edge(
     sources={'s1': KI, 's2': error, 's3': I, 's4': step},
     target=I,
     rel=R.mult_and_sum(['s1', 's2', 's4'], 's3'),
-    index_via=lambda s2, s3: s2 == s3 + 1,
+    index_via=R.offset_by('s2', 's3'),
     disposable=['s2', 's3'],
 )
 hg.add_edge(
     sources={'s1': error, 's2': alpha, 's3': error_f},
     target=error_f,
     rel=Rlowpassfilter, 
-    index_via=lambda s1, s3: s1 == s3 + 1,
+    index_via=R.offset_by('s1', 's3'),
     disposable=['s1', 's3'],
     label='low_pass_filter->error_f',
 )
@@ -166,7 +166,7 @@ hg.add_edge(
     sources={'s1':error_f, 's2':error_f_prev},
     target='error_f_diff',
     rel=R.Rsubtract,
-    index_via=lambda s1, s2: s1 == s2 + 1,
+    index_via=R.offset_by('s1', 's2'),
     edge_props=['DISPOSE_ALL'],
 )
 # hg.add_edge(
@@ -186,7 +186,7 @@ hg.add_edge(
     sources={'s1': KD, 's2': error_f, 's3': error_f_prev},
     target=D,
     rel=R.Rmultiply,
-    index_via=lambda s2, s3: s2 == s3 + 1,
+    index_via=R.offset_by('s2', 's3'),
     disposable=['s2', 's3'],
     label='(KD, error_f, error_f_prev)->D',
 )
@@ -260,7 +260,7 @@ hg.add_edge(
     sources={'s1': acc, 's2': vel, 's3': step,},
     target=vel,
     rel=R.mult_and_sum(['s1', 's3'], 's2'),
-    index_via=lambda s1, s2: s1 == s2 + 1,
+    index_via=R.offset_by('s1', 's2'),
     disposable=['s1', 's2'],
     label='(acc,vel,step)->vel',
 )
@@ -269,7 +269,7 @@ hg.add_edge(
     target=height,
     rel=R.mult_and_sum(['s1', 's3'], 's2'),
     label='(vel,height,step)->height',
-    index_via=lambda s1, s2: s1 == s2 + 1,
+    index_via=R.offset_by('s1', 's2'),
     disposable=['s1', 's2'],
 )
 
@@ -289,7 +289,7 @@ def addPerson(label: str, goal_floor: int, start_floor: int, person_is_on: bool=
         sources={'s1': current_floor, 's2':onX, 's3':startX, 's4':goalX},
         target=onX,
         rel=Rset_status,
-        index_via=lambda s1, s2: s1 == s2 + 1,
+        index_via=R.offset_by('s1', 's2'),
         disposable=['s1', 's2'],
         label=f'(curr_floor,{label}:is_on,start,goal)->{label} is on',
     )
@@ -297,7 +297,7 @@ def addPerson(label: str, goal_floor: int, start_floor: int, person_is_on: bool=
         sources={'s1': current_floor, 's2':onX, 's3':startX, 's4':goalX},
         target=is_boarding,
         rel=Ris_boarding,
-        index_via=lambda s1, s2: s1 == s2 + 1,
+        index_via=R.offset_by('s1', 's2'),
         disposable=['s1', 's2'],
         label=f'(curr_floor,{label}:is_on,start,goal)->{label} is boarding',
     )
@@ -305,7 +305,7 @@ def addPerson(label: str, goal_floor: int, start_floor: int, person_is_on: bool=
         sources={'s1': current_floor, 's2':onX, 's3':goalX},
         target=is_exiting,
         rel=Ris_exiting,
-        index_via=lambda s1, s2: s1 == s2 + 1,
+        index_via=R.offset_by('s1', 's2'),
         disposable=['s1', 's2'],
         label=f'(curr_floor,{label}:is_on,goal)->{label} is exiting',
     )
@@ -135,7 +135,7 @@ hg.add_edge(
     sources={'slope': alpha, 'initial_val': omega, 'step': time_step},
     target=omega,
     rel=Rintegrate,
-    index_via=lambda slope, initial_val: slope - 1 == initial_val,
+    index_via=R.offset_by('slope', 'initial_val'),
     disposable=['slope', 'intial_val'],
     label='(alpha, omega, time_step)->omega',
 )
@@ -148,7 +148,7 @@ hg.add_edge(
     sources={'slope': omega, 'initial_val': theta, 'step': time_step},
     target=theta,
     rel=Rintegrate,
-    index_via=lambda slope, initial_val: slope - 1 == initial_val,
+    index_via=R.offset_by('slope', 'initial_val'),
     disposable=['slope', 'intial_val'],
     label='(omega, theta, time_step)->theta',
 )
@@ -21,31 +21,34 @@ limitations under the License.
 """
 
 from typing import Callable, List
-from inspect import signature, getsource
+from inspect import signature, getsource, isawaitable
 import textwrap
 import importlib
 import ast
-from math import isinf
+from math import isinf, inf
 import logging
 import itertools
+import heapq
 import json
+import pickle
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
 from enum import Enum
+import multiprocessing
+from concurrent.futures import (Executor, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+import numpy as np
 
-__all__ = ['Hypergraph', 'Node', 'Edge', 'TNode']
+__all__ = ['Hypergraph', 'Node', 'Edge', 'TNode', 'SolveContext',
+           'RelationCache', 'CancelToken', 'SearchCancelled',
+           'UnreachableTarget']
 
 logger = logging.getLogger('constrainthg')
 
 
 # Helper functions
-def _append_to_dict_list(d: dict, key, val):
-    """Appends the value to a dictionary where the dict.values are
-    lists."""
-    if key not in d:
-        d[key] = []
-    d[key].append(val)
-    return d
-
-
 def _enforce_list(val) -> list:
     """Ensures that the value is a list, or else a list containing the
     value."""
@@ -90,8 +93,36 @@ def _create_from_dict(O, data: dict):
     return O(**filtered_args)
 
 
+# Hypergraph shipped to each worker process of a sweep
+_sweep_hypergraph = None
+
+
+def _init_sweep_worker(hg, solve_kwargs: dict):
+    """Stores the hypergraph in a sweep worker process, unpickling it if
+    given as bytes (see `Hypergraph.get_sweep_context`)."""
+    global _sweep_hypergraph
+    if isinstance(hg, bytes):
+        hg = pickle.loads(hg)
+    _sweep_hypergraph = (hg, solve_kwargs)
+
+
+def _solve_sweep_chunk(args: tuple) -> list:
+    """Solves a chunk of elements of a sweep in a worker process."""
+    target, chunk = args
+    hg, solve_kwargs = _sweep_hypergraph
+    values = []
+    for inputs in chunk:
+        t = hg.solve(target, inputs, **solve_kwargs)
+        values.append(None if t is None else t.value)
+    return values
+
+
 class TNode:
     """A basic tree node for printing tree structures."""
+    __slots__ = ('node_label', 'label', 'value', 'children',
+                 'gen_edge_label', 'gen_edge_cost', 'calc_values', 'index',
+                 'uid', 'calc_cost', 'edge_set', 'display')
+
     class conn:
         """A class of connectors used for indicating child nodes.
         
@@ -110,15 +141,17 @@ class TNode:
     def __init__(self, label: str, node_label: str, value=None,
                  children: list=None, cost: float=None, trace: list=None,
                  gen_edge_label: str=None, gen_edge_cost: float=0.0,
-                 join_status: str='None', max_display_length: int=12):
+                 join_status: str='None', max_display_length: int=12,
+                 uid: int=None):
         """
         Creates the root of a search tree.
 
         Parameters
         ----------
-        label : str
+        label : str | int
             A unique identifier for the TNode, necessary for
-            pathfinding.
+            pathfinding. TNodes generated during a search are labeled by
+            their `uid`.
         node_label : str
             A string identifying the node represented by the TNode.
         value : Any, optional
@@ -133,8 +166,9 @@ class TNode:
             Top down trace of how the TNode could be resolved, used for
             path exploration.
         gen_edge_label : str, optional
-            A unique label for the edge generating the TNode (of which
-            `children` are source nodes).
+            A label for the edge generating the TNode (of which
+            `children` are source nodes). Should be unique to the TNode
+            unless `uid` is given.
         gen_edge_cost : float, default=0.
             Value for weight (cost) of the generating edge, default is
             0.0.
@@ -143,6 +177,24 @@ class TNode:
             used for printing.
         max_display_length : int, default=12
             The maximum characters to display for the value of the node.
+        uid : int, optional
+            A unique integer identifying the generating edge of the
+            TNode within a search, increasing with each TNode found, used
+            to find the cost of the tree incrementally.
+
+
+        Notes
+        -----
+        TNodes use `__slots__` to reduce memory during long searches.
+        Metadata only used for printing (`trace`, `join_status`, and
+        `max_display_length`) is kept in a `display` dict, which is only
+        allocated if a non-default value is given. The `node_label` and
+        `gen_edge_label` are not interned to integer ids, as they
+        reference the labels of the shared Node and Edge objects rather
+        than holding copies. Including the state of the search each
+        TNode adds (its edge set, value history, and entries in the
+        found TNode stores), a search uses about 1.4 to 2.4 kB per
+        TNode on the demos (see ``benchmarks/bench_tnode_memory.py``).
 
 
         Properties
@@ -152,21 +204,78 @@ class TNode:
             in the tree.
         values : dict
             The values of all the child TNodes of the form
-            {label : [Any,]}.
+            {label : [Any,]}, materialized from the tree when read.
+        edge_set : EdgeSet | None
+            The generating edges in the tree, set when the cost is
+            found from the children. None if the cost was given or any
+            TNode in the tree was generated without a `uid`.
         """
         self.node_label = node_label
         self.label = label
         self.value = value
         self.children = [] if children is None else children
-        self.trace = [] if trace is None else trace
         self.gen_edge_label = gen_edge_label
         self.gen_edge_cost = gen_edge_cost
-        self.values = {node_label: [value,]}
-        self.join_status = join_status
+        self.calc_values = None
         self.index = max([1] + [c.index for c in self.children])
-        self.max_display_length = max_display_length
+        self.uid = uid
+        self.edge_set = None
+        self.display = None
+        if trace is not None:
+            self.trace = trace
+        if join_status != 'None':
+            self.join_status = join_status
+        if max_display_length != 12:
+            self.max_display_length = max_display_length
         self.cost = cost
 
+    def set_display(self, key: str, val):
+        """Sets a metadata value used for printing the TNode."""
+        if self.display is None:
+            self.display = {}
+        self.display[key] = val
+
+    @property
+    def trace(self) -> list:
+        """Top down trace of how the TNode could be resolved."""
+        if self.display is None or 'trace' not in self.display:
+            self.set_display('trace', [])
+        return self.display['trace']
+
+    @trace.setter
+    def trace(self, val: list):
+        self.set_display('trace', val)
+
+    @property
+    def join_status(self) -> str:
+        """Indicates if the TNode is the last of a set of children."""
+        if self.display is None:
+            return 'None'
+        return self.display.get('join_status', 'None')
+
+    @join_status.setter
+    def join_status(self, val: str):
+        self.set_display('join_status', val)
+
+    @property
+    def max_display_length(self) -> int:
+        """The maximum characters to display for the value."""
+        if self.display is None:
+            return 12
+        return self.display.get('max_display_length', 12)
+
+    @max_display_length.setter
+    def max_display_length(self, val: int):
+        self.set_display('max_display_length', val)
+
+    @property
+    def gen_edge_key(self):
+        """Identifier for the generating edge of the TNode that is
+        unique within a tree."""
+        if self.uid is None:
+            return self.gen_edge_label
+        return (self.gen_edge_label, self.uid)
+
     def get_conn(self, last=True) -> str:
         """Selecter function for the connector string on the tree
         print."""
@@ -193,12 +302,12 @@ class TNode:
         out += header + self.get_conn(last) + str(self)
         if checked_edges is None:
             checked_edges = []
-        if self.gen_edge_label in checked_edges:
+        if self.gen_edge_key in checked_edges:
             out += ' (derivative)\n' if len(self.children) != 0 else '\n'
             return out
         out += '\n'
         if self.gen_edge_label is not None:
-            checked_edges.append(self.gen_edge_label)
+            checked_edges.append(self.gen_edge_key)
         for i, child in enumerate(self.children):
             c_header = header + (self.conn.blank if last else self.conn.pipe)
             c_last = i == len(self.children) - 1
@@ -237,20 +346,139 @@ class TNode:
         """Deletes the cost property of the TNode."""
         self.calc_cost = None
 
+    @property
+    def values(self) -> dict:
+        """The history of values for each node in the tree, of the form
+        {label : [Any,]}."""
+        if self.calc_values is None:
+            self.calc_values = self.merge_values()
+        return self.calc_values
+
+    @values.setter
+    def values(self, val: dict):
+        """Sets the values property of the TNode."""
+        self.calc_values = val
+
+    def merge_values(self) -> dict:
+        """Returns the history of values for each node in the tree.
+
+        The history of each node is the longest history of the node
+        found in the children, extended by the value of the TNode if
+        the TNode represents the node. Histories are shared between
+        TNodes as linked cells of the form (value, previous_cell,
+        length), which are only converted to lists for the root.
+        """
+        histories = {}
+        stack = [(self, False)]
+        while len(stack) > 0:
+            t, expanded = stack.pop()
+            if id(t) in histories:
+                continue
+            if t is not self and t.calc_values is not None:
+                histories[id(t)] = {label: self.link_values(vals)
+                                    for label, vals in t.calc_values.items()}
+                continue
+            if not expanded:
+                stack.append((t, True))
+                stack.extend((c, False) for c in reversed(t.children))
+                continue
+
+            merged = {t.node_label: None}
+            for child in t.children:
+                for label, cell in histories[id(child)].items():
+                    prev = merged.get(label, None)
+                    if prev is None or cell[2] > prev[2]:
+                        merged[label] = cell
+            prev = merged[t.node_label]
+            length = 1 if prev is None else prev[2] + 1
+            merged[t.node_label] = (t.value, prev, length)
+            histories[id(t)] = merged
+
+        return {label: self.unlink_values(cell)
+                for label, cell in histories[id(self)].items()}
+
+    @staticmethod
+    def link_values(vals: list) -> tuple:
+        """Converts a list of values to linked history cells."""
+        cell = None
+        for val in vals:
+            cell = (val, cell, 1 if cell is None else cell[2] + 1)
+        return cell
+
+    @staticmethod
+    def unlink_values(cell: tuple) -> list:
+        """Converts linked history cells to a list of values."""
+        vals = []
+        while cell is not None:
+            vals.append(cell[0])
+            cell = cell[1]
+        vals.reverse()
+        return vals
+
     def get_tree_cost(self, root=None, checked_edges: set=None) -> float:
-        """Returns the cost of solving to the leaves of the tree."""
+        """Returns the cost of solving to the leaves of the tree.
+
+        Each generating edge is only counted once, even if shared
+        between multiple branches of the tree. If the TNodes of the tree
+        have a `uid`, the cost is read from the edge set of the tree
+        (see `TNode.merge_edge_set`), otherwise the tree is walked
+        iteratively.
+        """
         if root is None:
             root = self
         if checked_edges is None:
+            if root.uid is None:
+                edge_set = root.merge_edge_set(own_edge=False)
+                if edge_set is not None:
+                    return float(edge_set.cost + root.gen_edge_cost)
+            else:
+                edge_set = root.merge_edge_set()
+                if edge_set is not None:
+                    root.edge_set = edge_set
+                    return float(edge_set.cost)
             checked_edges = set()
         total_cost = 0
-        if root.gen_edge_label not in checked_edges:
-            total_cost += root.gen_edge_cost
-            checked_edges.add(root.gen_edge_label)
-            for st in root.children:
-                total_cost += self.get_tree_cost(st, checked_edges)
+        stack = [root]
+        while len(stack) > 0:
+            t = stack.pop()
+            if t.gen_edge_key in checked_edges:
+                continue
+            total_cost += t.gen_edge_cost
+            checked_edges.add(t.gen_edge_key)
+            stack.extend(reversed(t.children))
         return total_cost
 
+    def merge_edge_set(self, own_edge: bool=True) -> 'EdgeSet':
+        """Returns the union of the edge sets of the children with the
+        generating edge of the TNode, or None if the TNode or any child
+        was generated without a `uid` or a known edge set.
+
+        If `own_edge` is False, only the edge sets of the children are
+        merged, such as for a TNode whose `uid` is not yet known.
+        """
+        if self.gen_edge_label is None or (own_edge and self.uid is None):
+            return None
+        edge_set = None
+        for child in self.children:
+            if child.gen_edge_label is None:
+                continue
+            if child.edge_set is None:
+                return None
+            edge_set = EdgeSet.union(edge_set, child.edge_set)
+        if not own_edge:
+            return EdgeSet(0, (), 0.) if edge_set is None else edge_set
+        own_set = EdgeSet.from_uid(self.uid, self.gen_edge_cost)
+        return EdgeSet.union(edge_set, own_set)
+
+    def set_uid(self, uid: int, track_cost: bool=True):
+        """Sets the `uid` of a TNode created before it was known (such
+        as while its value was pending), labeling the TNode by the uid
+        and adding its generating edge to its edge set if `track_cost`."""
+        self.uid = uid
+        self.label = uid
+        if track_cost:
+            self.edge_set = self.merge_edge_set()
+
     def __str__(self) -> str:
         out = self.node_label
         if self.value is not None:
@@ -264,6 +492,175 @@ class TNode:
         return out
 
 
+class EdgeSet:
+    """A persistent set of the generating edges in a tree of TNodes,
+    used to find the cost of the tree from the trees of its children.
+
+    Edges are stored by the `uid` of their TNode in a trie, where each
+    leaf holds a word of 256 uids for each edge weight and each branch
+    holds 8 subtries. Sets are never modified: the union of two sets
+    reuses every subtrie that is already in either set, so a TNode only
+    allocates the branches leading to its own uid, and joining trees
+    that share a history only walks the branches where they differ.
+    """
+    __slots__ = ('level', 'items', 'cost')
+    leaf_bits = 8
+    branch_bits = 3
+
+    def __init__(self, level: int, items: tuple, cost: float):
+        """
+        Creates a node of the trie.
+
+        Parameters
+        ----------
+        level : int
+            The height of the node, where leaves have a level of 0.
+        items : tuple
+            The words of a leaf, of the form (weight, word, ...) sorted
+            by weight, or the subtries of a branch (None if empty).
+        cost : float
+            The sum of the weights of the edges in the set.
+        """
+        self.level = level
+        self.items = items
+        self.cost = cost
+
+    @classmethod
+    def from_uid(cls, uid: int, weight: float):
+        """Returns the set with the single edge of the TNode."""
+        width = 1 << cls.branch_bits
+        out = cls(0, (weight, 1 << (uid & ((1 << cls.leaf_bits) - 1))),
+                  weight)
+        uid >>= cls.leaf_bits
+        while uid > 0:
+            items = [None] * width
+            items[uid & (width - 1)] = out
+            out = cls(out.level + 1, tuple(items), weight)
+            uid >>= cls.branch_bits
+        return out
+
+    @classmethod
+    def union(cls, a, b):
+        """Returns the union of the two sets, reusing either set if it
+        contains the other."""
+        if a is None or a is b:
+            return b
+        if b is None:
+            return a
+        if a.level < b.level:
+            a, b = b, a
+        if a.level > b.level:
+            first = cls.union(a.items[0], b)
+            if first is a.items[0]:
+                return a
+            items = (first,) + a.items[1:]
+        elif a.level == 0:
+            return cls.union_leaves(a, b)
+        else:
+            items = tuple(cls.union(x, y) for x, y in zip(a.items, b.items))
+            if all(z is x for z, x in zip(items, a.items)):
+                return a
+            if all(z is y for z, y in zip(items, b.items)):
+                return b
+        cost = sum(item.cost for item in items if item is not None)
+        return cls(a.level, items, cost)
+
+    @classmethod
+    def union_leaves(cls, a, b):
+        """Returns the union of two leaves."""
+        a_words = dict(zip(a.items[::2], a.items[1::2]))
+        b_words = dict(zip(b.items[::2], b.items[1::2]))
+        words = a_words.copy()
+        for weight, word in b_words.items():
+            words[weight] = words.get(weight, 0) | word
+        if words == a_words:
+            return a
+        if words == b_words:
+            return b
+        cost = sum(weight * word.bit_count() for weight, word in words.items())
+        items = tuple(x for pair in sorted(words.items()) for x in pair)
+        return cls(0, items, cost)
+
+
+class TNodeStore:
+    """An insertion-ordered collection of the TNodes found as paths to a
+    single source node of an edge.
+
+    TNodes are indexed both by their label and by their index, so that
+    checking for duplicates, finding TNodes with a given index, and
+    disposing of TNodes with a given index are constant-time.
+    """
+    def __init__(self, tnodes: list=None):
+        """Creates a new `TNodeStore` object.
+
+        Parameters
+        ----------
+        tnodes : list, optional
+            TNodes to add to the store.
+
+
+        Properties
+        ----------
+        tnodes : dict
+            The TNodes in the store in order of insertion,
+            {label : TNode}.
+        by_index : dict
+            The TNodes in the store referenced by index,
+            {index : {label : TNode}}.
+        """
+        self.tnodes = {}
+        self.by_index = {}
+        if tnodes is not None:
+            for t in tnodes:
+                self.add(t)
+
+    def add(self, t: TNode) -> bool:
+        """Adds the TNode to the store, returning False if a TNode with
+        the same label was already present."""
+        if t.label in self.tnodes:
+            return False
+        self.tnodes[t.label] = t
+        if t.index not in self.by_index:
+            self.by_index[t.index] = {}
+        self.by_index[t.index][t.label] = t
+        return True
+
+    def with_index(self, index: int) -> list:
+        """Returns the TNodes in the store with the given index."""
+        return list(self.by_index.get(index, {}).values())
+
+    def remove_index(self, index: int) -> int:
+        """Removes all TNodes with the given index, returning the number
+        of TNodes removed."""
+        matching_tnodes = self.by_index.pop(index, {})
+        for label in matching_tnodes:
+            del self.tnodes[label]
+        return len(matching_tnodes)
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.tnodes
+
+    def __len__(self) -> int:
+        return len(self.tnodes)
+
+    def __iter__(self):
+        return iter(self.tnodes.values())
+
+    def __repr__(self) -> str:
+        return repr(list(self.tnodes.values()))
+
+
+class RevisionCounter:
+    """Counts changes to the edges leading from the nodes of a
+    Hypergraph, including changes made directly to the nodes or edges
+    (such as setting the weight of an edge)."""
+    __slots__ = ('count',)
+
+    def __init__(self):
+        """Creates a new `RevisionCounter` object at a count of 0."""
+        self.count = 0
+
+
 class Node:
     """A value in the hypergraph, equivalent to a wired connection."""
     def __init__(self, label: str, static_value=None,
@@ -302,6 +699,13 @@ class Node:
         is_constant : bool
             Describes whether the node should be reset in between
             simulations.
+        explore_edges : tuple | None
+            Cached edges explored from the node during searching, see
+            `Node.get_explore_edges`.
+        revisions : list
+            The `RevisionCounter` of each Hypergraph containing the
+            node, incremented whenever the edges leading from the node
+            change.
 
 
         Notes
@@ -326,12 +730,15 @@ class Node:
         self.is_constant = static_value is not None
         self.super_nodes = set() if super_nodes is None else _enforce_set(super_nodes)
         self.sub_nodes = set() if sub_nodes is None else _enforce_set(sub_nodes)
+        self.explore_edges = None
+        self.revisions = []
         for sup_node in self.super_nodes:
             if not isinstance(sup_node, tuple):
                 sup_node.sub_nodes.add(self)
         for sub_node in self.sub_nodes:
             if not isinstance(sub_node, tuple):
                 sub_node.super_nodes.add(self)
+                sub_node.invalidate_explore_edges()
 
     def __str__(self) -> str:
         out = self.label
@@ -360,7 +767,49 @@ class Node:
             a.leading_edges = a.leading_edges.union(b.leading_edges)
             a.super_nodes = a.super_nodes.union(b.super_nodes)
             a.sub_nodes = a.sub_nodes.union(b.sub_nodes)
-        return a     
+            a.invalidate_explore_edges()
+        return a
+
+    def get_explore_edges(self) -> tuple:
+        """Returns the edges leading from the node or any of its super
+        nodes, sorted by label and excluding edges of infinite weight.
+
+        The result is cached until `Node.invalidate_explore_edges` is
+        called, which is done automatically when edges are added to the
+        node or their weights are changed.
+        """
+        if self.explore_edges is None:
+            super_node_leading_edges = (sup_n.leading_edges
+                                        for sup_n in self.super_nodes)
+            leading_edges = self.leading_edges.union(*super_node_leading_edges)
+            leading_edges = [le for le in leading_edges
+                             if not isinf(le.weight)]
+            leading_edges.sort(key=lambda le: le.label)
+            self.explore_edges = tuple(leading_edges)
+        return self.explore_edges
+
+    def invalidate_explore_edges(self):
+        """Clears the cached explore edges of the node and the nodes
+        subsetting it. Should be called after manually changing the
+        `leading_edges` of the node."""
+        self.explore_edges = None
+        self.bump_revisions()
+        for sub_node in self.sub_nodes:
+            if not isinstance(sub_node, tuple):
+                sub_node.explore_edges = None
+                sub_node.bump_revisions()
+
+    def bump_revisions(self):
+        """Increments the revision counter of each Hypergraph containing
+        the node."""
+        for revision in self.revisions:
+            revision.count += 1
+
+    def add_revision(self, revision: RevisionCounter):
+        """Registers the revision counter of a Hypergraph containing the
+        node, if not already registered."""
+        if all(r is not revision for r in self.revisions):
+            self.revisions.append(revision)
 
     def to_dict(self) -> dict:
         """Returns a dict representation of the Node object."""
@@ -401,13 +850,208 @@ class EdgeProperty(Enum):
     DISPOSE_ALL = 2
 
 
+class ArgBinder:
+    """A precompiled call layout mapping source identifiers to the
+    positional and keyword arguments of a method.
+
+    The layout is compiled once from the signature of the method and
+    the (ordered) identifiers of the source values, so that calling the
+    binder only requires building the arguments and calling the method.
+    """
+    def __init__(self, method: Callable, keys: tuple, edge_label: str=None):
+        """Creates a new `ArgBinder` object.
+
+        Parameters
+        ----------
+        method : Callable
+            The method to call.
+        keys : tuple
+            The identifiers of the source values, in the order they will
+            be passed to the binder.
+        edge_label : str, optional
+            Label of the edge owning the binder, used for logging.
+        """
+        self.method = method
+        self.keys = tuple(keys)
+        self.edge_label = edge_label
+        self.positional, self.keyword, self.missing = [], [], []
+        self.compile()
+
+    def compile(self):
+        """Sorts the source identifiers into positional and keyword
+        arguments, making sure to handle the kind of each parameter (see
+        `inspect.Parameter.kind`).
+        """
+        remaining_keys = list(self.keys)
+        has_var_args, has_var_kwargs = False, False
+
+        for p in signature(self.method).parameters.values():
+            p_name, p_kind = p.name, p.kind
+
+            if p_name in self.keys:
+                if p_kind == p.POSITIONAL_ONLY:
+                    self.positional.append(p_name)
+                elif p_kind == p.POSITIONAL_OR_KEYWORD:
+                    self.positional.append(p_name)
+                elif p_kind == p.KEYWORD_ONLY:
+                    self.keyword.append(p_name)
+                remaining_keys.remove(p_name)
+            else:
+                if p_kind == p.VAR_POSITIONAL:
+                    has_var_args = True
+                elif p_kind == p.VAR_KEYWORD:
+                    has_var_kwargs = True
+                else:
+                    self.missing.append(p_name)
+
+        if has_var_kwargs:
+            self.keyword.extend(remaining_keys)
+        elif has_var_args:
+            self.positional.extend(remaining_keys)
+
+    def __call__(self, source_vals: dict):
+        """Calls the method with the arguments taken from
+        `source_vals`."""
+        args, kwargs = self.bind(source_vals)
+        if len(kwargs) == 0:
+            return self.method(*args)
+        return self.method(*args, **kwargs)
+
+    def bind(self, source_vals: dict) -> tuple:
+        """Returns the positional and keyword arguments for the method
+        taken from `source_vals`, as (list, dict)."""
+        for p_name in self.missing:
+            logger.error(f'"{p_name}" not provided for {self.edge_label}')
+        args = [source_vals[key] for key in self.positional]
+        kwargs = {key: source_vals[key] for key in self.keyword}
+        return args, kwargs
+
+
+class RelationCache:
+    """A bounded cache of the values returned by pure relations, keyed on
+    the relation and the source values passed to it.
+
+    Entries are evicted in least-recently-used order once `maxsize`
+    entries are stored. Unhashable values are keyed by their contents:
+    lists, tuples, sets and dicts element-wise, and NumPy arrays by their
+    bytes if no larger than `max_array_bytes`. Calls with values that
+    cannot be keyed are not cached. The cache is safe to share between
+    threads and between edges.
+    """
+    def __init__(self, maxsize: int=1024, max_array_bytes: int=1 << 16):
+        """Creates a new `RelationCache` object.
+
+        Parameters
+        ----------
+        maxsize : int, default=1024
+            The maximum number of values stored, unbounded if None.
+        max_array_bytes : int, default=65536
+            The size of the largest NumPy array keyed by its contents.
+
+
+        Properties
+        ----------
+        entries : OrderedDict
+            The cached values in order of use, {key : value}.
+        hits : int
+            The number of calls answered from the cache.
+        misses : int
+            The number of calls not answered from the cache.
+        """
+        self.maxsize = maxsize
+        self.max_array_bytes = max_array_bytes
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def make_key(self, rel: Callable, source_vals: dict):
+        """Returns the key for calling the relation with the source
+        values, or None if a value cannot be keyed. Edges sharing a
+        relation share its cached values."""
+        try:
+            items = tuple((key, self.make_value_key(val))
+                          for key, val in source_vals.items())
+        except TypeError:
+            return None
+        return (rel, items)
+
+    def make_value_key(self, val):
+        """Returns a hashable key for the value, raising a TypeError if
+        the value cannot be keyed.
+
+        Floats are keyed by their exact representation (`float.hex`),
+        as 0.0 and -0.0 compare equal while NaN never equals itself."""
+        if isinstance(val, (float, np.floating)):
+            return (type(val), float(val).hex())
+        if isinstance(val, (complex, np.complexfloating)):
+            val_c = complex(val)
+            return (type(val), val_c.real.hex(), val_c.imag.hex())
+        if isinstance(val, np.ndarray):
+            if val.dtype == object or val.nbytes > self.max_array_bytes:
+                raise TypeError('Array cannot be keyed by its contents.')
+            return (np.ndarray, val.dtype.str, val.shape, val.tobytes())
+        if isinstance(val, (list, tuple)):
+            return (type(val), tuple(self.make_value_key(v) for v in val))
+        if isinstance(val, (set, frozenset)):
+            return (type(val), frozenset(self.make_value_key(v) for v in val))
+        if isinstance(val, dict):
+            return (dict, tuple((k, self.make_value_key(v))
+                                for k, v in val.items()))
+        hash(val)
+        return (type(val), val)
+
+    def get(self, key):
+        """Returns the value cached for the key, or None if not cached.
+        Counts the lookup as a hit or a miss."""
+        with self.lock:
+            if key is not None and key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Caches the value under the key, evicting the least recently
+        used values if the cache is full. None values are not cached."""
+        if key is None or value is None:
+            return
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all cached values and resets the counters."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+
 class Edge:
     """A relationship along a set of nodes (the source) that produces a
     single value."""
     def __init__(self, label: str, source_nodes: dict, target: Node,
                  rel: Callable, via: Callable=None, index_via: Callable=None,
                  weight: float=1.0, index_offset: int=0, disposable: list=None,
-                 edge_props: EdgeProperty=None):
+                 edge_props: EdgeProperty=None, executor=None,
+                 cache=None):
         """Creates a new `Edge` object. This should generally be called
         from a Hypergraph object using the Hypergraph.add_edge method.
 
@@ -454,30 +1098,42 @@ class Edge:
         edge_props : List(EdgeProperty) | EdgeProperty | str | int, optional
             A list of enumerated types that are used to configure the
             edge.
+        executor : str | Executor, optional
+            Offloads calls to `rel` to a pool of workers, either
+            'thread', 'process', or a `concurrent.futures.Executor`.
+            For 'process', `rel` and the source values must be
+            picklable. Calls are made in the search thread if not set.
+        cache : RelationCache | int | bool, optional
+            Caches the values returned by `rel`, which must be pure (the
+            value depends only on the source values, and is not
+            mutated). Given as a shared `RelationCache`, the maximum
+            number of values to cache, or True for a default cache.
 
 
         Properties
         ----------
-        found_tnodes : dict
-            A dict of lists of source_tnodes that are viable trees to a
-            source node, with each sub_dict referenced by index. format:
-            {node_label : list[TNode,]}
         subset_alt_labels : dict
             A dictionary of alternate node labels if a source node is a
             super set, format: {node_label : List[alt_node_label,]}
+        binders : dict
+            Precompiled argument binders for calling methods on the
+            edge, format: {(method, source_identifiers) : ArgBinder}
         """
         self.label = label
         self.rel = rel
         self.via = self.via_true if via is None else via
         self.index_via = self.via_true if index_via is None else index_via
         self.source_nodes = self.identify_source_nodes(source_nodes, self.rel, self.via)
-        self.create_found_tnodes_dict()
+        self.create_subset_alt_labels()
         self.target = target
-        self.weight = abs(weight)
+        self.weight = weight
         self.index_offset = index_offset
         self.disposable = [] if disposable is None else disposable
         self.edge_props = self.setup_edge_properties(edge_props)
-        
+        self.executor = executor
+        self.cache = self.setup_cache(cache)
+        self.compile_layouts()
+
     def to_dict(self) -> dict:
         """Returns a dictionary representation of the Edge object."""
         def get_node_label(n):
@@ -502,11 +1158,27 @@ class Edge:
             out['disposable'] = self.disposable
         if len(self.edge_props) > 0:
             out['edge_props'] = [str(a) for a in self.edge_props]
+        if isinstance(self.executor, str):
+            out['executor'] = self.executor
         return out
 
     def to_json(self) -> str:
         """Returns a JSON representation of the Edge object."""
         return json.dumps(self.to_dict(), indent=2)
+
+    @property
+    def weight(self) -> float:
+        """The quantified cost of traversing the edge."""
+        return self.calc_weight
+
+    @weight.setter
+    def weight(self, val: float):
+        """Sets the weight of the edge, invalidating the explore edges
+        cached by each source node."""
+        self.calc_weight = abs(val)
+        for sn in self.source_nodes.values():
+            if not isinstance(sn, tuple):
+                sn.invalidate_explore_edges()
     
     def get_method_source(self, func) -> str:
         """Returns the formatted source code of a method."""
@@ -516,18 +1188,24 @@ class Edge:
         except (OSError, TypeError) as e:
             raise ValueError(f"Cannot retrieve source for {func}: {e}")
 
-    def create_found_tnodes_dict(self):
-        """Creates the found_tnodes dictionary, accounting for super
-        nodes."""
+    def create_subset_alt_labels(self):
+        """Creates the dictionary of alternate labels for each source
+        node that is a super node."""
         self.subset_alt_labels = {}
-        self.found_tnodes = {}
         for sn in self.source_nodes.values():
             if not isinstance(sn, tuple):
                 self.subset_alt_labels[sn.label] = []
-                self.found_tnodes[sn.label] = []
                 for sub_sn in sn.sub_nodes:
                     self.subset_alt_labels[sn.label].append(sub_sn.label)
 
+    def new_found_tnodes_dict(self) -> dict:
+        """Returns an empty found_tnodes dictionary, {node_label :
+        TNodeStore}, with an entry for each source node. The TNodes
+        found during a solve are kept in the `SolveContext` of the
+        solve (see `SolveContext.get_found_tnodes`)."""
+        return {sn.label: TNodeStore() for sn in self.source_nodes.values()
+                if not isinstance(sn, tuple)}
+
     def add_source_node(self, sn):
         """Adds a source node to an initialized edge.
 
@@ -542,13 +1220,26 @@ class Edge:
             key = self.get_source_node_identifier()
         if not isinstance(sn, tuple):
             sn.leading_edges.add(self)
-            self.found_tnodes[sn.label] = []
+            sn.invalidate_explore_edges()
 
         source_nodes = self.source_nodes | {key: sn}
         if hasattr(self, 'og_source_nodes'):
             self.og_source_nodes[key] = sn
         self.source_nodes = self.identify_source_nodes(source_nodes)
         self.edge_props = self.setup_edge_properties(self.edge_props)
+        self.compile_layouts()
+
+    @staticmethod
+    def setup_cache(cache) -> RelationCache:
+        """Returns the relation cache for the edge (see `Edge.__init__`),
+        or None if values are not cached."""
+        if cache is None or cache is False:
+            return None
+        if isinstance(cache, RelationCache):
+            return cache
+        if cache is True:
+            return RelationCache()
+        return RelationCache(maxsize=cache)
 
     def setup_edge_properties(self, inputs: None) -> list:
         """Parses the edge properties."""
@@ -612,6 +1303,84 @@ class Edge:
 
         self.via = level_check
         self.rel = lambda *args, **kwargs: self.og_rel(*args, **og_kwargs(**kwargs))
+        self.compile_layouts()
+
+    def get_source_layouts(self) -> tuple:
+        """Returns the ordered source identifiers passed to the edge
+        methods for the source values (1) and source indices (2)."""
+        tuple_keys, index_keys, node_labels = [], [], set()
+        for key, sn in self.source_nodes.items():
+            if isinstance(sn, tuple):
+                tuple_keys.append(key)
+            elif sn.label not in node_labels:
+                node_labels.add(sn.label)
+                index_keys.append(key)
+        return tuple(tuple_keys + index_keys), tuple(index_keys)
+
+    def compile_layouts(self):
+        """Compiles the argument binders and join offsets of the edge,
+        which depend on the source nodes and methods of the edge."""
+        self.compile_binders()
+        self.join_offsets = self.get_join_offsets()
+
+    def get_join_offsets(self) -> dict:
+        """Returns a dict of source nodes whose indices, less an
+        offset, must be equal for the edge to be viable, format:
+        {node_label : offset}.
+
+        The offsets are identified from the ``LEVEL`` edge property or
+        from an `index_via` method with an ``index_offsets`` attribute,
+        {source_key : offset}. Only ``relations.Rsame`` and the methods
+        returned by ``relations.offset_by`` carry the attribute, though
+        it may be set on any method comparing indices by a constant
+        offset. Other `index_via` methods (such as lambda functions
+        testing the same condition) are not recognized and return an
+        empty dict, so every combination of source TNodes is tried.
+        """
+        join_offsets = {}
+        if hasattr(self, 'og_source_nodes'):
+            for sn in self.source_nodes.values():
+                if isinstance(sn, tuple) and sn[1] == 'index':
+                    ref_sn = self.source_nodes.get(sn[0], None)
+                    if isinstance(ref_sn, Node):
+                        join_offsets[ref_sn.label] = 0
+            return join_offsets
+
+        index_offsets = getattr(self.index_via, 'index_offsets', None)
+        if index_offsets is None:
+            return join_offsets
+        if len(index_offsets) == 0:
+            index_offsets = {key: 0 for key in self.get_source_layouts()[1]}
+        for key, offset in index_offsets.items():
+            sn = self.source_nodes.get(key, None)
+            if not isinstance(sn, Node):
+                continue
+            if join_offsets.get(sn.label, offset) != offset:
+                return {}
+            join_offsets[sn.label] = offset
+        return join_offsets
+
+    def compile_binders(self):
+        """Compiles the argument binders for the `rel`, `via`, and
+        `index_via` methods of the edge."""
+        self.binders = {}
+        value_keys, index_keys = self.get_source_layouts()
+        layouts = [(self.rel, value_keys), (self.via, value_keys),
+                   (self.index_via, index_keys)]
+        for method, keys in layouts:
+            try:
+                self.get_binder(method, keys)
+            except (TypeError, ValueError):
+                continue
+
+    def get_binder(self, method: Callable, keys: tuple) -> ArgBinder:
+        """Returns the argument binder for calling `method` with the
+        source identifiers in `keys`, compiling it if necessary."""
+        binder = self.binders.get((method, keys), None)
+        if binder is None:
+            binder = ArgBinder(method, keys, self.label)
+            self.binders[(method, keys)] = binder
+        return binder
 
     @staticmethod
     def get_named_arguments(methods: List[Callable]) -> set:
@@ -680,12 +1449,18 @@ class Edge:
         out = dict(zip(arg_keys, source_nodes))
         return out
 
-    def process(self, source_tnodes: list):
-        """Processes the tnodes to get the value of the target."""
+    def process(self, source_tnodes: list, found_tnodes: dict=None):
+        """Processes the tnodes to get the value of the target.
+
+        `found_tnodes` is the dictionary of found TNodes (see
+        `SolveContext.get_found_tnodes`) to dispose of solved TNodes
+        from. Nothing is disposed of if not given. The same holds for
+        each method that accepts a `found_tnodes` argument.
+        """
         source_vals, sourcs_idxs = self.get_source_vals_and_idxs(source_tnodes)
         target_val = self.process_values(source_vals, sourcs_idxs)
         if target_val is not None:
-            self.dispose_solved_tnodes(source_tnodes)
+            self.dispose_solved_tnodes(source_tnodes, found_tnodes)
         return target_val
 
     def get_source_vals_and_idxs(self, source_tnodes: list) -> tuple:
@@ -733,51 +1508,119 @@ class Edge:
         if None in source_vals:
             return None
         if ( source_indices is not None and
+             self.index_via is not self.via_true and
              not self.filtered_call(source_indices, self.index_via)):
             return None
-        if self.filtered_call(source_vals, self.via):
-            return self.filtered_call(source_vals, self.rel)
-        # if self.via(**source_vals):
-        #     return self.rel(**source_vals)
+        if ( self.via is self.via_true or
+             self.filtered_call(source_vals, self.via)):
+            return self.call_rel(source_vals)
         return None
-    
+
+    def call_rel(self, source_vals: dict):
+        """Calls the relation with the source values, answering from the
+        relation cache if possible."""
+        if self.cache is None:
+            return self.filtered_call(source_vals, self.rel)
+        key = self.cache.make_key(self.rel, source_vals)
+        value = self.cache.get(key)
+        if value is None:
+            value = self.filtered_call(source_vals, self.rel)
+            if not isawaitable(value):
+                self.cache.put(key, value)
+        return value
+
     def filtered_call(self, source_vals: dict, method: Callable):
         """Calls the method after filtering the ``source_vals`` to only
-        include arguments to the method, making sure to handle issues
-        with `position <https://docs.python.org/3.5/library/inspect.html#inspect.Parameter.kind>`_.
+        include arguments to the method, using the precompiled
+        `ArgBinder` for the identifiers in ``source_vals``.
         """
-        args, kwargs = [], {}
-        remaining_keys = list(source_vals.keys())
-        has_var_args, has_var_kwargs = False, False
-
-        for p in signature(method).parameters.values():
-            p_name, p_kind = p.name, p.kind
-
-            if p_name in source_vals:
-                if p_kind == p.POSITIONAL_ONLY:
-                    args.append(source_vals[p_name])
-                elif p_kind == p.POSITIONAL_OR_KEYWORD:
-                    args.append(source_vals[p_name])
-                elif p_kind == p.KEYWORD_ONLY:
-                    kwargs[p_name] = source_vals[p_name]
-                remaining_keys.remove(p_name)
-            else:
-                if p_kind == p.VAR_POSITIONAL:
-                    has_var_args = True
-                elif p_kind == p.VAR_KEYWORD:
-                    has_var_kwargs = True
-                else:
-                    logger.error(f'"{p_name}" not provided for {self.label}')
+        binder = self.binders.get((method, tuple(source_vals)), None)
+        if binder is None:
+            binder = self.get_binder(method, tuple(source_vals))
+        return binder(source_vals)
+
+    def submit(self, source_tnodes: list, executor: Executor) -> Future:
+        """Submits the relation for the tnodes to the executor, returning
+        a future for the value of the target, or None if the edge is not
+        viable for the tnodes.
+
+        The vias are checked immediately. The solved TNodes are not
+        disposed of, which is left to the caller once the future
+        resolves to a value other than None (see
+        `Edge.dispose_solved_tnodes`).
+        """
+        source_vals, source_idxs = self.get_source_vals_and_idxs(source_tnodes)
+        if None in source_vals:
+            return None
+        if ( self.index_via is not self.via_true and
+             not self.filtered_call(source_idxs, self.index_via)):
+            return None
+        if ( self.via is not self.via_true and
+             not self.filtered_call(source_vals, self.via)):
+            return None
+        key, value = None, None
+        if self.cache is not None:
+            key = self.cache.make_key(self.rel, source_vals)
+            value = self.cache.get(key)
+        if value is not None:
+            future = Future()
+            future.set_result(value)
+        else:
+            binder = self.binders.get((self.rel, tuple(source_vals)), None)
+            if binder is None:
+                binder = self.get_binder(self.rel, tuple(source_vals))
+            args, kwargs = binder.bind(source_vals)
+            future = executor.submit(binder.method, *args, **kwargs)
+            if self.cache is not None:
+                future.add_done_callback(lambda f: self.cache_future(key, f))
+        return future
+
+    def cache_future(self, key, future: Future):
+        """Caches the result of a successfully completed future."""
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+
+    async def aprocess(self, source_tnodes: list, found_tnodes: dict=None):
+        """Processes the tnodes to get the value of the target, awaiting
+        the relation (and vias) if they return an awaitable, such as
+        when defined with `async def`."""
+        source_vals, sourcs_idxs = self.get_source_vals_and_idxs(source_tnodes)
+        target_val = await self.aprocess_values(source_vals, sourcs_idxs)
+        if target_val is not None:
+            self.dispose_solved_tnodes(source_tnodes, found_tnodes)
+        return target_val
 
-        if len(remaining_keys) != 0:
-            if has_var_kwargs:
-                kwargs.update({k: source_vals[k] for k in remaining_keys})
-            elif has_var_args:
-                args.extend([source_vals[k] for k in remaining_keys])
+    async def aprocess_values(self, source_vals: dict,
+                              source_indices: dict=None):
+        """Finds the target value based on the source values and
+        indices, awaiting any awaitable returned by a method."""
+        if None in source_vals:
+            return None
+        if ( source_indices is not None and
+             self.index_via is not self.via_true and
+             not await self.afiltered_call(source_indices, self.index_via)):
+            return None
+        if ( self.via is self.via_true or
+             await self.afiltered_call(source_vals, self.via)):
+            value = self.call_rel(source_vals)
+            if isawaitable(value):
+                value = await value
+                if self.cache is not None:
+                    key = self.cache.make_key(self.rel, source_vals)
+                    self.cache.put(key, value)
+            return value
+        return None
 
-        return method(*args, **kwargs)
+    async def afiltered_call(self, source_vals: dict, method: Callable):
+        """Calls the method as in `filtered_call`, awaiting the result
+        if it is awaitable."""
+        out = self.filtered_call(source_vals, method)
+        if isawaitable(out):
+            out = await out
+        return out
 
-    def dispose_solved_tnodes(self, source_tnodes: list):
+    def dispose_solved_tnodes(self, source_tnodes: list,
+                              found_tnodes: dict=None):
         """Once a TNode has been processed, it is removed from the
         `found_tnodes` list *only* if it has been marked for removal via
         inclusion in the `disposable` list.
@@ -813,72 +1656,109 @@ class Edge:
             else:
                 continue
 
-            count += self.dispose_of_tnodes_with_index(node_label, index)
-        logger.debug(f'(Disposed of {count} nodes in {self.label})')
+            count += self.dispose_of_tnodes_with_index(node_label, index,
+                                                       found_tnodes)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f'(Disposed of {count} nodes in {self.label})')
 
-    def dispose_of_tnodes_with_index(self, node_label: str,
-                                     index: int) -> int:
-        """Removes each TNode from the edge property `found_tnodes` with
+    def dispose_of_tnodes_with_index(self, node_label: str, index: int,
+                                     found_tnodes: dict=None) -> int:
+        """Removes each TNode from `found_tnodes` with
         a matching node_label and index. Returns the number of TNodes
         succesfully removed.
         """
-        matching_tnodes = self.found_tnodes.get(node_label, None)
+        if found_tnodes is None:
+            return 0
+        matching_tnodes = found_tnodes.get(node_label, None)
         if matching_tnodes is None:
             return 0
-        matching_tnodes = [mt for mt in matching_tnodes]
-        self.found_tnodes[node_label] = [t for t in matching_tnodes
-                                         if t.index != index]
-        return len(matching_tnodes) - len(self.found_tnodes[node_label])
+        return matching_tnodes.remove_index(index)
 
-    def get_source_tnode_combinations(self, t: TNode, DEBUG: bool=False):
+    def get_source_tnode_combinations(self, t: TNode, DEBUG: bool=False,
+                                      found_tnodes: dict=None):
         """Returns all viable combinations of source nodes using the
-        TNode `t`."""
-        if not self.add_found_tnode(t):
+        TNode `t`, adding `t` to `found_tnodes` (an empty dictionary if
+        not given)."""
+        if found_tnodes is None:
+            found_tnodes = self.new_found_tnodes_dict()
+        if not self.add_found_tnode(t, found_tnodes):
             return []
 
         st_candidates = []
         if DEBUG:
-            for st_label, sts in self.found_tnodes.items():
+            for st_label, sts in found_tnodes.items():
                 val_idxs = [f'{str(st.value)[:4]}({st.index})' for st in sts]
                 var_info = ', '.join(val_idxs)
                 msg = f' - {st_label}: ' + var_info
                 logger.log(logging.DEBUG + 2, msg)
 
-        for st_label, sts in self.found_tnodes.items():
+        offsets, base = [], None
+        for st_label, sts in found_tnodes.items():
+            offset = self.join_offsets.get(st_label, None)
+            offsets.append(offset)
             if st_label == t.node_label:
                 st_candidates.append([t])
+                if offset is not None:
+                    base = t.index - offset
             elif len(sts) == 0:
                 return []
             else:
                 st_candidates.append(sts)
 
-        st_combos = itertools.product(*st_candidates)
-        return st_combos
+        if len(offsets) - offsets.count(None) < 2:
+            return itertools.product(*st_candidates)
+        return list(self.join_source_tnodes(st_candidates, offsets, base))
+
+    @staticmethod
+    def join_source_tnodes(st_candidates: list, offsets: list,
+                           base: int=None):
+        """Yields the combinations of the candidate source TNodes
+        where the index of each TNode less its offset is the same,
+        ignoring candidates with an offset of None.
+
+        Combinations are yielded in the same order as
+        ``itertools.product``, but only index-compatible TNodes are
+        enumerated by looking them up in each `TNodeStore` by index.
+        """
+        def extend(i: int, combo: tuple, base: int):
+            if i == len(st_candidates):
+                yield combo
+                return
+            sts, offset = st_candidates[i], offsets[i]
+            if offset is None or base is None:
+                options = sts
+            elif isinstance(sts, TNodeStore):
+                options = sts.with_index(base + offset)
+            else:
+                options = [st for st in sts if st.index - offset == base]
+            for st in options:
+                st_base = base if offset is None else st.index - offset
+                yield from extend(i + 1, combo + (st,), st_base)
+
+        return extend(0, (), base)
 
-    def add_found_tnode(self, t: TNode) -> bool:
+    def add_found_tnode(self, t: TNode, found_tnodes: dict) -> bool:
         """Returns true if `t` successfully added as a viable path to a
         source node."""
-        node_label = self.get_relevant_node_label(t)
-        if self.check_tnode_already_found(t, node_label):
-            return False
-        _append_to_dict_list(self.found_tnodes, node_label, t)
-        return True
+        node_label = self.get_relevant_node_label(t, found_tnodes)
+        if node_label not in found_tnodes:
+            found_tnodes[node_label] = TNodeStore()
+        return found_tnodes[node_label].add(t)
 
-    def get_relevant_node_label(self, t: TNode) -> str:
+    def get_relevant_node_label(self, t: TNode, found_tnodes: dict) -> str:
         """Returns the node label of `t` or of the super set of `t`, if
         present."""
-        if t.node_label not in self.found_tnodes:
+        if t.node_label not in found_tnodes:
             for label, sub_labels in self.subset_alt_labels.items():
                 if t.node_label in sub_labels:
                     return label
         return t.node_label
 
-    def check_tnode_already_found(self, t: TNode,
-                                  source_node_label: str) -> bool:
+    def check_tnode_already_found(self, t: TNode, source_node_label: str,
+                                  found_tnodes: dict) -> bool:
         """Returns True if `t` has already been found as a path to the
         source node."""
-        ft_labels = [ft.label for ft in self.found_tnodes[source_node_label]]
-        return t.label in ft_labels
+        return t.label in found_tnodes[source_node_label]
 
     @staticmethod
     def via_true(*args, **kwargs):
@@ -889,171 +1769,1072 @@ class Edge:
         return self.label
 
 
-class Pathfinder:
-    """Object for searching a path through the hypergraph from a
-    collection of source nodes to a single target node. If the
-    hypergraph is fully constrained and viable, then the result of the
-    search is a singular value of the target node."""
-    def __init__(self, target: Node, sources: list, nodes: dict,
-                 no_weights: bool=False, memory_mode: bool=False):
-        """Creates a new Pathfinder object.
+class Frontier:
+    """Priority queue of search roots (TNodes) waiting to be explored.
 
-        Parameters
-        ----------
-        target : Node
-            The Node that the Pathfinder will attempt to solve for.
-        sources : list
-            A list of Node objects that have static values for the
-            simulation.
-        nodes : dict
-            A dictionary of nodes taken from the hypergraph as
-            {label : Node}.
-        no_weights : bool, default=False
-            Optional run mode where weights aren't considered. This
-            speeds up the simulation but prevents model switching.
-        memory_mode : bool, default=False
-            Optional run mode where all encountered TNodes are stored to
-            a list property. Increases memory usage.
+    Roots are ordered by lowest index, then by lowest cost, with ties
+    broken by insertion order. Backed by a binary heap so that pushing
+    and popping a root are both O(log n).
 
+    Other exploration orders (strategies) are given by subclasses
+    overriding `init_queue`, `push`, `pop`, `peek`, `__len__`, and
+    `__iter__` (see `Pathfinder.make_frontier`).
+    """
+    def __init__(self, tnodes: list=None, heuristic: dict=None):
+        """Creates a new `Frontier` object.
 
-        Properties
+        Parameters
         ----------
-        search_counter : int
-            Number of nodes explored.
-        explored_edges : dict
-            Dict counting the number of times edges were processed
-            {label : int}.
-        explored_tnodes : list
-            Dict containing the all TNodes explored during searching,
-            if not running in memory mode.
+        tnodes : list, optional
+            TNodes to seed the frontier with.
+        heuristic : dict, optional
+            A lower bound on the cost remaining to reach the target from
+            each node, {label : float}, added to the cost of each root
+            (A* search). Nodes not in the heuristic cannot reach the
+            target, and are ordered last.
         """
-        self.nodes = nodes
-        self.source_nodes = sources
-        self.target_node = target
-        self.no_weights = no_weights
-        self.memory_mode = memory_mode
-        self.search_roots = []
-        self.search_counter = 0
-        self.explored_edges = {}
-        self.explored_nodes = []
+        self.heuristic = heuristic
+        self.counter = itertools.count()
+        self.init_queue()
+        if tnodes is not None:
+            for t in tnodes:
+                self.push(t)
+
+    def init_queue(self):
+        """Creates the empty container of the frontier."""
+        self.heap = []
+
+    def push(self, t: TNode):
+        """Adds the TNode to the frontier."""
+        cost = t.cost
+        if self.heuristic is not None:
+            cost += self.heuristic.get(t.node_label, inf)
+        heapq.heappush(self.heap, (t.index, cost, next(self.counter), t))
+
+    def pop(self) -> TNode:
+        """Removes and returns the most optimal TNode in the frontier,
+        or None if the frontier is empty."""
+        if len(self.heap) == 0:
+            return None
+        return heapq.heappop(self.heap)[-1]
 
-    def search(self, min_index: int=0, debug_nodes: list=None,
-               debug_edges: list=None, search_depth: int=10000):
-        """Searches the hypergraph for a path from the source nodes to the
-        target node. Returns the solved TNode for the target, with a dictionary
-        of found values {label : [Any,]} given by the `target.values`.
+    def peek(self) -> TNode:
+        """Returns the most optimal TNode without removing it."""
+        if len(self.heap) == 0:
+            return None
+        return self.heap[0][-1]
 
-        Parameters
-        ----------
-        min_index : int, default=0
-            Minimum index of the target node.
-        debug_nodes: list, optional
-            List of nodes to log additional information for.
-        debug_edges : list, optional
-            List of edges to log additional information for.
-        search_depth : int, default=10000
-            Number of TNodes to explore before search is failed.
-        """
-        debug_nodes = [] if debug_nodes is None else debug_nodes
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __iter__(self):
+        """Iterates over the TNodes in insertion order."""
+        entries = sorted(self.heap, key=lambda entry: entry[2])
+        return (entry[-1] for entry in entries)
+
+
+class DepthFirstFrontier(Frontier):
+    """Frontier exploring the most recently found TNodes first, ignoring
+    index and cost, to quickly reach a first solution.
+
+    TNodes found together (between two pops, such as the parents found
+    by exploring one TNode) are explored in order of the heuristic (the
+    lowest cost remaining to reach the target, see
+    `Pathfinder.find_cost_to_go`), with ties broken by the most recently
+    found. Without a heuristic the frontier is a plain stack.
+
+    The solution found is not necessarily the minimum-cost solution, and
+    a search may follow a cycle until the search depth is exceeded.
+    """
+    def init_queue(self):
+        """Creates the stack of entries of the form (cost_to_go,
+        counter, TNode), and the batch of entries pushed since the last
+        pop."""
+        self.stack = []
+        self.batch = []
+
+    def push(self, t: TNode):
+        """Adds the TNode to the batch of recently found TNodes."""
+        cost_to_go = 0.
+        if self.heuristic is not None:
+            cost_to_go = self.heuristic.get(t.node_label, inf)
+        self.batch.append((cost_to_go, next(self.counter), t))
+
+    def flush(self):
+        """Moves the batch onto the stack, so that the TNode with the
+        lowest cost to go is on top."""
+        if len(self.batch) == 0:
+            return
+        self.batch.sort(key=lambda entry: (-entry[0], entry[1]))
+        self.stack.extend(self.batch)
+        self.batch = []
+
+    def pop(self) -> TNode:
+        """Removes and returns the most recently found TNode with the
+        lowest cost to go, or None if the frontier is empty."""
+        self.flush()
+        if len(self.stack) == 0:
+            return None
+        return self.stack.pop()[-1]
+
+    def peek(self) -> TNode:
+        """Returns the TNode that would be popped without removing it."""
+        self.flush()
+        if len(self.stack) == 0:
+            return None
+        return self.stack[-1][-1]
+
+    def __len__(self) -> int:
+        return len(self.stack) + len(self.batch)
+
+    def __iter__(self):
+        self.flush()
+        return (entry[-1] for entry in self.stack)
+
+
+class BreadthFirstFrontier(Frontier):
+    """Frontier exploring TNodes in the order they were found, ignoring
+    index and cost. Suited to Hypergraphs without weights (see
+    `Hypergraph.no_weights`), where every TNode has the same cost.
+    """
+    def init_queue(self):
+        """Creates the first-in first-out queue of TNodes."""
+        self.queue = deque()
+
+    def push(self, t: TNode):
+        """Adds the TNode to the frontier."""
+        self.queue.append(t)
+
+    def pop(self) -> TNode:
+        """Removes and returns the earliest added TNode, or None if the
+        frontier is empty."""
+        if len(self.queue) == 0:
+            return None
+        return self.queue.popleft()
+
+    def peek(self) -> TNode:
+        """Returns the earliest added TNode without removing it."""
+        if len(self.queue) == 0:
+            return None
+        return self.queue[0]
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def __iter__(self):
+        return iter(self.queue)
+
+
+class SolveContext:
+    """The mutable state of a solve, kept apart from the Hypergraph so
+    that a single Hypergraph can serve many concurrent solves.
+
+    Each thread (or asyncio task) solving the same Hypergraph should
+    pass its own context to `Hypergraph.solve`. A context can be reused
+    between solves to retain the TNodes found by previous solves (see
+    the `to_reset` argument of `Hypergraph.solve`).
+    """
+    def __init__(self):
+        """Creates a new `SolveContext` object.
+
+
+        Properties
+        ----------
+        values : dict
+            Values of the input nodes, {label : value}, which override
+            the static values of the nodes.
+        found_tnodes : dict
+            TNodes found for the source nodes of each edge, {edge label
+            : {node_label : TNodeStore}}.
+        uids : Iterator[int]
+            Counter supplying unique identifiers to TNodes found during
+            searching.
+        solved_tnodes : list
+            List of explored TNodes from the last search. Only set if run
+            in `memory_mode`.
+        last_solve : dict | None
+            The target, inputs, and solved TNode of the last successful
+            solve, along with the arguments to solve with, used by
+            `Hypergraph.resolve`.
+        """
+        self.values = {}
+        self.found_tnodes = {}
+        self.uids = itertools.count()
+        self.solved_tnodes = []
+        self.last_solve = None
+
+    def reset(self):
+        """Removes all values and found TNodes in the context."""
+        self.values = {}
+        self.found_tnodes = {}
+        self.uids = itertools.count()
+        self.solved_tnodes = []
+        self.last_solve = None
+
+    def get_found_tnodes(self, edge) -> dict:
+        """Returns the found_tnodes dictionary for the edge, {node_label :
+        TNodeStore}."""
+        found_tnodes = self.found_tnodes.get(edge.label, None)
+        if found_tnodes is None:
+            found_tnodes = edge.new_found_tnodes_dict()
+            self.found_tnodes[edge.label] = found_tnodes
+        return found_tnodes
+
+    def get_value(self, node: Node):
+        """Returns the value of the node in the context, defaulting to its
+        static value."""
+        if node.label in self.values:
+            return self.values[node.label]
+        return node.static_value
+
+
+class CancelToken:
+    """Flag for cancelling a search from another thread (or task).
+
+    The flag is checked each time the Pathfinder pops a TNode from the
+    frontier, and every `Pathfinder.poll_interval` seconds while waiting
+    on relations running in a pool of workers, raising a
+    `SearchCancelled` exception. A relation called in the searching
+    thread is not interrupted, so the search stops once it returns.
+    """
+    def __init__(self):
+        """Creates a new `CancelToken` object.
+
+
+        Properties
+        ----------
+        event : threading.Event
+            Event set once the token is cancelled.
+        """
+        self.event = threading.Event()
+
+    def cancel(self):
+        """Cancels any search checking the token."""
+        self.event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the token has been cancelled."""
+        return self.event.is_set()
+
+
+class SearchCancelled(Exception):
+    """Raised when a search is cancelled, or exceeds its timeout, before
+    a solution is found. Carries the statistics of the partial search."""
+    def __init__(self, message: str, search_counter: int=0,
+                 explored_edges: dict=None, frontier_size: int=0,
+                 timed_out: bool=False):
+        """Creates a new `SearchCancelled` exception.
+
+        Parameters
+        ----------
+        message : str
+            Description of why the search was stopped.
+        search_counter : int, default=0
+            Number of TNodes found before the search was stopped.
+        explored_edges : dict, optional
+            Number of times each edge was explored, processed, and
+            found a value, {label : [int, int, int]}.
+        frontier_size : int, default=0
+            Number of TNodes waiting to be explored.
+        timed_out : bool, default=False
+            Whether the search exceeded its timeout, rather than being
+            cancelled by a `CancelToken`.
+        """
+        super().__init__(message)
+        self.search_counter = search_counter
+        self.explored_edges = {} if explored_edges is None else explored_edges
+        self.frontier_size = frontier_size
+        self.timed_out = timed_out
+
+    @classmethod
+    def check(cls, deadline: float=None, cancel_token: CancelToken=None):
+        """Raises a `SearchCancelled` exception if the cancel token has
+        been cancelled or the deadline (from `time.monotonic`) has
+        passed."""
+        if cancel_token is not None and cancel_token.cancelled:
+            raise cls('Search cancelled.')
+        if deadline is not None and time.monotonic() > deadline:
+            raise cls('Search timed out.', timed_out=True)
+
+
+class UnreachableTarget(Exception):
+    """Raised when solving for a target that cannot be reached from the
+    inputs, before any relation is called (see
+    `Hypergraph.find_missing_sources`)."""
+    def __init__(self, target: str, missing_sources: list):
+        """Creates a new `UnreachableTarget` exception.
+
+        Parameters
+        ----------
+        target : str
+            The label of the target node.
+        missing_sources : list
+            The labels of the nodes the target depends on that are
+            neither reachable nor generated by any edge, one of which
+            must be given as an input.
+        """
+        super().__init__(f'{target} cannot be reached from the inputs, '
+                         + 'missing sources: ' + ', '.join(missing_sources))
+        self.target = target
+        self.missing_sources = missing_sources
+
+
+class Pathfinder:
+    """Object for searching a path through the hypergraph from a
+    collection of source nodes to a single target node. If the
+    hypergraph is fully constrained and viable, then the result of the
+    search is a singular value of the target node."""
+    def __init__(self, target: Node, sources: list, nodes: dict,
+                 no_weights: bool=False, memory_mode: bool=False,
+                 context: SolveContext=None, relevant_edges: set=None,
+                 heuristic: dict=None, strategy='index',
+                 deadline: float=None, cancel_token: CancelToken=None,
+                 executors: dict=None):
+        """Creates a new Pathfinder object.
+
+        Parameters
+        ----------
+        target : Node
+            The Node that the Pathfinder will attempt to solve for.
+        sources : list
+            A list of Node objects that have static values for the
+            simulation.
+        nodes : dict
+            A dictionary of nodes taken from the hypergraph as
+            {label : Node}.
+        no_weights : bool, default=False
+            Optional run mode where weights aren't considered. This
+            speeds up the simulation but prevents model switching.
+        memory_mode : bool, default=False
+            Optional run mode where all encountered TNodes are stored to
+            a list property. Increases memory usage.
+        context : SolveContext, optional
+            The state of the solve, holding the input values and the
+            TNodes found for each edge. Should be shared between
+            searches that reuse found TNodes.
+        relevant_edges : set, optional
+            Labels of the only edges to explore, such as the edges the
+            target depends on (see `Pathfinder.find_ancestor_edges`).
+            Every edge is explored if not set.
+        heuristic : dict, optional
+            A lower bound on the cost remaining to reach the target from
+            each node (see `Pathfinder.find_cost_to_go`), used to order
+            the search roots as an A* search.
+        strategy : str | type, default='index'
+            The order in which search roots are explored, either a key
+            of `Pathfinder.strategies` or a subclass of `Frontier`.
+        deadline : float, optional
+            The time (from `time.monotonic`) by which the search must
+            finish, raising `SearchCancelled` once exceeded.
+        cancel_token : CancelToken, optional
+            Token for cancelling the search from another thread, raising
+            `SearchCancelled` once cancelled.
+        executors : dict, optional
+            Pools of workers shared between searches, {'thread' |
+            'process' : Executor}, such as `Hypergraph.executors`. Pools
+            created by the search are added to it and left running. If
+            not given, pools are created for the search and shut down
+            at its end.
+
+
+        Properties
+        ----------
+        search_roots : Frontier
+            Priority queue of TNodes waiting to be explored.
+        search_counter : int
+            Number of nodes explored.
+        explored_edges : dict
+            Dict counting the number of times edges were processed
+            {label : int}.
+        explored_tnodes : list
+            Dict containing the all TNodes explored during searching,
+            if not running in memory mode.
+        log_debug : bool
+            Whether debugging messages (`logging.DEBUG`) are logged,
+            checked once at the start of each search.
+        log_debug_items : bool
+            Whether messages for `debug_nodes` and `debug_edges`
+            (`logging.DEBUG + 2`) are logged, checked once at the start
+            of each search.
+        executors : dict
+            Pools of workers used by edges offloading their relations,
+            {'thread' | 'process' : Executor}.
+        owns_executors : bool
+            Whether the pools of workers were created for the search,
+            and so are shut down at the end of it.
+        pending : dict
+            Futures submitted to executors during the search, of the
+            form {Future : (Edge, found_tnodes)}, used to dispose of the
+            source TNodes once the future resolves to a value.
+        edge_caches : dict
+            The relation caches of the explored edges, {label :
+            RelationCache}.
+        explore_edges : dict
+            The relevant edges leading from each node, {label : tuple},
+            found when the node is first explored.
+        """
+        self.nodes = nodes
+        self.source_nodes = sources
+        self.target_node = target
+        self.no_weights = no_weights
+        self.memory_mode = memory_mode
+        self.context = SolveContext() if context is None else context
+        self.search_roots = self.make_frontier(strategy, heuristic)
+        self.deadline = deadline
+        self.cancel_token = cancel_token
+        self.search_counter = 0
+        self.explored_edges = {}
+        self.explored_nodes = []
+        self.edge_caches = {}
+        self.owns_executors = executors is None
+        self.executors = {} if executors is None else executors
+        self.pending = {}
+        self.relevant_edges = relevant_edges
+        self.explore_edges = {}
+        self.cache_log_levels()
+
+    @staticmethod
+    def find_ancestor_edges(targets: list, nodes: dict) -> frozenset:
+        """Returns the labels of every edge that the target nodes depend
+        on, found by searching backwards through the generating edges of
+        each node (and the edges generating the sub nodes of each node,
+        whose TNodes are also explored as the node).
+
+        Nodes are looked up by label in `nodes`, {label : Node}, as the
+        source nodes of merged edges may be copies of the nodes in the
+        hypergraph."""
+        edges = set()
+        visited = set()
+        stack = [n for n in targets if not isinstance(n, tuple)]
+        while len(stack) > 0:
+            node = stack.pop()
+            if node.label in visited:
+                continue
+            visited.add(node.label)
+            node = nodes.get(node.label, node)
+            for edge in node.generating_edges:
+                edges.add(edge.label)
+                stack.extend(sn for sn in edge.source_nodes.values()
+                             if not isinstance(sn, tuple))
+            stack.extend(sub_n for sub_n in node.sub_nodes
+                         if not isinstance(sub_n, tuple))
+        return frozenset(edges)
+
+    @staticmethod
+    def find_cost_to_go(target: Node, nodes: dict,
+                        relevant_edges: set=None) -> dict:
+        """Returns the lowest total weight of the edges leading from each
+        node to the target, {label : float}, found by searching backwards
+        from the target (Dijkstra's algorithm).
+
+        As every edge traversed adds a new TNode, whose edge is counted
+        in the cost of the tree, this is a lower bound on the cost
+        remaining to solve for the target from a TNode of the node (an
+        admissible and consistent heuristic for A* search). Edges of
+        infinite weight and those not in `relevant_edges` are ignored.
+        """
+        cost_to_go = {target.label: 0.}
+        queue = [(0., target.label)]
+        while len(queue) > 0:
+            cost, label = heapq.heappop(queue)
+            if cost > cost_to_go[label]:
+                continue
+            for edge in nodes[label].generating_edges:
+                if isinf(edge.weight) or (
+                        relevant_edges is not None
+                        and edge.label not in relevant_edges):
+                    continue
+                edge_cost = cost + edge.weight
+                for sn in edge.source_nodes.values():
+                    if isinstance(sn, tuple):
+                        continue
+                    sn = nodes.get(sn.label, sn)
+                    for n in [sn, *sn.sub_nodes]:
+                        if isinstance(n, tuple):
+                            continue
+                        if edge_cost < cost_to_go.get(n.label, inf):
+                            cost_to_go[n.label] = edge_cost
+                            heapq.heappush(queue, (edge_cost, n.label))
+        return cost_to_go
+
+    @staticmethod
+    def find_reachable_nodes(sources: list, nodes: dict,
+                             relevant_edges: set=None) -> set:
+        """Returns the labels of the nodes that can be reached from the
+        source nodes, ignoring the conditions (vias) and indices of each
+        edge.
+
+        A node is reached once every source node of an edge generating it
+        has been reached (or a sub node of the source node), searching
+        forwards from the source nodes over the edges explored by the
+        Pathfinder (only those in `relevant_edges`, if given). No
+        relations are called.
+        """
+        reached = set()
+        remaining = {}
+        queue = deque(sn.label for sn in sources)
+        while len(queue) > 0:
+            label = queue.popleft()
+            if label in reached:
+                continue
+            reached.add(label)
+            for edge in nodes[label].get_explore_edges():
+                if (relevant_edges is not None
+                        and edge.label not in relevant_edges):
+                    continue
+                if edge.label not in remaining:
+                    remaining[edge.label] = {
+                        sn.label for sn in edge.source_nodes.values()
+                        if not isinstance(sn, tuple)}
+                needed = remaining[edge.label]
+                for sn_label in list(needed):
+                    sn = nodes.get(sn_label, None)
+                    if sn_label == label or (sn is not None and any(
+                            sub_n.label == label for sub_n in sn.sub_nodes
+                            if not isinstance(sub_n, tuple))):
+                        needed.discard(sn_label)
+                if len(needed) == 0:
+                    queue.append(edge.target.label)
+        return reached
+
+    poll_interval = 0.05
+    """Seconds between checks of the cancel token while waiting on a
+    relation running in a pool of workers."""
+
+    strategies = {
+        'index': Frontier,
+        'astar': Frontier,
+        'depth': DepthFirstFrontier,
+        'breadth': BreadthFirstFrontier,
+    }
+
+    @classmethod
+    def make_frontier(cls, strategy='index', heuristic: dict=None) -> Frontier:
+        """Returns an empty frontier ordering search roots by the
+        strategy, which is either a `Frontier` subclass or one of:
+
+        - 'index' : lowest index, then lowest cost (the default).
+        - 'astar' : lowest index, then lowest cost plus `heuristic`.
+        - 'depth' : most recently found first (depth-first).
+        - 'breadth' : earliest found first (breadth-first).
+
+        Only 'index' and 'astar' are guaranteed to find the minimum-cost
+        solution.
+        """
+        if isinstance(strategy, type) and issubclass(strategy, Frontier):
+            return strategy(heuristic=heuristic)
+        if strategy not in cls.strategies:
+            raise ValueError(f'Unrecognized search strategy: {strategy}')
+        return cls.strategies[strategy](heuristic=heuristic)
+
+    def cache_log_levels(self):
+        """Caches whether debugging messages are logged, so that the
+        messages are not built in the search loop unless needed."""
+        self.log_debug = logger.isEnabledFor(logging.DEBUG)
+        self.log_debug_items = logger.isEnabledFor(logging.DEBUG + 2)
+
+    def search(self, min_index: int=0, debug_nodes: list=None,
+               debug_edges: list=None, search_depth: int=10000):
+        """Searches the hypergraph for a path from the source nodes to the
+        target node. Returns the solved TNode for the target, with a dictionary
+        of found values {label : [Any,]} given by the `target.values`.
+
+        Parameters
+        ----------
+        min_index : int, default=0
+            Minimum index of the target node.
+        debug_nodes: list, optional
+            List of nodes to log additional information for.
+        debug_edges : list, optional
+            List of edges to log additional information for.
+        search_depth : int, default=10000
+            Number of TNodes to explore before search is failed.
+        """
+        debug_nodes, debug_edges = self.start_search(debug_nodes, debug_edges)
+
+        try:
+            while len(self.search_roots) > 0:
+                root = self.next_root(search_depth)
+                if root is None:
+                    continue
+                if self.is_solution(root, min_index):
+                    return root
+                self.explore(root, debug_nodes, debug_edges)
+        finally:
+            self.close_executors()
+
+        logger.info('Finished search, no solutions found')
+        self.log_debugging_report()
+        return None
+
+    def iter_search(self, until_index: int=0, watch: list=None,
+                    debug_nodes: list=None, debug_edges: list=None,
+                    search_depth: int=10000):
+        """Searches the hypergraph as in `search`, yielding each new
+        index of the target (and of the watched nodes) as soon as it is
+        explored.
+
+        Yields tuples of the form (node_label, index, value), rather
+        than TNodes, and releases the children of each TNode once it is
+        explored, so that explored TNodes are freed once they are
+        disposed of (see the `disposable` argument of `Edge.__init__`).
+        The memory held is then bounded by the frontier and the TNodes
+        found for edges without disposable sources, which are kept for
+        later combinations, each without its tree. As the trees are
+        released, the `values` of the explored TNodes are not available.
+
+        Parameters
+        ----------
+        until_index : int, default=0
+            The index of the target at which to stop searching.
+        watch : list, optional
+            Labels of other nodes to yield the values of.
+        debug_nodes: list, optional
+            List of nodes to log additional information for.
+        debug_edges : list, optional
+            List of edges to log additional information for.
+        search_depth : int, default=10000
+            Number of TNodes to explore before search is failed.
+        """
+        watched = {self.target_node.label}
+        if watch is not None:
+            watched.update(watch)
+        last_indices = {}
+        debug_nodes, debug_edges = self.start_search(debug_nodes, debug_edges)
+
+        try:
+            while len(self.search_roots) > 0:
+                root = self.next_root(search_depth)
+                if root is None:
+                    continue
+                label = root.node_label
+                if (label in watched
+                        and root.index > last_indices.get(label, 0)):
+                    last_indices[label] = root.index
+                    yield label, root.index, root.value
+                if self.is_solution(root, until_index):
+                    return
+                self.explore(root, debug_nodes, debug_edges)
+                # Parents only read the value, index, and edge set of the
+                # TNode, so its tree is released once explored
+                root.children = []
+        finally:
+            self.close_executors()
+
+        logger.info('Finished search, no solutions found')
+        self.log_debugging_report()
+
+    async def asearch(self, min_index: int=0, debug_nodes: list=None,
+                      debug_edges: list=None, search_depth: int=10000,
+                      max_concurrency: int=None):
+        """Searches the hypergraph as in `search`, awaiting any relation
+        (or via) that returns an awaitable.
+
+        Each edge leading from an explored TNode is processed in its own
+        task, so that other search roots continue to be explored while
+        relations are pending. Edges with disposable source nodes are
+        processed by one task at a time, preserving the order in which
+        TNodes are disposed of.
+
+        Parameters
+        ----------
+        min_index : int, default=0
+            Minimum index of the target node.
+        debug_nodes: list, optional
+            List of nodes to log additional information for.
+        debug_edges : list, optional
+            List of edges to log additional information for.
+        search_depth : int, default=10000
+            Number of TNodes to explore before search is failed.
+        max_concurrency : int, optional
+            Maximum number of relations awaited at once, unbounded if
+            not set.
+
+        Notes
+        -----
+        The first solution popped from the frontier is returned, so a
+        cheaper solution waiting on a pending relation may be missed.
+        """
+        debug_nodes, debug_edges = self.start_search(debug_nodes, debug_edges)
+        limiter = None
+        if max_concurrency is not None:
+            limiter = asyncio.Semaphore(max_concurrency)
+        edge_locks, pending = {}, set()
+
+        try:
+            while len(self.search_roots) > 0 or len(pending) > 0:
+                if len(self.search_roots) == 0:
+                    done, pending = await asyncio.wait(
+                        pending, timeout=self.get_wait_timeout(),
+                        return_when=asyncio.FIRST_COMPLETED)
+                    self.check_cancelled()
+                    for task in done:
+                        task.result()
+                    continue
+
+                root = self.next_root(search_depth)
+                if root is None:
+                    continue
+                if self.is_solution(root, min_index):
+                    return root
+
+                leading_edges = self.get_edges_to_explore(root, debug_nodes)
+                self.log_explore(root, leading_edges, debug_nodes)
+                for i, edge in enumerate(leading_edges):
+                    lock = None
+                    if len(edge.disposable) > 0:
+                        lock = edge_locks.setdefault(edge.label,
+                                                     asyncio.Lock())
+                    coro = self.aexplore_edge(root, edge, i, debug_edges,
+                                              limiter, lock)
+                    pending.add(asyncio.ensure_future(coro))
+
+                await asyncio.sleep(0)
+                done = {task for task in pending if task.done()}
+                pending -= done
+                for task in done:
+                    task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            self.close_executors()
+
+        logger.info('Finished search, no solutions found')
+        self.log_debugging_report()
+        return None
+
+    def start_search(self, debug_nodes: list=None,
+                     debug_edges: list=None) -> tuple:
+        """Prepares a new search, seeding the frontier with the source
+        nodes. Returns the lists of debugging nodes and edges."""
+        debug_nodes = [] if debug_nodes is None else debug_nodes
         debug_edges = [] if debug_edges is None else debug_edges
         self.explored_nodes, self.explored_edges = [], {}
+        self.edge_caches = {}
+        self.cache_log_levels()
+        if not self.log_debug_items:
+            debug_nodes, debug_edges = [], []
         logger.info(f'Begin search for {self.target_node.label}')
 
         for sn in self.source_nodes:
-            st = TNode(f'{sn.label}#0', sn.label, sn.static_value, cost=0.)
-            self.search_roots.append(st)
-
-        while len(self.search_roots) > 0:
-            if self.search_counter > search_depth:
-                self.log_debugging_report()
-                raise Exception("Maximum search limit exceeded.")
-
+            if (self.relevant_edges is not None
+                    and sn.label != self.target_node.label
+                    and len(self.get_edges_to_explore(sn.label)) == 0):
+                continue
+            value = self.context.get_value(sn)
+            st = TNode(f'{sn.label}#0', sn.label, value, cost=0.)
+            self.search_roots.push(st)
+        return debug_nodes, debug_edges
+
+    def next_root(self, search_depth: int) -> TNode:
+        """Pops the next TNode to explore from the frontier, raising an
+        exception if the search depth has been exceeded. Returns None if
+        the TNode was discarded after its pending value resolved to
+        None."""
+        if self.search_counter > search_depth:
+            self.log_debugging_report()
+            raise Exception("Maximum search limit exceeded.")
+        self.check_cancelled()
+
+        if self.log_debug:
             labels = [f'{s.node_label}' for s in self.search_roots]
             logger.debug('Search trees: ' + ', '.join(labels))
 
-            root = self.select_root()
+        root = self.select_root()
+        if isinstance(root.value, Future):
+            if not self.resolve_pending(root):
+                return None
 
-            logger.debug(f'Exploring <{root.label}>, index={root.index}:')
-            if self.memory_mode:
-                self.explored_nodes.append(root)
+        if self.log_debug:
+            logger.debug(f'Exploring <{root.label}> ({root.node_label}), '
+                         f'index={root.index}:')
+        if self.memory_mode:
+            self.explored_nodes.append(root)
+        return root
 
-            if root.node_label is self.target_node.label and root.index >= min_index:
-                logger.info(f'Finished search for {self.target_node.label} with value of {root.value}')
-                self.log_debugging_report()
-                return root
+    def resolve_pending(self, t: TNode) -> bool:
+        """Waits for the pending value of the TNode, returning False if
+        it resolved to None.
 
-            self.explore(root, debug_nodes, debug_edges)
+        Once resolved to a value, the source TNodes of the TNode are
+        disposed of and the TNode is given its uid and counted, as if
+        the relation had been called when the TNode was created.
+        """
+        future = t.value
+        t.value = self.wait_for(future)
+        edge, found_tnodes = self.pending.pop(future, (None, None))
+        if t.value is None:
+            return False
+        if edge is not None:
+            edge.dispose_solved_tnodes(t.children, found_tnodes)
+        t.set_uid(next(self.context.uids), track_cost=not self.no_weights)
+        self.search_counter += 1
+        return True
 
-        logger.info('Finished search, no solutions found')
+    def check_cancelled(self):
+        """Raises a `SearchCancelled` exception if the cancel token has
+        been cancelled or the deadline has passed."""
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            self.cancel('Search cancelled.')
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.cancel('Search timed out.', timed_out=True)
+
+    def get_time_remaining(self) -> float:
+        """Returns the seconds until the deadline, or None if the search
+        has no deadline."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.)
+
+    def get_wait_timeout(self) -> float:
+        """Returns the seconds to wait on pending relations before
+        checking for cancellation again, or None to wait until one
+        finishes."""
+        remaining = self.get_time_remaining()
+        if self.cancel_token is None:
+            return remaining
+        if remaining is None:
+            return self.poll_interval
+        return min(remaining, self.poll_interval)
+
+    def wait_for(self, future: Future):
+        """Waits for the result of a relation running in a pool of
+        workers, raising a `SearchCancelled` exception if the search is
+        cancelled or times out first."""
+        while not future.done():
+            wait([future], timeout=self.get_wait_timeout())
+            self.check_cancelled()
+        return future.result()
+
+    def cancel(self, message: str, timed_out: bool=False):
+        """Stops the search, raising a `SearchCancelled` exception with
+        the statistics of the search so far. Relations running in pools
+        of workers are left to finish in the background."""
         self.log_debugging_report()
-        return None
+        self.close_executors(wait=False)
+        raise SearchCancelled(message, self.search_counter,
+                              self.explored_edges, len(self.search_roots),
+                              timed_out)
+
+    def is_solution(self, root: TNode, min_index: int) -> bool:
+        """Returns True if the TNode solves for the target, logging the
+        end of the search."""
+        if (root.node_label is self.target_node.label
+                and root.index >= min_index):
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f'Finished search for {self.target_node.label} '
+                            f'with value of {root.value}')
+            self.log_debugging_report()
+            return True
+        return False
 
     def explore(self, t: TNode, debug_nodes: list=None, debug_edges: list=None):
         """Discovers all possible routes from the TNode."""
         leading_edges = self.get_edges_to_explore(t, debug_nodes)
-        if t.node_label in debug_nodes:
+        self.log_explore(t, leading_edges, debug_nodes)
+
+        for i, edge in enumerate(leading_edges):
+            combos, found_tnodes = self.start_edge(t, edge, i, debug_edges)
+            for j, combo in enumerate(combos):
+                pt = self.make_parent_tnode(combo, edge.target, edge,
+                                            found_tnodes)
+                self.finish_combo(edge, j, combo, pt)
+
+    async def aexplore_edge(self, t: TNode, edge: Edge, i: int,
+                            debug_edges: list=None, limiter=None, lock=None):
+        """Discovers all possible routes from the TNode along the edge,
+        awaiting the relation for each combination of source TNodes.
+
+        The relations are awaited within `limiter` (a semaphore bounding
+        the number of pending relations) and every combination is
+        processed within `lock`, if given.
+        """
+        if lock is None:
+            return await self.aexplore_edge_combos(t, edge, i, debug_edges,
+                                                   limiter)
+        async with lock:
+            return await self.aexplore_edge_combos(t, edge, i, debug_edges,
+                                                   limiter)
+
+    async def aexplore_edge_combos(self, t: TNode, edge: Edge, i: int,
+                                   debug_edges: list=None, limiter=None):
+        """Processes each combination of source TNodes for the edge (see
+        `aexplore_edge`)."""
+        combos, found_tnodes = self.start_edge(t, edge, i, debug_edges)
+        for j, combo in enumerate(combos):
+            if limiter is None:
+                parent_val = await self.aprocess_edge(combo, edge,
+                                                      found_tnodes)
+            else:
+                async with limiter:
+                    parent_val = await self.aprocess_edge(combo, edge,
+                                                          found_tnodes)
+            pt = self.add_parent_tnode(parent_val, combo, edge.target, edge)
+            self.finish_combo(edge, j, combo, pt)
+
+    async def aprocess_edge(self, source_tnodes: list, edge: Edge,
+                            found_tnodes: dict=None):
+        """Processes the edge for the source TNodes, awaiting the
+        relation in the edge's executor if it has one."""
+        if edge.executor is None:
+            return await edge.aprocess(source_tnodes, found_tnodes)
+        executor = self.get_executor(edge.executor)
+        future = edge.submit(source_tnodes, executor)
+        if future is None:
+            return None
+        value = await asyncio.wrap_future(future)
+        if value is not None:
+            edge.dispose_solved_tnodes(source_tnodes, found_tnodes)
+        return value
+
+    def log_explore(self, t: TNode, leading_edges: list,
+                    debug_nodes: list=None):
+        """Logs the edges leading from the TNode, if it is being
+        debugged."""
+        if debug_nodes is not None and t.node_label in debug_nodes:
             logger.log(logging.DEBUG + 2,
                        f'Exploring {t.node_label}, index: {t.index}, '
                        + 'leading edges: '
                        + ', '.join(str(le) for le in leading_edges)
                        + f'\n{t.get_tree()}')
 
-        for i, edge in enumerate(leading_edges):
-            if edge.label not in self.explored_edges:
-                self.explored_edges[edge.label] = [0, 0, 0]
+    def start_edge(self, t: TNode, edge: Edge, i: int,
+                   debug_edges: list=None) -> tuple:
+        """Begins exploring the edge from the TNode, returning the
+        combinations of source TNodes to process and the found_tnodes
+        dictionary of the edge."""
+        if edge.label not in self.explored_edges:
+            self.explored_edges[edge.label] = [0, 0, 0]
+            if edge.cache is not None:
+                self.edge_caches[edge.label] = edge.cache
 
-            self.explored_edges[edge.label][0] += 1
+        self.explored_edges[edge.label][0] += 1
 
-            DEBUG = edge.label in debug_edges
+        DEBUG = debug_edges is not None and edge.label in debug_edges
+        if self.log_debug:
             level = logging.DEBUG + (2 if DEBUG else 0)
-            logger.log(level, f"- Edge {i}=<{edge.label}>, target=<{edge.target.label}>:")
+            logger.log(level, f"- Edge {i}=<{edge.label}>, "
+                              f"target=<{edge.target.label}>:")
 
-            combos = edge.get_source_tnode_combinations(t, DEBUG)
-            for j, combo in enumerate(combos):
-                pt = self.make_parent_tnode(combo, edge.target, edge)
-                self.explored_edges[edge.label][1] += 1
-                if pt is not None:
-                    self.explored_edges[edge.label][2] += 1
+        found_tnodes = self.context.get_found_tnodes(edge)
+        combos = edge.get_source_tnode_combinations(t, DEBUG, found_tnodes)
+        return combos, found_tnodes
+
+    def finish_combo(self, edge: Edge, j: int, combo: tuple, pt: TNode):
+        """Records the result of processing a combination of source
+        TNodes along the edge."""
+        self.explored_edges[edge.label][1] += 1
+        if pt is not None:
+            self.explored_edges[edge.label][2] += 1
 
-                node_indices = ', '.join(f'{n.label} ({n.index})' for n in combo)
-                logger.debug(f'   - Combo {j}: ' + node_indices + f'-> <{str(pt)}>')
+        if self.log_debug:
+            node_indices = ', '.join(f'{n.label} ({n.index})' for n in combo)
+            logger.debug(f'   - Combo {j}: ' + node_indices
+                         + f'-> <{str(pt)}>')
 
     def get_edges_to_explore(self, t: TNode, debug_nodes: list=None) -> list:
-        """Finds and orders all edges leading from the node by label."""
-        n = self.nodes[t.node_label]
-        super_node_leading_edges = (sup_n.leading_edges for sup_n in n.super_nodes)
-        leading_edges = list(n.leading_edges.union(*super_node_leading_edges))
-        leading_edges.sort(key=lambda le: le.label)
-        leading_edges = filter(lambda le: not isinf(le.weight), leading_edges)
-        return leading_edges
-
-    def make_parent_tnode(self, source_tnodes: list, node: Node, edge: Edge):
+        """Finds and orders all edges leading from the node by label,
+        excluding any edge not in `relevant_edges`."""
+        label = t if isinstance(t, str) else t.node_label
+        if self.relevant_edges is None:
+            return self.nodes[label].get_explore_edges()
+        edges = self.explore_edges.get(label, None)
+        if edges is None:
+            edges = tuple(edge
+                          for edge in self.nodes[label].get_explore_edges()
+                          if edge.label in self.relevant_edges)
+            self.explore_edges[label] = edges
+        return edges
+
+    def make_parent_tnode(self, source_tnodes: list, node: Node, edge: Edge,
+                          found_tnodes: dict=None):
         """Creates a TNode for the next step along the edge."""
-        parent_val = edge.process(source_tnodes)
+        if found_tnodes is None:
+            found_tnodes = self.context.get_found_tnodes(edge)
+        if edge.executor is None:
+            parent_val = edge.process(source_tnodes, found_tnodes)
+        else:
+            executor = self.get_executor(edge.executor)
+            parent_val = edge.submit(source_tnodes, executor)
+            if parent_val is not None:
+                self.pending[parent_val] = (edge, found_tnodes)
+        return self.add_parent_tnode(parent_val, source_tnodes, node, edge)
+
+    def get_executor(self, executor) -> Executor:
+        """Returns the executor for an edge, creating a pool of workers
+        if given as 'thread' or 'process' and not already in
+        `executors`.
+
+        Process pools are forked where available, so that relations need
+        not be importable by the workers.
+        """
+        if isinstance(executor, Executor):
+            return executor
+        if executor not in self.executors:
+            if executor == 'thread':
+                pool = ThreadPoolExecutor()
+            elif executor == 'process':
+                if 'fork' in multiprocessing.get_all_start_methods():
+                    mp_context = multiprocessing.get_context('fork')
+                else:
+                    mp_context = multiprocessing.get_context()
+                pool = ProcessPoolExecutor(mp_context=mp_context)
+            else:
+                raise ValueError(f'Unrecognized executor: {executor}')
+            self.executors.setdefault(executor, pool)
+        return self.executors[executor]
+
+    def close_executors(self, wait: bool=True):
+        """Cancels pending relations and shuts down the pools of workers
+        created for the search (unless shared between searches), waiting
+        for running relations to finish if `wait` is True."""
+        for future in self.pending:
+            future.cancel()
+        self.pending = {}
+        if not self.owns_executors:
+            return
+        for executor in self.executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+        self.executors = {}
+
+    def add_parent_tnode(self, parent_val, source_tnodes: list, node: Node,
+                         edge: Edge):
+        """Creates a TNode for the value found along the edge and adds it
+        to the frontier, returning None if no value was found.
+
+        The value may be a `Future` for a relation offloaded to an
+        executor, which is resolved when the TNode is popped from the
+        frontier (see `Pathfinder.resolve_pending`). As the position of
+        a TNode in the frontier does not depend on its value, the search
+        proceeds in the same order as if the relation had been called
+        directly. The TNode is only given a uid (and label) and counted
+        once its value is found.
+        """
         if parent_val is None:
             return None
         node_label = node.label
         children = source_tnodes
-        gen_edge_label = edge.label + '#' + str(self.search_counter)
-        label = f'{node_label}#{self.search_counter + 1}'
+        is_pending = isinstance(parent_val, Future)
+        uid = None if is_pending else next(self.context.uids)
         cost = 0.0 if self.no_weights else None
 
-        parent_t = TNode(label,
+        parent_t = TNode(uid,
                          node_label,
                          parent_val,
                          children,
                          cost=cost,
-                         gen_edge_label=gen_edge_label,
-                         gen_edge_cost=edge.weight)
-        parent_t.values = self.merge_found_values(parent_val,
-                                                  node.label,
-                                                  source_tnodes)
+                         gen_edge_label=edge.label,
+                         gen_edge_cost=edge.weight,
+                         uid=uid)
         parent_t.index += edge.index_offset
 
         if self.edge_resolves_input(parent_t):
             return None
-        self.search_roots.append(parent_t)
-        self.search_counter += 1
+        self.search_roots.push(parent_t)
+        if not is_pending:
+            self.search_counter += 1
         return parent_t
 
     def edge_resolves_input(self, parent_t: TNode):
@@ -1070,29 +2851,12 @@ class Pathfinder:
 
     def select_root(self) -> TNode:
         """Determines the most optimal path to explore."""
-        if len(self.search_roots) == 0:
-            return None
-
-        min_idx = min(self.search_roots, key=lambda t: t.index).index
-        lowest_idx_roots = filter(lambda t: t.index == min_idx, self.search_roots)
-        root = min(lowest_idx_roots, key=lambda t: t.cost)
-
-        self.search_roots.remove(root)
-        return root
-
-    def merge_found_values(self, parent_val, parent_label,
-                           source_tnodes: list) -> dict:
-        """Merges the values found in the source nodes with the parent node."""
-        values = {parent_label: []}
-        for st in source_tnodes:
-            for label, st_values in st.values.items():
-                if label not in values or len(st_values) > len(values[label]):
-                    values[label] = st_values
-        values[parent_label].append(parent_val)
-        return values
+        return self.search_roots.pop()
 
     def log_debugging_report(self):
         """Prints a debugging report of the search."""
+        if not logger.isEnabledFor(logging.DEBUG + 1):
+            return
         out = f'\nDebugging Report for {self.target_node.label}:\n'
         out += f'\tFinal search counter: {self.search_counter}\n'
         out += '\tExplored edges'
@@ -1101,8 +2865,643 @@ class Pathfinder:
         sorted_edges.sort(key=lambda a: max(a[1]), reverse=True)
         for e, vals in sorted_edges:
             out += f'\t\t<{e}>: ' + ' | '.join([str(v) for v in vals]) + '\n'
+        cache_stats = self.get_cache_stats()
+        if len(cache_stats) > 0:
+            out += '\tRelation caches (# hits | # misses):\n'
+            for e, vals in cache_stats.items():
+                out += (f'\t\t<{e}>: ' + ' | '.join([str(v) for v in vals])
+                        + '\n')
         logger.log(logging.DEBUG + 1, out)
 
+    def get_cache_stats(self) -> dict:
+        """Returns the hits and misses of the relation cache of each
+        explored edge, {label : (hits, misses)}. The counts are totals
+        for the cache, which may be shared between edges and searches."""
+        return {label: (cache.hits, cache.misses)
+                for label, cache in self.edge_caches.items()}
+
+
+class BatchColumn:
+    """A column of values for a node, one for each element of a batch
+    solve."""
+    __slots__ = ('array',)
+
+    def __init__(self, array):
+        self.array = array
+
+    @staticmethod
+    def from_values(values: list):
+        """Creates a column from a list of values, falling back to an
+        object array if the values cannot be stacked."""
+        try:
+            array = np.array(values)
+            if array.shape[:1] == (len(values),) and array.dtype != object:
+                return BatchColumn(array)
+        except ValueError:
+            pass
+        array = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            array[i] = value
+        return BatchColumn(array)
+
+    @staticmethod
+    def get_element(array, i: int):
+        """Returns the element of the array, converting NumPy scalars to
+        Python scalars so that relations behave as when solving for the
+        element alone (such as raising on division by zero)."""
+        value = array[i]
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    def __repr__(self):
+        return f'BatchColumn({self.array!r})'
+
+
+class SolvePlan:
+    """An execution plan extracted from a successful search, which can
+    be replayed to solve for the same target with new input values.
+
+    The plan is an ordered list of steps, one for each TNode in the
+    solved tree, where each child is listed before its parent. Source
+    steps read the current value of their node, while edge steps
+    evaluate the edge on the TNodes produced by earlier steps.
+    """
+    def __init__(self, t: TNode, edges: dict):
+        """Creates a new `SolvePlan` object.
+
+        Parameters
+        ----------
+        t : TNode
+            The solved TNode returned by a search.
+        edges : dict
+            The edges of the hypergraph, {label : Edge}.
+
+
+        Properties
+        ----------
+        steps : list
+            Steps of the form (node_label, edge, child_steps), where
+            `edge` is None for source nodes and `child_steps` are the
+            indices of the steps producing the children of the TNode.
+        is_valid : bool
+            False if an edge in the tree could not be found.
+        """
+        self.steps = []
+        self.is_valid = True
+        step_ids = {}
+        for tt in self.order_tnodes(t):
+            edge = None
+            if tt.gen_edge_label is not None:
+                edge = edges.get(tt.gen_edge_label, None)
+                if edge is None:
+                    self.is_valid = False
+                    return
+            child_steps = tuple(step_ids[id(c)] for c in tt.children)
+            step_ids[id(tt)] = len(self.steps)
+            self.steps.append((tt.node_label, edge, child_steps))
+
+    @staticmethod
+    def order_tnodes(t: TNode) -> list:
+        """Returns each TNode in the tree once, with each child listed
+        before its parent, in the order of the steps of the plan."""
+        ordered, seen = [], set()
+        stack = [(t, False)]
+        while len(stack) > 0:
+            tt, expanded = stack.pop()
+            if id(tt) in seen:
+                continue
+            if not expanded and len(tt.children) > 0:
+                stack.append((tt, True))
+                stack.extend((c, False) for c in reversed(tt.children))
+                continue
+            seen.add(id(tt))
+            ordered.append(tt)
+        return ordered
+
+    def replay(self, nodes: dict, context: SolveContext=None,
+               no_weights: bool=False, timeout: float=None,
+               cancel_token: CancelToken=None) -> TNode:
+        """Replays the plan with the current values of the source nodes,
+        returning the solved TNode or None if an edge was not viable.
+
+        Parameters
+        ----------
+        nodes : dict
+            Nodes in the hypergraph, {label : Node}.
+        context : SolveContext, optional
+            The state of the solve, holding the values of the input
+            nodes.
+        no_weights : bool, default=False
+            Whether weights are ignored when calculating costs.
+        timeout : float, optional
+            Number of seconds after which the replay is stopped, raising
+            a `SearchCancelled` exception. Checked before each step.
+        cancel_token : CancelToken, optional
+            Token for cancelling the replay from another thread, checked
+            before each step.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        tnodes = self.replay_changed(nodes, context=context,
+                                     no_weights=no_weights, deadline=deadline,
+                                     cancel_token=cancel_token)
+        return None if tnodes is None else tnodes[-1]
+
+    def replay_changed(self, nodes: dict, tnodes: list=None,
+                       changed: set=None, context: SolveContext=None,
+                       no_weights: bool=False, deadline: float=None,
+                       cancel_token: CancelToken=None) -> list:
+        """Replays the steps of the plan depending on the changed source
+        nodes, reusing the TNodes of a previous replay for every other
+        step. Returns the TNode for each step, or None if an edge was not
+        viable.
+
+        Parameters
+        ----------
+        nodes : dict
+            Nodes in the hypergraph, {label : Node}.
+        tnodes : list, optional
+            The TNode for each step from a previous replay (see
+            `SolvePlan.order_tnodes`). Every step is replayed if not
+            given.
+        changed : set, optional
+            Labels of the source nodes whose values have changed.
+        context : SolveContext, optional
+            The state of the solve, holding the values of the input
+            nodes.
+        no_weights : bool, default=False
+            Whether weights are ignored when calculating costs.
+        deadline : float, optional
+            Time (from `time.monotonic`) after which the replay is
+            stopped, raising a `SearchCancelled` exception.
+        cancel_token : CancelToken, optional
+            Token for cancelling the replay from another thread.
+        """
+        context = SolveContext() if context is None else context
+        changed = set() if changed is None else changed
+        new_tnodes, dirty = [], set()
+        for i, (node_label, edge, child_steps) in enumerate(self.steps):
+            if tnodes is not None:
+                if edge is None and node_label not in changed:
+                    new_tnodes.append(tnodes[i])
+                    continue
+                if edge is not None and dirty.isdisjoint(child_steps):
+                    new_tnodes.append(tnodes[i])
+                    continue
+            dirty.add(i)
+            if edge is None:
+                value = context.get_value(nodes[node_label])
+                new_tnodes.append(TNode(f'{node_label}#0', node_label, value,
+                                        cost=0.))
+                continue
+            SearchCancelled.check(deadline, cancel_token)
+            children = tuple(new_tnodes[j] for j in child_steps)
+            source_vals, source_idxs = edge.get_source_vals_and_idxs(children)
+            value = edge.process_values(source_vals, source_idxs)
+            if value is None:
+                return None
+            uid = next(context.uids)
+            t = TNode(uid, node_label, value, children,
+                      cost=0.0 if no_weights else None,
+                      gen_edge_label=edge.label,
+                      gen_edge_cost=edge.weight,
+                      uid=uid)
+            t.index += edge.index_offset
+            new_tnodes.append(t)
+        return new_tnodes
+
+    def replay_batch(self, nodes: dict, columns: dict, size: int,
+                     no_weights: bool=False, deadline: float=None,
+                     cancel_token: CancelToken=None) -> tuple:
+        """Replays the plan over columns of source values, returning a
+        column of target values and a mask of the elements for which
+        the plan was not viable.
+
+        Edges with array-safe relations (see ``relations.array_safe``),
+        no `via` condition, and only float (or complex) columns as
+        inputs are evaluated once over whole columns. All other edges
+        are evaluated for each element in turn.
+
+        Parameters
+        ----------
+        nodes : dict
+            Nodes in the hypergraph, {label : Node}.
+        columns : dict
+            Values for the source nodes, {label : ndarray | Any}, where
+            arrays are columns with an element for each solve. Source
+            nodes not in `columns` take their static value.
+        size : int
+            The number of elements in each column.
+        no_weights : bool, default=False
+            Whether weights are ignored when calculating costs.
+        deadline : float, optional
+            Time (from `time.monotonic`) after which the replay is
+            stopped, raising a `SearchCancelled` exception. Checked
+            before each edge and each element evaluated in turn.
+        cancel_token : CancelToken, optional
+            Token for cancelling the replay from another thread.
+
+        Returns
+        -------
+        ndarray | None
+            The values of the target for each element, or None if the
+            plan was not viable for any element.
+        ndarray
+            Boolean mask of the elements that were not solved.
+        """
+        failed = np.zeros(size, dtype=bool)
+        tnodes = []
+        for i, (node_label, edge, child_steps) in enumerate(self.steps):
+            if edge is None:
+                value = columns.get(node_label, nodes[node_label].static_value)
+                if isinstance(value, np.ndarray) and np.ndim(value) > 0:
+                    value = BatchColumn(value)
+                tnodes.append(TNode(f'{node_label}#0', node_label, value,
+                                    cost=0.))
+                continue
+            children = tuple(tnodes[j] for j in child_steps)
+            value = self.evaluate_batch(edge, children, failed, deadline,
+                                        cancel_token)
+            if value is None or failed.all():
+                return None, failed
+            t = TNode(f'{node_label}#{i}', node_label, value, children,
+                      cost=0.0 if no_weights else None,
+                      gen_edge_label=edge.label,
+                      gen_edge_cost=edge.weight)
+            t.index += edge.index_offset
+            tnodes.append(t)
+        out = tnodes[-1].value
+        if not isinstance(out, BatchColumn):
+            out = BatchColumn.from_values([out] * size)
+        return out.array, failed
+
+    @staticmethod
+    def evaluate_batch(edge, children: tuple, failed, deadline: float=None,
+                       cancel_token: CancelToken=None):
+        """Evaluates the edge over the batch, returning a `BatchColumn`,
+        a single value if no source is a column, or None if the edge is
+        not viable. Elements for which the edge is not viable are
+        marked in `failed`."""
+        SearchCancelled.check(deadline, cancel_token)
+        source_vals, source_idxs = edge.get_source_vals_and_idxs(children)
+        column_keys = [key for key, val in source_vals.items()
+                       if isinstance(val, BatchColumn)]
+        if len(column_keys) == 0:
+            value = edge.process_values(source_vals, source_idxs)
+            if value is None:
+                failed[:] = True
+            return value
+
+        # Integer arrays may overflow where Python integers would not
+        if (edge.via is edge.via_true
+                and getattr(edge.rel, 'array_safe', False)
+                and all(source_vals[key].array.dtype.kind in 'fc'
+                        for key in column_keys)):
+            array_vals = dict(source_vals)
+            for key in column_keys:
+                array_vals[key] = source_vals[key].array
+            try:
+                value = edge.process_values(array_vals, source_idxs)
+            except Exception:
+                value = None
+            if value is None:
+                pass
+            elif (isinstance(value, np.ndarray)
+                  and value.shape[:1] == failed.shape):
+                return BatchColumn(value)
+            else:
+                return value
+
+        values, fill = [], None
+        element_vals = dict(source_vals)
+        for i in range(len(failed)):
+            value = None
+            if not failed[i]:
+                SearchCancelled.check(deadline, cancel_token)
+                for key in column_keys:
+                    element_vals[key] = BatchColumn.get_element(
+                        source_vals[key].array, i)
+                value = edge.process_values(element_vals, source_idxs)
+            if value is None:
+                failed[i] = True
+            elif fill is None:
+                fill = value
+            values.append(value)
+        if fill is None:
+            return None
+        # Failed elements are filled so that later columns can be computed
+        return BatchColumn.from_values([fill if f else v for v, f in
+                                        zip(values, failed)])
+
+
+class CycleSchedule:
+    """A per-step schedule of edges for simulating cycles formed by edges
+    with an `index_offset`, extracted from a search to a low index of the
+    target.
+
+    The TNodes in the solved tree are grouped into blocks by index, and
+    each TNode is identified within its block by a role, (node_label,
+    edge_label, occurrence). The highest block with the same roles as
+    the block below it, with each child either shared by both blocks
+    (such as constants) or found from the previous period, is taken as
+    one period of the cycle. The period is repeated for each index,
+    while the blocks above it finish the tree for the target (including
+    any exit edges whose vias stop the simulation).
+    """
+    def __init__(self, t: TNode, edges: dict):
+        """Creates a new `CycleSchedule` object.
+
+        Parameters
+        ----------
+        t : TNode
+            The solved TNode returned by a search, with an index of at
+            least 4.
+        edges : dict
+            The edges of the hypergraph, {label : Edge}.
+
+
+        Properties
+        ----------
+        blocks : dict
+            Solved TNodes of the search by index, {index : {role :
+            TNode}}.
+        index : int
+            The index of the period in `blocks`.
+        period : list
+            Steps of one period of the cycle, of the form (role, edge,
+            children), where each child is either a source TNode or a
+            reference (delta, role) to the TNode with the role in the
+            block `delta` indices below.
+        finish : list
+            Lists of steps for each block completing the tree for the
+            target from a period, of the same form as `period`.
+        target_role : tuple
+            The role of the target in the last finishing block.
+        depth : int
+            The largest `delta` referenced by a step.
+        is_valid : bool
+            False if the tree does not contain a period of a cycle.
+        """
+        self.blocks, self.period, self.finish = {}, [], []
+        self.depth = 1
+        self.is_valid = False
+        self.index = None
+        self.target_role = None
+        if t.index < 4:
+            return
+
+        refs = {}
+        for tt in SolvePlan.order_tnodes(t):
+            if tt.gen_edge_label is None:
+                continue
+            if tt.gen_edge_label not in edges:
+                return
+            block = self.blocks.setdefault(tt.index, {})
+            occurrence = sum(1 for role in block if role[:2] ==
+                             (tt.node_label, tt.gen_edge_label))
+            role = (tt.node_label, tt.gen_edge_label, occurrence)
+            block[role] = tt
+            refs[id(tt)] = (tt.index, role)
+        self.target_role = refs[id(t)][1]
+
+        for index in range(t.index - 1, 2, -1):
+            self.period = self.get_period_steps(index, refs, edges)
+            if self.period is not None:
+                self.index = index
+                break
+        if self.period is None:
+            self.period = []
+            return
+        period = self.blocks[self.index]
+
+        for index in range(self.index + 1, t.index + 1):
+            steps = []
+            for role, tt in self.blocks.get(index, {}).items():
+                children = []
+                for c in tt.children:
+                    c_index, c_role = refs.get(id(c), (None, None))
+                    if c_role is None or (c_index <= self.index and
+                                          c_role not in period):
+                        children.append(c)
+                    else:
+                        children.append((index - c_index, c_role))
+                steps.append((role, edges[role[1]], tuple(children)))
+            self.finish.append(steps)
+
+        deltas = [ref[0] for steps in [self.period] + self.finish
+                  for _, _, children in steps
+                  for ref in children if isinstance(ref, tuple)]
+        self.depth = max([1] + deltas)
+        self.is_valid = True
+
+    def get_period_steps(self, index: int, refs: dict, edges: dict) -> list:
+        """Returns the steps of the block at the index if the block is a
+        period of the cycle, otherwise None."""
+        period = self.blocks.get(index, {})
+        prev_period = self.blocks.get(index - 1, {})
+        if len(period) == 0:
+            return None
+        steps = []
+        for role, tt in period.items():
+            prev_tt = prev_period.get(role, None)
+            if prev_tt is None or len(prev_tt.children) != len(tt.children):
+                return None
+            children = []
+            for c, prev_c in zip(tt.children, prev_tt.children):
+                if c is prev_c:
+                    children.append(c)
+                    continue
+                c_index, c_role = refs.get(id(c), (None, None))
+                if ( c_role not in period or
+                     refs.get(id(prev_c), None) != (c_index - 1, c_role) ):
+                    return None
+                children.append((index - c_index, c_role))
+            steps.append((role, edges[role[1]], tuple(children)))
+        return steps
+
+    def run(self, min_index: int, context: SolveContext=None,
+            no_weights: bool=False, max_steps: int=100000,
+            deadline: float=None, cancel_token: CancelToken=None) -> TNode:
+        """Steps the cycle until the tree for the target is viable with
+        an index of at least `min_index`, returning the TNode for the
+        target. Returns None if the schedule does not hold for a step.
+
+        Parameters
+        ----------
+        min_index : int
+            The minimum index of the target.
+        context : SolveContext, optional
+            The state of the solve, supplying unique identifiers for the
+            TNodes.
+        no_weights : bool, default=False
+            Whether weights are ignored when calculating costs.
+        max_steps : int, default=100000
+            Number of steps to take before the simulation is failed.
+        deadline : float, optional
+            Time (from `time.monotonic`) after which the simulation is
+            stopped, raising a `SearchCancelled` exception. Checked
+            before each step.
+        cancel_token : CancelToken, optional
+            Token for cancelling the simulation from another thread.
+        """
+        context = SolveContext() if context is None else context
+        blocks = {index: block for index, block in self.blocks.items()
+                  if index <= self.index}
+        finished = {index: block for index, block in self.blocks.items()
+                    if index > self.index}
+        index = self.index
+        for _ in range(max_steps):
+            SearchCancelled.check(deadline, cancel_token)
+            index += 1
+            block = self.step(self.period, blocks, index, context,
+                              no_weights, finished.get(index, None))
+            if block is None:
+                return None
+            blocks[index] = block
+            blocks.pop(index - self.depth - 1, None)
+
+            finished = dict(blocks)
+            for offset, steps in enumerate(self.finish, start=1):
+                block = self.step(steps, finished, index + offset, context,
+                                  no_weights)
+                if block is None:
+                    break
+                finished[index + offset] = block
+            else:
+                t = finished[index + len(self.finish)][self.target_role]
+                if t.index >= min_index:
+                    return t
+        raise Exception("Maximum search limit exceeded.")
+
+    @staticmethod
+    def step(steps: list, blocks: dict, index: int, context: SolveContext,
+             no_weights: bool=False, reusable: dict=None) -> dict:
+        """Evaluates the steps for the block at the index, returning the
+        block {role : TNode}, or None if a step is not viable.
+
+        TNodes in `reusable` (a block for the same index) are reused for
+        steps with the same role and children.
+        """
+        block = {}
+        for role, edge, child_refs in steps:
+            children = []
+            for ref in child_refs:
+                if isinstance(ref, TNode):
+                    children.append(ref)
+                    continue
+                delta, c_role = ref
+                source = block if delta == 0 else blocks.get(index - delta, {})
+                child = source.get(c_role, None)
+                if child is None:
+                    return None
+                children.append(child)
+
+            prev = None if reusable is None else reusable.get(role, None)
+            if prev is not None and all(a is b for a, b in
+                                        zip(prev.children, children)):
+                block[role] = prev
+                continue
+
+            source_vals, source_idxs = edge.get_source_vals_and_idxs(children)
+            value = edge.process_values(source_vals, source_idxs)
+            if value is None:
+                return None
+            uid = next(context.uids)
+            t = TNode(uid, role[0], value, children,
+                      cost=0.0 if no_weights else None,
+                      gen_edge_label=edge.label,
+                      gen_edge_cost=edge.weight,
+                      uid=uid)
+            t.index += edge.index_offset
+            if t.index != index:
+                return None
+            block[role] = t
+        return block
+
+
+class FrameStore:
+    """Columnar store of the values found by each solve (a frame), kept
+    as a NumPy array for each node label.
+
+    Values of a node sharing a single numeric type are stored in an array
+    of that type, while other values are stored in an object array, so
+    that values are returned with their original types. Only the values
+    are stored, releasing the tree of the solved TNode, unless the TNode
+    is kept (such as in memory mode).
+    """
+    NUMERIC_TYPES = (bool, int, float, complex)
+
+    def __init__(self, max_frames: int=None):
+        """Creates a new `FrameStore` object.
+
+        Parameters
+        ----------
+        max_frames : int, optional
+            The maximum number of frames to retain, discarding the
+            oldest frames first. Unbounded if not set.
+
+
+        Properties
+        ----------
+        frames : deque
+            The values of each frame, {label : ndarray}.
+        tnodes : deque
+            The solved TNode of each frame, or None if not kept.
+        """
+        self.max_frames = max_frames
+        self.frames = deque(maxlen=max_frames)
+        self.tnodes = deque(maxlen=max_frames)
+
+    def add(self, t: TNode, keep_tnode: bool=False):
+        """Extracts the values of the solved TNode as a new frame,
+        keeping the TNode only if `keep_tnode` is True."""
+        if t is None or self.max_frames == 0:
+            return
+        values = t.calc_values
+        if values is None:
+            values = t.merge_values()
+        frame = {label: self.to_column(vals) for label, vals in values.items()}
+        self.frames.append(frame)
+        self.tnodes.append(t if keep_tnode else None)
+
+    @classmethod
+    def to_column(cls, values: list) -> np.ndarray:
+        """Returns the values as an array, of a numeric type if every
+        value shares the same numeric type, otherwise of objects."""
+        types = {type(val) for val in values}
+        if len(types) == 1 and types.pop() in cls.NUMERIC_TYPES:
+            try:
+                return np.array(values)
+            except OverflowError:
+                pass
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+
+    def get_frames(self) -> list:
+        """Returns the values of each frame, [{label : [Any,]},]."""
+        return [{label: column.tolist() for label, column in frame.items()}
+                for frame in self.frames]
+
+    def get_column(self, label: str, frame: int=-1) -> np.ndarray:
+        """Returns the array of values of the node in the frame,
+        defaulting to the latest frame."""
+        return self.frames[frame][label]
+
+    def clear(self):
+        """Removes all frames."""
+        self.frames.clear()
+        self.tnodes.clear()
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __getitem__(self, i: int) -> dict:
+        return self.frames[i]
+
+    def __iter__(self):
+        return iter(self.frames)
+
 
 class Hypergraph:
     """Builder class for a hypergraph. See demos for examples on how to
@@ -1118,6 +3517,9 @@ class Hypergraph:
     solved_tnodes : list
         List of solved TNodes from a simulation. Only set if run in
         `memory_mode`.
+    context : SolveContext
+        The state of solves run without a given context, restarted when
+        the Hypergraph is reset.
     no_weights : bool
         Indicates no weights have been given to the edges in the
         Hypergraph, speeding up processing (but preventing model
@@ -1130,10 +3532,36 @@ class Hypergraph:
         methods passed as static inputs. This is only recommended for 
         trusted environments where the Hypergraph must be constructed 
         from a static file (such as a JSON input). 
+    cache_plans : bool
+        Indicates whether solve plans are cached and replayed for
+        repeated solves.
+    solve_plans : dict
+        Cached solve plans, {(target, sources, min_index, strategy,
+        version) : SolvePlan}.
+    relation_cache : RelationCache | None
+        Cache shared by the relations of the edges in the Hypergraph.
+    frames : FrameStore
+        The values found by each solve, with the solved TNodes only kept
+        in `memory_mode`.
+    version : int
+        Counter incremented whenever nodes or edges are added to the
+        Hypergraph.
+    revision : RevisionCounter
+        Counter incremented whenever the edges leading from a node of
+        the Hypergraph change, see `Hypergraph.get_version`.
+    ancestor_edges : dict
+        Cached labels of the edges each target depends on, {(targets,
+        version) : frozenset}, used to prune searches.
+    cost_to_go : dict
+        Cached lower bounds on the cost of reaching each target from
+        each node, {(target, version) : {label : float}}, used for A*
+        searches.
     """
     def __init__(self, name: str=None, no_weights: bool=False,
                  setup_logger: bool=False, logging_level=None,
-                 memory_mode: bool=False, unsafe_mode: bool=False):
+                 memory_mode: bool=False, unsafe_mode: bool=False,
+                 cache_plans: bool=False, cache_relations=None,
+                 max_frames: int=None):
         """Initialize a Hypergraph.
 
         .. _hypergraph_init:
@@ -1159,6 +3587,26 @@ class Hypergraph:
         unsafe_mode : bool, default=False
             Allows the hypergraph to execute foreign methods passed as 
             static inputs (such as from JSON files).
+        cache_plans : bool, default=False
+            Caches the path found by each successful search as a
+            `SolvePlan`, which is replayed for later solves of the same
+            target with the same input labels (see `Hypergraph.solve`).
+        cache_relations : RelationCache | int | bool, optional
+            Caches the values returned by the relation of each edge added
+            to the Hypergraph in a single shared `RelationCache`, given
+            as the cache, its maximum size, or True for a default cache.
+            Every relation must be pure (see `Edge.__init__`).
+        max_frames : int, optional
+            The maximum number of frames (the values found by each
+            solve) to retain, discarding the oldest first. Unbounded if
+            not set, and no frames are stored if 0.
+
+        Notes
+        -----
+        The pools of workers created for edges offloading their
+        relations (see the `executor` argument of
+        `Hypergraph.add_edge`) are kept in `executors` and shared by
+        every solve, until shut down by `Hypergraph.close_executors`.
         """
         self.name = 'null' if name is None else name
         self.nodes = {}
@@ -1172,7 +3620,16 @@ class Hypergraph:
         self.memory_mode = memory_mode
         self.unsafe_mode = unsafe_mode
         self.solved_tnodes = []
-        self.frames = []
+        self.frames = FrameStore(max_frames)
+        self.context = SolveContext()
+        self.cache_plans = cache_plans
+        self.solve_plans = {}
+        self.relation_cache = Edge.setup_cache(cache_relations)
+        self.version = 0
+        self.revision = RevisionCounter()
+        self.ancestor_edges = {}
+        self.cost_to_go = {}
+        self.executors = {}
         self.processed_rule = False
         
     def to_dict(self) -> dict:
@@ -1326,7 +3783,7 @@ class Hypergraph:
         Each frame is a set of values for the nodes in the Hypergraph,
         with no more than one value for each node.
         """
-        return [tn.values for tn in self.frames]    
+        return self.frames.get_frames()
 
     def __iadd__(self, o):
         """Merges the passed Hypergraph to self via a union operation."""
@@ -1342,10 +3799,14 @@ class Hypergraph:
         return new_hg
 
     def __copy__(self):
-        """Returns a shallow copy of the Hypergraph."""
+        """Returns a shallow copy of the Hypergraph, sharing its nodes,
+        edges, and relation cache."""
         new_hg = Hypergraph(
             no_weights=self.no_weights,
             memory_mode=self.memory_mode,
+            cache_plans=self.cache_plans,
+            cache_relations=self.relation_cache,
+            max_frames=self.frames.max_frames,
         )
         self.union(new_hg, self)
         return new_hg
@@ -1431,17 +3892,154 @@ class Hypergraph:
 
     def reset(self):
         """Removes all values in the hypergraph."""
-        for node in self.nodes.values():
-            if not node.is_constant:
-                node.static_value = None
-        for edge in self.edges.values():
-            edge.create_found_tnodes_dict()
+        self.context.reset()
         self.solved_tnodes = []
 
     def clear(self):
         """Resets the Hypergraph and removes any saved runs."""
         self.reset()
-        self.frames = []
+        self.frames.clear()
+        self.solve_plans = {}
+        self.ancestor_edges = {}
+        self.cost_to_go = {}
+
+    def close_executors(self, wait: bool=True):
+        """Shuts down the pools of workers shared by the solves of the
+        Hypergraph, waiting for running relations to finish if `wait` is
+        True. New pools are created by later solves as needed."""
+        for key in list(self.executors):
+            self.executors.pop(key).shutdown(wait=wait, cancel_futures=True)
+
+    def __getstate__(self) -> dict:
+        """Returns the state of the Hypergraph for pickling, leaving out
+        the state of previous solves (the frames, solved TNodes, context,
+        and solve plans) and the pools of workers."""
+        state = self.__dict__.copy()
+        state['executors'] = {}
+        state['solved_tnodes'] = []
+        state['frames'] = FrameStore(self.frames.max_frames)
+        state['context'] = SolveContext()
+        state['solve_plans'] = {}
+        return state
+
+    def get_version(self) -> tuple:
+        """Returns an identifier that changes whenever the structure of
+        the Hypergraph (or the edges leading from any node) changes."""
+        return (self.version, self.revision.count)
+
+    def get_ancestor_edges(self, *targets) -> frozenset:
+        """Returns the labels of the edges that the targets depend on,
+        cached for each version of the Hypergraph (see
+        `Pathfinder.find_ancestor_edges`)."""
+        nodes = [self.get_node(target) for target in targets]
+        key = (frozenset(node.label for node in nodes), self.get_version())
+        edges = self.ancestor_edges.get(key, None)
+        if edges is None:
+            self.ancestor_edges = {k: v for k, v in self.ancestor_edges.items()
+                                   if k[1] == key[1]}
+            edges = Pathfinder.find_ancestor_edges(nodes, self.nodes)
+            self.ancestor_edges[key] = edges
+        return edges
+
+    def get_cost_to_go(self, target) -> dict:
+        """Returns a lower bound on the cost of reaching the target from
+        each node, {label : float}, cached for each version of the
+        Hypergraph (see `Pathfinder.find_cost_to_go`)."""
+        target_node = self.get_node(target)
+        key = (target_node.label, self.get_version())
+        cost_to_go = self.cost_to_go.get(key, None)
+        if cost_to_go is None:
+            self.cost_to_go = {k: v for k, v in self.cost_to_go.items()
+                               if k[1] == key[1]}
+            cost_to_go = Pathfinder.find_cost_to_go(
+                target_node, self.nodes, self.get_ancestor_edges(target_node))
+            self.cost_to_go[key] = cost_to_go
+        return cost_to_go
+
+    @staticmethod
+    def get_deadline(timeout: float=None) -> float:
+        """Returns the time (from `time.monotonic`) at which a solve
+        started now times out, or None if there is no timeout."""
+        if timeout is None:
+            return None
+        return time.monotonic() + timeout
+
+    @staticmethod
+    def get_timeout(deadline: float=None) -> float:
+        """Returns the seconds remaining until the deadline (from
+        `Hypergraph.get_deadline`), or None if there is no deadline."""
+        if deadline is None:
+            return None
+        return max(deadline - time.monotonic(), 0.)
+
+    def get_heuristic(self, target_node: Node, strategy='index') -> dict:
+        """Returns the heuristic for a search for the target, or None
+        if the strategy does not use one.
+
+        An A* search ('astar') adds the heuristic to the cost of each
+        TNode, so it is not used without weights. A depth-first search
+        ('depth') only orders the TNodes found together by it.
+        """
+        frontier = strategy
+        if isinstance(strategy, str):
+            frontier = Pathfinder.strategies.get(strategy, None)
+        if isinstance(frontier, type) and issubclass(frontier,
+                                                     DepthFirstFrontier):
+            return self.get_cost_to_go(target_node)
+        if strategy != 'astar' or self.no_weights:
+            return None
+        return self.get_cost_to_go(target_node)
+
+    def find_missing_sources(self, target, sources: list) -> list:
+        """Checks whether the target can be reached from the source nodes
+        without calling any relations, returning None if it can.
+        Otherwise returns the labels of the nodes the target depends on
+        that are neither reachable nor generated by any edge, one of
+        which must be given as an input.
+
+        The check is structural (see `Pathfinder.find_reachable_nodes`),
+        so a reachable target may still not be solved if the conditions
+        of the edges are not met.
+
+        Parameters
+        ----------
+        target : Node | str
+            Node (or label of the node) to solve for.
+        sources : list
+            The source nodes (or labels of the nodes) with values.
+        """
+        target_node = self.get_node(target)
+        source_nodes = [self.get_node(sn) for sn in sources]
+        relevant_edges = self.get_ancestor_edges(target_node)
+        reached = Pathfinder.find_reachable_nodes(source_nodes, self.nodes,
+                                                  relevant_edges)
+        if target_node.label in reached:
+            return None
+        ancestors = {target_node.label}
+        for edge_label in relevant_edges:
+            source_nodes = self.edges[edge_label].source_nodes.values()
+            ancestors.update(sn.label for sn in source_nodes
+                             if not isinstance(sn, tuple))
+        return sorted(label for label in ancestors if label not in reached
+                      and len(self.nodes[label].generating_edges) == 0)
+
+    def check_reachable(self, target_node: Node, source_nodes: list) -> bool:
+        """Returns True if the target can be reached from the source
+        nodes.
+
+        Raises an `UnreachableTarget` exception if the target depends
+        on missing sources. Otherwise (such as if every edge leading to
+        the target has an infinite weight) logs that the target cannot
+        be reached and returns False.
+        """
+        missing = self.find_missing_sources(target_node, source_nodes)
+        if missing is None:
+            return True
+        if len(missing) > 0:
+            raise UnreachableTarget(target_node.label, missing)
+        logger.warning(f'{target_node.label} cannot be reached from the '
+                       'inputs')
+        return False
 
     def request_node_label(self, requested_label=None) -> str:
         """Generates a unique label for a node in the hypergraph"""
@@ -1499,17 +4097,22 @@ class Hypergraph:
             else:
                 label = self.request_node_label(node.label)
                 self.nodes[label] = node
+                node.add_revision(self.revision)
+                self.version += 1
         else:
             if node in self.nodes:
                 label = node
             else:
                 label = self.request_node_label(node)
                 self.nodes[label] = Node(label, value)
+                self.nodes[label].add_revision(self.revision)
+                self.version += 1
         return self.nodes[label]
 
     def add_edge(self, sources: dict, target, rel, via=None, index_via=None,
                  weight: float=1.0, label: str=None, index_offset: int=0,
-                 disposable=None, edge_props=None):
+                 disposable=None, edge_props=None, executor=None,
+                 cache=None):
         """Adds an edge to the hypergraph.
 
         .. _meth_add_edge:
@@ -1556,6 +4159,14 @@ class Hypergraph:
         edge_props : List(EdgeProperty) | EdgeProperty | str | int, optional
             A list of enumerated types that are used to configure the
             edge.
+        executor : str | Executor, optional
+            Offloads calls to `rel` to a pool of workers, either
+            'thread', 'process', or a `concurrent.futures.Executor`
+            (see `Pathfinder.get_executor`).
+        cache : RelationCache | int | bool, optional
+            Caches the values returned by `rel`, which must be pure (see
+            `Edge.__init__`). Defaults to the relation cache of the
+            Hypergraph, and can be set to False to disable caching.
         """
         source_nodes, source_inputs = self._get_nodes_and_identifiers(sources)
         target_nodes, target_inputs = self._get_nodes_and_identifiers([target])
@@ -1563,10 +4174,13 @@ class Hypergraph:
         edge = Edge(label, source_inputs, target_nodes[0],
                     rel, via, index_via, weight,
                     index_offset=index_offset, disposable=disposable,
-                    edge_props=edge_props)
+                    edge_props=edge_props, executor=executor,
+                    cache=self.relation_cache if cache is None else cache)
         self.edges[label] = edge
+        self.version += 1
         for sn in source_nodes:
             sn.leading_edges.add(edge)
+            sn.invalidate_explore_edges()
         for tn in target_nodes:
             tn.generating_edges.add(edge)
         return edge
@@ -1576,10 +4190,12 @@ class Hypergraph:
         if not isinstance(edge, Edge):
             raise TypeError('edge must be of type `Edge`')
         self.edges[edge.label] = edge
+        self.version += 1
         for sn in edge.source_nodes.values():
             sn = self.insert_node(sn)
             if sn is not None:
                 sn.leading_edges.add(edge)
+                sn.invalidate_explore_edges()
         tn = self.insert_node(edge.target)
         tn.generating_edges.add(edge)
 
@@ -1626,23 +4242,29 @@ class Hypergraph:
                   if not isinstance(node, tuple)]
         return node_list, inputs
 
-    def set_node_values(self, node_values: dict):
-        """Sets the values of the given nodes.
+    def set_node_values(self, node_values: dict, context: SolveContext=None):
+        """Sets the values of the given nodes in the context, defaulting
+        to the context of the Hypergraph.
 
         Creates a new node in the hypergraph if the given label is not
         found.
         """
+        context = self.context if context is None else context
         for key, value in node_values.items():
             try:
                 node = self.get_node(key)
             except KeyError:
                 node = self.insert_node(key, value)
-            node.static_value = value
+            context.values[node.label] = value
 
     def solve(self, target, inputs: dict=None, to_print: bool=False,
               min_index: int=0, debug_nodes: list=None, debug_edges: list=None,
               search_depth: int=100000, memory_mode: bool=False,
-              logging_level=None, to_reset: bool=True) -> TNode:
+              logging_level=None, to_reset: bool=True,
+              context: SolveContext=None, astar: bool=False,
+              strategy='index', timeout: float=None,
+              cancel_token: CancelToken=None,
+              to_record: bool=True) -> TNode:
         """Runs a BFS search to identify the first valid solution for
         `target`.
 
@@ -1676,6 +4298,53 @@ class Hypergraph:
             are preseeded. Should be `True` for independent simulations,
             `False` for repeated simulations of different values from
             the same scenario.
+        context : SolveContext, optional
+            The state of the solve, defaulting to the context of the
+            Hypergraph. Concurrent solves of the same Hypergraph (such
+            as from multiple threads) must each pass their own context.
+        astar : bool, default=False
+            Shorthand for ``strategy='astar'``.
+        strategy : str | type, default='index'
+            The order in which TNodes are explored (see
+            `Pathfinder.make_frontier`). Setting to 'astar' orders the
+            search by the cost of each TNode plus a lower bound on the
+            cost remaining to reach the target (see
+            `Hypergraph.get_cost_to_go`), exploring fewer branches of
+            weighted Hypergraphs while still finding the minimum-cost
+            solution for each index.
+        timeout : float, optional
+            Number of seconds after which the search is stopped, raising
+            a `SearchCancelled` exception. A relation in progress is not
+            interrupted unless running in a pool of workers (see the
+            `executor` argument of `Hypergraph.add_edge`).
+        cancel_token : CancelToken, optional
+            Token for cancelling the search from another thread, raising
+            a `SearchCancelled` exception. As with `timeout`, a relation
+            in progress is only interrupted when running in a pool of
+            workers (see `CancelToken`).
+        to_record : bool, default=True
+            Records the values found as a frame of the Hypergraph (see
+            `Hypergraph.frames`) and the solve as the last solve of the
+            context (see `Hypergraph.resolve`).
+
+        Notes
+        -----
+        If the Hypergraph is set to `cache_plans`, the path found by a
+        successful search is cached, keyed by the target, the labels of
+        the source nodes, `min_index`, the strategy, and the version of
+        the Hypergraph. Later solves matching the key replay the plan
+        instead of searching, and only search again if an edge in the
+        plan is not viable for the new values. A plan is not cached if
+        the new values could switch the search to another edge, that is
+        if a node in the plan has several generating edges and a `via`
+        condition on any edge it depends on (see
+        `Hypergraph.may_switch_edges`). Plans are not used when
+        `to_reset` is False or in memory mode.
+
+        Before searching, an `UnreachableTarget` exception is raised if
+        the target depends on nodes without values that no edge
+        generates (see `Hypergraph.find_missing_sources`). The same
+        holds for `iter_solve`, `simulate`, and `asolve`.
 
         Returns
         -------
@@ -1685,35 +4354,378 @@ class Hypergraph:
         if logging_level is not None:
             prev_logging_level = logger.getEffectiveLevel()
             self.set_logging_level(logging_level)
-        if to_reset:
-            self.reset()
-
-        inputs = {} if inputs is None else inputs
-        self.set_node_values(inputs)
-        source_nodes = self.process_source_nodes(inputs)
+        if astar:
+            strategy = 'astar'
+        deadline = self.get_deadline(timeout)
+        context, target_node, source_nodes = self.start_solve(
+            target, inputs, to_reset, context)
+
+        use_plan = (self.cache_plans and to_reset
+                    and not (self.memory_mode or memory_mode))
+        plan_key = (target_node.label,
+                    frozenset(sn.label for sn in source_nodes),
+                    min_index, strategy, self.get_version())
+        plan = self.solve_plans.get(plan_key, None) if use_plan else None
 
         try:
-            target_node = self.get_node(target)
-        except KeyError:
-            msg = f'Target node {str(target)} not found in Hypergraph.'
-            raise KeyError(msg)
+            t = None
+            if plan is not None:
+                t = plan.replay(self.nodes, context, self.no_weights,
+                                timeout=timeout, cancel_token=cancel_token)
+                if t is None:
+                    logger.info('Solve plan not viable, searching instead')
+            if t is None and self.check_reachable(target_node, source_nodes):
+                pf = Pathfinder(
+                    target=target_node,
+                    sources=source_nodes,
+                    nodes=self.nodes,
+                    no_weights=self.no_weights,
+                    memory_mode=self.memory_mode or memory_mode,
+                    context=context,
+                    relevant_edges=self.get_ancestor_edges(target_node),
+                    heuristic=self.get_heuristic(target_node, strategy),
+                    strategy=strategy,
+                    deadline=deadline,
+                    cancel_token=cancel_token,
+                    executors=self.executors,
+                )
+                t = pf.search(
+                    min_index=min_index,
+                    debug_nodes=debug_nodes,
+                    debug_edges=debug_edges,
+                    search_depth=search_depth,
+                )
+                if self.memory_mode or memory_mode:
+                    context.solved_tnodes = pf.explored_nodes
+                    if context is self.context:
+                        self.solved_tnodes = pf.explored_nodes
+                if use_plan and t is not None:
+                    self.cache_plan(plan_key, t)
+        except Exception as e:
+            logger.error(str(e))
+            raise e
+        finally:
+            if logging_level is not None:
+                self.set_logging_level(prev_logging_level)
+        if to_print:
+            print("No solutions found" if t is None else t.get_tree())
+        if to_record:
+            self.record_solve(t, context, target_node, source_nodes,
+                              min_index=min_index, search_depth=search_depth,
+                              memory_mode=memory_mode)
+        return t
 
-        pf = Pathfinder(
-            target=target_node,
-            sources=source_nodes,
-            nodes=self.nodes,
-            no_weights=self.no_weights,
-            memory_mode=self.memory_mode or memory_mode,
-        )
+    def record_solve(self, t: TNode, context: SolveContext,
+                     target_node: Node, source_nodes: list, **kwargs):
+        """Records the solved TNode as a frame of the Hypergraph and, if
+        a solution was found, as the last solve of the context, to be
+        solved again with `kwargs` by `Hypergraph.resolve`."""
+        memory_mode = kwargs.get('memory_mode', False)
+        if t is not None:
+            context.last_solve = dict(
+                target=target_node.label,
+                inputs={sn.label: context.get_value(sn) for sn in source_nodes
+                        if not sn.is_constant or sn.label in context.values},
+                t=t,
+                kwargs=kwargs,
+            )
+        self.frames.add(t, keep_tnode=self.memory_mode or memory_mode)
+
+    def iter_solve(self, target, inputs: dict=None, until_index: int=0,
+                   watch: list=None, debug_nodes: list=None,
+                   debug_edges: list=None, search_depth: int=100000,
+                   logging_level=None, context: SolveContext=None,
+                   timeout: float=None, cancel_token: CancelToken=None):
+        """Searches for the target as in `solve`, yielding each new index
+        of the target (and of the watched nodes) as it is found, until
+        the target is found with an index of `until_index`. Explored
+        TNodes are freed once disposed of (see `Pathfinder.iter_search`).
+
+        Parameters
+        ----------
+        target : Node | str
+            Node (or label of the node) to solve for.
+        inputs : dict, optional
+            A dictionary {label : value} of input values.
+        until_index : int, default=0
+            The index of the target at which to stop searching.
+        watch : list, optional
+            Other nodes (or labels of nodes) to yield the values of.
+        debug_nodes : list, optional
+            List of nodes to log additional information for.
+        debug_edges : list, optional
+            List of edges to log additional information for.
+        search_depth : int, default=100000
+            Number of nodes to explore before concluding no valid path.
+        logging_level : int, optional
+            The level of logging to use during the search.
+        context : SolveContext, optional
+            The state of the solve, defaulting to the context of the
+            Hypergraph.
+        timeout : float, optional
+            Number of seconds after which the search is stopped, raising
+            a `SearchCancelled` exception (see `Hypergraph.solve`).
+        cancel_token : CancelToken, optional
+            Token for cancelling the search from another thread.
+
+        Yields
+        ------
+        tuple
+            (node_label, index, value) for each new index of a node,
+            with the indices of each node increasing.
+        """
+        if logging_level is not None:
+            prev_logging_level = logger.getEffectiveLevel()
+            self.set_logging_level(logging_level)
         try:
-            t = pf.search(
-                min_index=min_index,
+            deadline = self.get_deadline(timeout)
+            context, target_node, source_nodes = self.start_solve(
+                target, inputs, True, context)
+            watch = [] if watch is None else watch
+            watch = [self.get_node(key) for key in watch]
+            if not self.check_reachable(target_node, source_nodes):
+                return
+            pf = Pathfinder(
+                target=target_node,
+                sources=source_nodes,
+                nodes=self.nodes,
+                no_weights=self.no_weights,
+                context=context,
+                relevant_edges=self.get_ancestor_edges(target_node, *watch),
+                deadline=deadline,
+                cancel_token=cancel_token,
+                executors=self.executors,
+            )
+            yield from pf.iter_search(
+                until_index=until_index,
+                watch=[node.label for node in watch],
                 debug_nodes=debug_nodes,
                 debug_edges=debug_edges,
                 search_depth=search_depth,
             )
-            if self.memory_mode or memory_mode:
-                self.solved_tnodes = pf.explored_nodes
+        finally:
+            if logging_level is not None:
+                self.set_logging_level(prev_logging_level)
+
+    def resolve(self, changed_inputs: dict, to_print: bool=False,
+                context: SolveContext=None) -> TNode:
+        """Solves the target of the last solve again with some inputs
+        changed, recomputing only the TNodes that depend on the changed
+        inputs.
+
+        The solved tree of the last solve records the edges each TNode
+        was found with. The edges downstream of the changed inputs are
+        evaluated again, while every other TNode is reused. A full solve
+        is run instead if the tree is not viable for the changed values
+        or if a changed input was not an input of the last solve.
+
+        Parameters
+        ----------
+        changed_inputs : dict
+            A dictionary {label : value} of the changed input values.
+        to_print : bool, default=False
+            Prints the search tree if set to true.
+        context : SolveContext, optional
+            The context of the last solve, defaulting to the context of
+            the Hypergraph.
+
+        Notes
+        -----
+        As with cached solve plans, the path of the last solve is
+        followed, so a path made cheaper (or a cycle made shorter) by
+        the changed values is not found.
+
+        Returns
+        -------
+        TNode | None
+            the TNode for the target
+        """
+        context = self.context if context is None else context
+        last_solve = context.last_solve
+        if last_solve is None:
+            raise ValueError('No previous solve to resolve.')
+        changed = {self.get_node(key).label: value
+                   for key, value in changed_inputs.items()}
+        inputs = last_solve['inputs'] | changed
+
+        t = None
+        plan = SolvePlan(last_solve['t'], self.edges)
+        if plan.is_valid and changed.keys() <= last_solve['inputs'].keys():
+            context.values.update(changed)
+            tnodes = plan.replay_changed(self.nodes,
+                                         plan.order_tnodes(last_solve['t']),
+                                         set(changed), context,
+                                         self.no_weights)
+            if tnodes is not None:
+                t = tnodes[-1]
+        if t is None:
+            logger.info('Solved tree not viable, solving instead')
+            return self.solve(last_solve['target'], inputs, to_print=to_print,
+                              context=context, **last_solve['kwargs'])
+
+        last_solve['inputs'], last_solve['t'] = inputs, t
+        if to_print:
+            print(t.get_tree())
+        self.frames.add(t, keep_tnode=self.memory_mode)
+        return t
+
+    def simulate(self, target, inputs: dict=None, min_index: int=0,
+                 probe_index: int=4, to_print: bool=False,
+                 search_depth: int=100000, logging_level=None,
+                 context: SolveContext=None, timeout: float=None,
+                 cancel_token: CancelToken=None) -> TNode:
+        """Solves for a high index of a target in a cycle (formed by edges
+        with an `index_offset`) by searching for a low index of the
+        target and stepping the cycle found by the search.
+
+        The search derives a `CycleSchedule` once, which is then stepped
+        until the target is viable with an index of at least
+        `min_index`, such as when the via of an exit edge is met. A full
+        solve is run instead if no cycle is found or the schedule stops
+        holding for a step.
+
+        Parameters
+        ----------
+        target : Node | str
+            Node (or label of the node) to solve for.
+        inputs : dict, optional
+            A dictionary {label : value} of input values.
+        min_index : int, default=0
+            The minimum index of the target to find.
+        probe_index : int, default=4
+            The index of the target first searched for to find the cycle,
+            at least 4. The index is doubled until a cycle is found or
+            `min_index` is reached.
+        to_print : bool, default=False
+            Prints the search tree if set to true.
+        search_depth : int, default=100000
+            Number of nodes to explore (or steps to take) before
+            concluding no valid path.
+        logging_level : int, optional
+            The level of logging to use during the search.
+        context : SolveContext, optional
+            The state of the solve, defaulting to the context of the
+            Hypergraph.
+        timeout : float, optional
+            Number of seconds after which the simulation is stopped,
+            raising a `SearchCancelled` exception, shared by every search
+            and step of the simulation (see `Hypergraph.solve`).
+        cancel_token : CancelToken, optional
+            Token for cancelling the simulation from another thread.
+
+        Notes
+        -----
+        As with cached solve plans, each step follows the path found by
+        the search, so an edge made cheaper by later values is not
+        switched to unless the path stops being viable.
+
+        Returns
+        -------
+        TNode | None
+            the TNode for the target
+        """
+        deadline = self.get_deadline(timeout)
+        kwargs = dict(search_depth=search_depth, logging_level=logging_level,
+                      context=context, cancel_token=cancel_token)
+        probe_index = max(probe_index, 4)
+        t = None
+        while probe_index < min_index and t is None:
+            t = self.solve(target, inputs, min_index=probe_index,
+                           timeout=self.get_timeout(deadline),
+                           to_record=False, **kwargs)
+            if t is None or t.index >= min_index:
+                break
+            schedule = CycleSchedule(t, self.edges)
+            if schedule.is_valid:
+                t = schedule.run(min_index, self.context if context is None
+                                 else context, self.no_weights,
+                                 max_steps=search_depth, deadline=deadline,
+                                 cancel_token=cancel_token)
+            else:
+                t = None
+            probe_index *= 2
+
+        if t is None or t.index < min_index:
+            if min_index > 4:
+                logger.info('Cycle schedule not viable, searching instead')
+            return self.solve(target, inputs, to_print=to_print,
+                              min_index=min_index,
+                              timeout=self.get_timeout(deadline), **kwargs)
+        if to_print:
+            print(t.get_tree())
+        source_nodes = self.process_source_nodes({} if inputs is None
+                                                 else inputs)
+        self.record_solve(t, self.context if context is None else context,
+                          self.get_node(target), source_nodes,
+                          min_index=min_index, search_depth=search_depth)
+        return t
+
+    async def asolve(self, target, inputs: dict=None, to_print: bool=False,
+                     min_index: int=0, debug_nodes: list=None,
+                     debug_edges: list=None, search_depth: int=100000,
+                     memory_mode: bool=False, logging_level=None,
+                     to_reset: bool=True, context: SolveContext=None,
+                     max_concurrency: int=None, astar: bool=False,
+                     strategy='index', timeout: float=None,
+                     cancel_token: CancelToken=None) -> TNode:
+        """Coroutine version of `solve`, awaiting relations and vias
+        that return awaitables (such as those defined with `async def`).
+
+        Other search roots are explored while relations are pending (see
+        `Pathfinder.asearch`). Solve plans are neither cached nor
+        replayed. Concurrent solves of the same Hypergraph must each pass
+        their own context.
+
+        Parameters
+        ----------
+        max_concurrency : int, optional
+            Maximum number of relations awaited at once, unbounded if
+            not set.
+
+        See `Hypergraph.solve` for the remaining parameters.
+
+        Returns
+        -------
+        TNode | None
+            the TNode for the first solution found
+        """
+        if logging_level is not None:
+            prev_logging_level = logger.getEffectiveLevel()
+            self.set_logging_level(logging_level)
+        if astar:
+            strategy = 'astar'
+        deadline = self.get_deadline(timeout)
+        context, target_node, source_nodes = self.start_solve(
+            target, inputs, to_reset, context)
+
+        try:
+            t = None
+            if self.check_reachable(target_node, source_nodes):
+                pf = Pathfinder(
+                    target=target_node,
+                    sources=source_nodes,
+                    nodes=self.nodes,
+                    no_weights=self.no_weights,
+                    memory_mode=self.memory_mode or memory_mode,
+                    context=context,
+                    relevant_edges=self.get_ancestor_edges(target_node),
+                    heuristic=self.get_heuristic(target_node, strategy),
+                    strategy=strategy,
+                    deadline=deadline,
+                    cancel_token=cancel_token,
+                    executors=self.executors,
+                )
+                t = await pf.asearch(
+                    min_index=min_index,
+                    debug_nodes=debug_nodes,
+                    debug_edges=debug_edges,
+                    search_depth=search_depth,
+                    max_concurrency=max_concurrency,
+                )
+                if self.memory_mode or memory_mode:
+                    context.solved_tnodes = pf.explored_nodes
+                    if context is self.context:
+                        self.solved_tnodes = pf.explored_nodes
         except Exception as e:
             logger.error(str(e))
             raise e
@@ -1722,9 +4734,254 @@ class Hypergraph:
                 self.set_logging_level(prev_logging_level)
         if to_print:
             print("No solutions found" if t is None else t.get_tree())
-        self.frames.append(t)
+        self.frames.add(t, keep_tnode=self.memory_mode or memory_mode)
         return t
 
+    def start_solve(self, target, inputs: dict=None, to_reset: bool=True,
+                    context: SolveContext=None) -> tuple:
+        """Prepares the context for a solve, returning the context, the
+        target node, and the source nodes."""
+        if context is None:
+            context = self.context
+            if to_reset:
+                self.reset()
+        elif to_reset:
+            context.reset()
+
+        inputs = {} if inputs is None else inputs
+        self.set_node_values(inputs, context)
+        source_nodes = self.process_source_nodes(inputs)
+
+        try:
+            target_node = self.get_node(target)
+        except KeyError:
+            msg = f'Target node {str(target)} not found in Hypergraph.'
+            raise KeyError(msg)
+        return context, target_node, source_nodes
+
+    def solve_batch(self, target, inputs: dict, min_index: int=0,
+                    search_depth: int=100000, logging_level=None,
+                    timeout: float=None, cancel_token: CancelToken=None):
+        """Solves for the target over columns of input values, returning
+        a column of target values.
+
+        The Hypergraph is searched once, using the first element of each
+        column, and the resulting `SolvePlan` is replayed over all the
+        columns together. Edges with array-safe relations are evaluated
+        over whole NumPy arrays, while other edges are evaluated for each
+        element. Elements for which the plan is not viable are solved
+        individually.
+
+        Parameters
+        ----------
+        target : Node | str
+            Node (or label of the node) to solve for.
+        inputs : dict
+            A dictionary {label : values} of input values, where the
+            values are either a 1D array-like of equal length or a single
+            value shared by every element.
+        min_index : int, default=0
+            The minimum index of the target to find.
+        search_depth : int, default=100000
+            Number of nodes to explore before concluding no valid path.
+        logging_level : int, optional
+            The level of logging to use during each search.
+        timeout : float, optional
+            Number of seconds after which the batch is stopped, raising
+            a `SearchCancelled` exception, shared by every search and
+            replay of the batch (see `Hypergraph.solve`).
+        cancel_token : CancelToken, optional
+            Token for cancelling the batch from another thread.
+
+        Notes
+        -----
+        As with cached solve plans, every element follows the path found
+        for the first element unless that path is not viable for it. The
+        results only match repeated calls to `solve` where the same path
+        would be found for every element.
+
+        Returns
+        -------
+        ndarray
+            The value of the target for each element of the inputs, which
+            is None where no solution was found.
+        """
+        columns, size = {}, None
+        for key, values in inputs.items():
+            label = self.get_node(key).label
+            if np.ndim(values) == 0:
+                columns[label] = values
+                continue
+            values = np.asarray(values)
+            if size is not None and len(values) != size:
+                raise ValueError('Input columns must be of equal length.')
+            size = len(values)
+            columns[label] = values
+        if size is None:
+            size = 1
+        array_labels = [label for label, values in columns.items()
+                        if isinstance(values, np.ndarray)]
+
+        def get_element(i: int) -> dict:
+            return {label: BatchColumn.get_element(values, i)
+                    if label in array_labels else values
+                    for label, values in columns.items()}
+
+        deadline = self.get_deadline(timeout)
+        kwargs = dict(min_index=min_index, search_depth=search_depth,
+                      logging_level=logging_level, cancel_token=cancel_token)
+        if size == 0:
+            return np.array([])
+        t = self.solve(target, get_element(0),
+                       timeout=self.get_timeout(deadline), **kwargs)
+        out, failed = None, np.ones(size, dtype=bool)
+        if t is not None:
+            plan = SolvePlan(t, self.edges)
+            if plan.is_valid:
+                out, failed = plan.replay_batch(self.nodes, columns, size,
+                                                self.no_weights, deadline,
+                                                cancel_token)
+        values = [None] * size if out is None else list(out)
+        for i in np.flatnonzero(failed):
+            t = self.solve(target, get_element(i),
+                           timeout=self.get_timeout(deadline), **kwargs)
+            values[i] = None if t is None else t.value
+        if out is None or failed.any():
+            return BatchColumn.from_values(values).array
+        return out
+
+    def sweep(self, target, inputs, workers: int=None, chunksize: int=None,
+              min_index: int=0, search_depth: int=100000) -> list:
+        """Solves for the target with each set of inputs, distributing
+        the solves over a pool of worker processes.
+
+        The Hypergraph is shipped to each worker once, when the worker
+        is started (see `Hypergraph.get_sweep_context`), after which
+        chunks of inputs are streamed to the workers. Inputs are read
+        lazily, one chunk at a time, with at most two chunks per worker
+        submitted but not yet collected, so that `inputs` may be a long
+        generator.
+
+        Parameters
+        ----------
+        target : Node | str
+            Node (or label of the node) to solve for.
+        inputs : Iterable[dict]
+            Sets of input values, each a dictionary {label : value}.
+        workers : int, optional
+            The number of worker processes, defaulting to the number of
+            CPUs. If 1, each set of inputs is solved in this process.
+        chunksize : int, optional
+            The number of sets of inputs sent to a worker at a time,
+            defaulting to a quarter of an even split between workers, or
+            16 if `inputs` has no length.
+        min_index : int, default=0
+            The minimum index of the target to find.
+        search_depth : int, default=100000
+            Number of nodes to explore before concluding no valid path.
+
+        Returns
+        -------
+        list
+            The value of the target for each set of inputs, in order,
+            which is None where no solution was found.
+        """
+        target = target.label if isinstance(target, Node) else target
+        elements = ({key.label if isinstance(key, Node) else key: val
+                     for key, val in element.items()} for element in inputs)
+        solve_kwargs = dict(min_index=min_index, search_depth=search_depth)
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        if workers <= 1 or (hasattr(inputs, '__len__') and len(inputs) <= 1):
+            values = []
+            for element in elements:
+                t = self.solve(target, element, **solve_kwargs)
+                values.append(None if t is None else t.value)
+            return values
+
+        if chunksize is None:
+            chunksize = 16
+            if hasattr(inputs, '__len__'):
+                chunksize = max(1, len(inputs) // (4 * workers))
+        chunks = iter(lambda: list(itertools.islice(elements, chunksize)), [])
+        mp_context, hg = self.get_sweep_context()
+        values, pending = [], deque()
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=mp_context,
+                                 initializer=_init_sweep_worker,
+                                 initargs=(hg, solve_kwargs)) as executor:
+            for chunk in chunks:
+                if len(pending) >= 2 * workers:
+                    values.extend(pending.popleft().result())
+                pending.append(executor.submit(_solve_sweep_chunk,
+                                               (target, chunk)))
+            while len(pending) > 0:
+                values.extend(pending.popleft().result())
+        return values
+
+    def get_sweep_context(self) -> tuple:
+        """Returns the multiprocessing context for starting the workers
+        of a sweep, and the Hypergraph to pass to each worker.
+
+        Workers are started by a fork server (or spawned, where fork
+        servers are not available), since forking a process while other
+        threads are running can leave a lock held by one of the threads
+        locked forever in the worker. The Hypergraph is pickled once,
+        without the state of previous solves (see
+        `Hypergraph.__getstate__`), and the bytes are passed to each
+        worker.
+
+        If the Hypergraph cannot be pickled (such as if a relation is a
+        lambda function), workers are forked instead, after shutting
+        down the pools of workers of the Hypergraph (see
+        `Hypergraph.close_executors`) so that none of its threads are
+        running. Sweeping such a Hypergraph while it is solved from
+        other threads is not supported.
+        """
+        methods = multiprocessing.get_all_start_methods()
+        try:
+            payload = pickle.dumps(self)
+        except Exception:
+            if 'fork' not in methods:
+                raise
+            self.close_executors()
+            return multiprocessing.get_context('fork'), self
+        if 'forkserver' in methods:
+            return multiprocessing.get_context('forkserver'), payload
+        return multiprocessing.get_context('spawn'), payload
+
+    def cache_plan(self, plan_key: tuple, t: TNode):
+        """Extracts a solve plan from the solved TNode and caches it
+        under `plan_key`."""
+        plan = SolvePlan(t, self.edges)
+        if plan.is_valid and not self.may_switch_edges(plan):
+            self.solve_plans[plan_key] = plan
+
+    def may_switch_edges(self, plan: SolvePlan) -> bool:
+        """Returns True if new values could switch a search for the
+        target of the plan to an edge not in the plan.
+
+        This is the case if a node found along an edge of the plan has
+        several generating edges the target depends on, and any edge
+        the node depends on has a `via` condition. Such a via may
+        reject a cheaper edge for the values the plan was found with,
+        and pass for later values, which replaying the plan would not
+        check. Relations returning None are not considered.
+        """
+        relevant_edges = self.get_ancestor_edges(plan.steps[-1][0])
+        labels = {node_label for node_label, edge, _ in plan.steps
+                  if edge is not None}
+        for label in labels:
+            generating_edges = [e for e in self.nodes[label].generating_edges
+                                if e.label in relevant_edges]
+            if len(generating_edges) < 2:
+                continue
+            for edge_label in self.get_ancestor_edges(label):
+                edge = self.edges[edge_label]
+                if edge.via is not edge.via_true:
+                    return True
+        return False
+
     def process_source_nodes(self, inputs):
         """Processes source nodes for the simulation."""
         source_nodes = []
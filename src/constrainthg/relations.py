@@ -66,6 +66,15 @@ def get_keyword_arguments(args: list, kwargs: dict, excluded_keys: list):
 
     return args, exceptional_vals
 
+def array_safe(method):
+    """Marks a relation as array-safe, meaning that calling it with
+    NumPy arrays is equivalent to calling it with each element in turn.
+
+    Array-safe relations are evaluated over whole columns by
+    ``Hypergraph.solve_batch``."""
+    method.array_safe = True
+    return method
+
 # ALGEBRAIC RELATIONS
 def Rnull(*args, **kwargs):
     """Returns zero."""
@@ -94,7 +103,7 @@ def Rdivide(*args, **kwargs):
     args, kwargs = get_keyword_arguments(args, kwargs, 's1')
     s1 = kwargs['s1']
     for s in args:
-        s1 /= s
+        s1 = s1 / s
     return s1
 
 def Rceiling(*args, **kwargs):
@@ -145,6 +154,23 @@ def Rsame(*args, **kwargs):
         return True
     return len(args) == 1
 
+# Recognized as an `index_via` where every index must be equal
+Rsame.index_offsets = {}
+
+def offset_by(identifier: str, base: str, offset: int=1):
+    """Returns a method that returns True if the argument keyed by
+    `identifier` is equal to the argument keyed by `base` plus
+    `offset`.
+
+    When passed as an `index_via`, the edge recognizes the relation and
+    only combines source nodes with compatible indices."""
+    def Roffsetby(*args, **kwargs):
+        args, kwargs = get_keyword_arguments(args, kwargs,
+                                             [identifier, base])
+        return kwargs[identifier] == kwargs[base] + offset
+    Roffsetby.index_offsets = {identifier: offset, base: 0}
+    return Roffsetby
+
 def mult_and_sum(mult_identifiers: list, sum_identifiers: list):
     """Convenient shorthand for multiplying the values identified in
     `mult_identifiers` and adding them to the values identified in
@@ -163,7 +189,7 @@ def mult_and_sum(mult_identifiers: list, sum_identifiers: list):
         for label in sum_identifiers:
             out += kwargs[label]
         return out
-    return Rmultandsum
+    return array_safe(Rmultandsum)
 
 # BOOLEAN MATH
 def Rall(*args, **kwargs):
@@ -211,7 +237,7 @@ def equal(identifier: str):
     def Requal(*args, **kwargs):
         args, kwargs = get_keyword_arguments(args, kwargs, identifier)
         return kwargs[identifier]
-    return Requal
+    return array_safe(Requal)
 
 def geq(identifier: str, val: int):
     """Returns a method that returns True if the identifier is greater
@@ -221,6 +247,14 @@ def geq(identifier: str, val: int):
         return kwargs[identifier] >= val
     return Rcyclecounter
 
+# Relations that can be evaluated over whole NumPy arrays. Division is
+# excluded, as NumPy returns inf (or 0) where dividing each element by
+# zero raises a ZeroDivisionError.
+for rel in (Rnull, Rsum, Rmultiply, Rsubtract, Rceiling, Rfloor, Rnegate,
+            Rfirst):
+    array_safe(rel)
+del rel
+
 # TRIGONOMETRY
 def Rsin(*args, **kwargs):
     """Returns the sine of the mean of all arguments."""
@@ -1,9 +1,13 @@
-from constrainthg.hypergraph import Hypergraph
+from constrainthg.hypergraph import (Hypergraph, TNode, Frontier, TNodeStore,
+                                    EdgeSet, RelationCache, Pathfinder,
+                                    SolveContext, DepthFirstFrontier,
+                                    BreadthFirstFrontier)
 from constrainthg import relations as R
 
 import pytest
 import numpy as np
 import math
+import sys
 
 class TestHypergraphBehavior():
     def test_simple_add(self):
@@ -204,3 +208,206 @@ class TestHypergraphBehavior():
         hg.add_edge('S', 'T', R.Rincrement, weight=1000.0)
         t = hg.solve('T', {'S': 10})
         assert t.value == 11, "Incorrectly chose infinite path."
+
+    def test_explore_edges_invalidation(self):
+        """Tests that the cached edges explored from a node are updated
+        after adding edges and changing weights."""
+        hg = Hypergraph()
+        e1 = hg.add_edge('S', 'T', R.Rnegate, weight=float('inf'))
+        assert hg.solve('T', {'S': 10}) is None
+        e2 = hg.add_edge('S', 'T', R.Rincrement, weight=5.0)
+        assert hg.solve('T', {'S': 10}).value == 11
+        e1.weight = 1.0
+        assert hg.get_node('S').get_explore_edges() == (e1, e2)
+        assert hg.solve('T', {'S': 10}).value == -10
+
+    def test_version_per_hypergraph(self):
+        """Tests that changing the edges of one Hypergraph leaves the
+        version of another Hypergraph unchanged."""
+        hg1, hg2 = Hypergraph(), Hypergraph()
+        e1 = hg1.add_edge('A', 'B', R.Rincrement)
+        hg2.add_edge('C', 'D', R.Rincrement)
+        version1, version2 = hg1.get_version(), hg2.get_version()
+        e1.weight = 2.0
+        assert hg1.get_version() != version1
+        assert hg2.get_version() == version2
+
+class TestFrontier():
+    def test_frontier_order(self):
+        """Tests that the frontier pops by index, then cost, then
+        insertion order."""
+        tnodes = [TNode('a', 'A', cost=2.), TNode('b', 'B', cost=1.),
+                  TNode('c', 'C', cost=1.), TNode('d', 'D', cost=0.)]
+        tnodes[3].index = 2
+        frontier = Frontier(tnodes)
+        popped = [frontier.pop().label for _ in range(len(tnodes))]
+        assert popped == ['b', 'c', 'a', 'd']
+        assert frontier.pop() is None
+
+    def test_frontier_iteration(self):
+        """Tests that iterating the frontier does not remove roots."""
+        tnodes = [TNode('a', 'A', cost=2.), TNode('b', 'B', cost=1.)]
+        frontier = Frontier(tnodes)
+        assert [t.label for t in frontier] == ['a', 'b']
+        assert len(frontier) == 2
+
+    def test_strategy_frontiers(self):
+        """Tests that the depth-first and breadth-first frontiers pop in
+        insertion order, ignoring index and cost, and that each strategy
+        solves for the target."""
+        tnodes = [TNode('a', 'A', cost=2.), TNode('b', 'B', cost=1.),
+                  TNode('c', 'C', cost=0.)]
+        depth = DepthFirstFrontier(tnodes)
+        breadth = BreadthFirstFrontier(tnodes)
+        assert [depth.pop().label for _ in tnodes] == ['c', 'b', 'a']
+        assert [breadth.pop().label for _ in tnodes] == ['a', 'b', 'c']
+        assert depth.pop() is None and breadth.pop() is None
+
+        hg = Hypergraph()
+        hg.add_edge(['A', 'B'], 'C', R.Rsum)
+        hg.add_edge('C', 'D', R.Rincrement)
+        strategies = ['index', 'astar', 'depth', 'breadth', DepthFirstFrontier]
+        for strategy in strategies:
+            t = hg.solve('D', {'A': 1, 'B': 2}, strategy=strategy)
+            assert t.value == 4
+        with pytest.raises(ValueError):
+            hg.solve('D', {'A': 1, 'B': 2}, strategy='random')
+
+class TestTNodeCost():
+    def test_shared_edge_cost(self):
+        """Tests that a generating edge shared by two branches of a tree
+        is only counted once."""
+        a = TNode('a', 'A', cost=0.)
+        b = TNode('b', 'B', children=[a], gen_edge_label='e1',
+                  gen_edge_cost=2., uid=0)
+        c = TNode('c', 'C', children=[b], gen_edge_label='e2',
+                  gen_edge_cost=3., uid=1)
+        d = TNode('d', 'D', children=[b, c], gen_edge_label='e3',
+                  gen_edge_cost=1., uid=2)
+        assert d.cost == 6.
+        assert d.get_tree_cost(checked_edges=set()) == 6.
+
+    def test_deep_tree_cost(self):
+        """Tests that the cost of a tree deeper than the recursion limit
+        can be calculated, with and without an edge summary."""
+        depth = sys.getrecursionlimit() + 100
+        t, t_untracked = TNode('s', 'S', cost=0.), TNode('s', 'S', cost=0.)
+        for i in range(depth):
+            t = TNode(f'n#{i}', 'N', children=[t], gen_edge_label=f'e#{i}',
+                      gen_edge_cost=1., uid=i)
+            t_untracked = TNode(f'n#{i}', 'N', children=[t_untracked],
+                                gen_edge_label=f'e#{i}', gen_edge_cost=1.)
+        assert t.cost == depth
+        assert t_untracked.cost == depth
+
+    def test_edge_set_cost(self):
+        """Tests that the costs of trees sharing TNodes with distant
+        uids are found from the edge sets of the children."""
+        s = TNode('s', 'S', cost=0.)
+        a = TNode('a', 'A', children=[s], gen_edge_label='e1',
+                  gen_edge_cost=2., uid=3)
+        b = TNode('b', 'B', children=[a], gen_edge_label='e2',
+                  gen_edge_cost=0.5, uid=700)
+        c = TNode('c', 'C', children=[a], gen_edge_label='e2',
+                  gen_edge_cost=0.5, uid=90000)
+        d = TNode('d', 'D', children=[c, b, s], gen_edge_label='e3',
+                  gen_edge_cost=1., uid=90001)
+        e = TNode('e', 'E', children=[d, b], gen_edge_label='e3',
+                  gen_edge_cost=1., uid=90002)
+        assert [t.cost for t in (b, c, d)] == [2.5, 2.5, 4.]
+        assert e.cost == e.get_tree_cost(checked_edges=set()) == 5.
+        assert e.edge_set is not None
+        assert EdgeSet.union(e.edge_set, b.edge_set) is e.edge_set
+
+    def test_value_histories(self):
+        """Tests that value histories are built from the children
+        without modifying the histories of the children."""
+        hg = Hypergraph()
+        hg.add_edge('S', 'A', R.Rmean)
+        hg.add_edge('A', 'A', R.Rincrement, index_offset=1)
+        t = hg.solve('A', {'S': 0}, min_index=4)
+        assert t.calc_values is None, "Values materialized during search"
+        assert t.values == {'A': [0, 1, 2, 3], 'S': [0]}
+        child = t.children[0]
+        assert child.values == {'A': [0, 1, 2], 'S': [0]}
+        assert t.values['A'] == [0, 1, 2, 3]
+
+    def test_compact_tnode(self):
+        """Tests that TNodes are slotted and only store printing
+        metadata when given."""
+        t = TNode('a', 'A', 1.0)
+        assert not hasattr(t, '__dict__')
+        assert t.display is None
+        assert t.join_status == 'None' and t.max_display_length == 12
+        t = TNode('a', 'A', 1.123456, join_status='join', max_display_length=4)
+        assert t.display == {'join_status': 'join', 'max_display_length': 4}
+        assert str(t).startswith('A=1.')
+
+class TestTNodeStore():
+    def test_store_duplicates_and_disposal(self):
+        """Tests duplicate detection and disposal by index."""
+        a1, a2 = TNode('A#1', 'A'), TNode('A#2', 'A')
+        a2.index = 2
+        store = TNodeStore([a1, a2])
+        assert not store.add(TNode('A#1', 'A')), "Duplicate label added"
+        assert [t.label for t in store] == ['A#1', 'A#2']
+        assert store.with_index(2) == [a2]
+        assert store.remove_index(1) == 1
+        assert 'A#1' not in store
+        assert len(store) == 1
+
+class TestRelationCache():
+    def test_cache_eviction_and_keys(self):
+        """Tests LRU eviction and keying of unhashable values."""
+        cache = RelationCache(maxsize=2, max_array_bytes=64)
+        k1 = cache.make_key(R.Rfirst, {'s1': 1})
+        k2 = cache.make_key(R.Rfirst, {'s1': [1, 2]})
+        k3 = cache.make_key(R.Rfirst, {'s1': np.arange(4)})
+        assert cache.make_key(R.Rfirst, {'s1': 1.0}) != k1
+        assert cache.make_key(R.Rfirst, {'s1': np.arange(4)}) == k3
+        assert cache.make_key(R.Rfirst, {'s1': np.arange(100)}) is None
+        cache.put(k1, 'a')
+        cache.put(k2, 'b')
+        assert cache.get(k1) == 'a'
+        cache.put(k3, 'c')
+        assert cache.get(k2) is None, "Least recently used value kept"
+        assert cache.get(k1) == 'a' and cache.get(k3) == 'c'
+        assert (cache.hits, cache.misses) == (3, 1)
+
+    def test_float_keys(self):
+        """Tests that signed zeros are keyed apart and NaN is keyed
+        equal to itself."""
+        cache = RelationCache()
+        key = lambda val: cache.make_key(R.Rfirst, {'s1': val})
+        assert key(0.0) != key(-0.0)
+        assert key(float('nan')) == key(float('nan'))
+        assert key([1.5, -0.0]) == key([1.5, -0.0])
+        cache.put(key(-0.0), -1)
+        assert cache.get(key(0.0)) is None
+        cache.put(key(math.nan), 'nan')
+        assert cache.get(key(float('nan'))) == 'nan'
+
+    def test_cached_relation(self):
+        """Tests that a pure relation is only called once for repeated
+        source values."""
+        calls = []
+
+        def square(s1):
+            calls.append(s1)
+            return s1 ** 2
+
+        hg = Hypergraph(cache_relations=True)
+        hg.add_edge('A', 'B', square)
+        hg.add_edge('A', 'C', R.Rfirst)
+        hg.add_edge('C', 'D', square)
+        hg.add_edge(['B', 'D'], 'T', R.Rsum)
+        assert hg.solve('T', {'A': 3}).value == 18
+        assert hg.solve('T', {'A': 3}).value == 18
+        assert calls == [3]
+        context = SolveContext()
+        context.values['A'] = 3
+        pf = Pathfinder(hg.get_node('T'), [hg.get_node('A')], hg.nodes,
+                        context=context)
+        pf.search()
+        hits, misses = pf.get_cache_stats()[list(hg.edges)[0]]
+        assert hits > 0 and misses >= 1
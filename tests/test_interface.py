@@ -1,9 +1,78 @@
-from constrainthg.hypergraph import Hypergraph, Node, Edge
+from constrainthg.hypergraph import (Hypergraph, Node, Edge, TNode,
+                                    SolveContext, CancelToken, SearchCancelled,
+                                    UnreachableTarget, SolvePlan)
 from constrainthg import relations as R
 
 import logging
+import gc
 import pytest
 import json
+import pickle
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+@pytest.fixture
+def make_fan_hg():
+    """Returns a function building a Hypergraph where 'T' is the sum of
+    'B', 'C', 'D', and 'E', each found from 'A' with `rel`."""
+    def make_hg(rel, executor=None) -> Hypergraph:
+        hg = Hypergraph()
+        for label in 'BCDE':
+            hg.add_edge('A', label, rel, executor=executor)
+        hg.add_edge(['B', 'C', 'D', 'E'], 'T', R.Rsum)
+        return hg
+    return make_hg
+
+
+@pytest.fixture
+def make_cycle_hg():
+    """Returns a function building a Hypergraph cycling 'B' (from 'A')
+    with `rel` of 'B' and 'C', where 'T' is 'B' once at least `stop`."""
+    def make_hg(rel=R.Rsum, executor=None, stop: float=10) -> Hypergraph:
+        hg = Hypergraph()
+        hg.add_edge('A', 'B', R.Rfirst)
+        hg.add_edge({'s1': 'B', 's2': 'C'}, 'B', rel, index_offset=1,
+                    disposable=['s1'], executor=executor)
+        hg.add_edge('B', 'T', R.Rfirst, via=R.geq('s1', stop))
+        return hg
+    return make_hg
+
+
+@pytest.fixture
+def slow_hg():
+    """Yields a Hypergraph where 'T' is found from 'B' (the increment of
+    'A') by a relation in a thread pool that blocks until the test
+    ends."""
+    release = threading.Event()
+    def slow(s1):
+        release.wait(5)
+        return s1
+
+    hg = Hypergraph()
+    hg.add_edge('A', 'B', R.Rincrement)
+    hg.add_edge('B', 'T', slow, executor='thread', label='B->T')
+    yield hg
+    release.set()
+    hg.close_executors()
+
+
+@pytest.fixture
+def weighted_chain():
+    """Returns a Hypergraph where 'T' is found from 'S' either directly
+    (weight 5) or along a chain of 11 edges (weight 1 each)."""
+    hg = Hypergraph()
+    hg.add_edge('S', 'T', R.Rnegate, weight=5.0)
+    prev = 'S'
+    for i in range(10):
+        hg.add_edge(prev, f'A{i}', R.Rincrement, weight=1.0)
+        prev = f'A{i}'
+    hg.add_edge(prev, 'T', R.Rincrement, weight=1.0)
+    return hg
+
 
 class TestHypergraphInterface:
     def test_pseudonodes(self):
@@ -77,6 +146,42 @@ class TestHypergraphInterface:
         t = hg.solve('T', {'S': 0})
         assert t.value == (3, 3, 3), "Index for each node should be the same."
 
+    def test_offset_index_via(self):
+        """Tests that a recognized `index_via` only combines source nodes
+        with compatible indices."""
+        hg = Hypergraph()
+        hg.add_edge('S', 'A', R.Rfirst)
+        hg.add_edge('A', 'A', R.Rincrement, index_offset=1)
+        hg.add_edge('S', 'B', R.Rfirst)
+        hg.add_edge('B', 'B', R.Rincrement, index_offset=1)
+        edge = hg.add_edge({'a': 'A', 'b': 'B'}, 'T', lambda a, b: (a, b),
+                           index_via=R.offset_by('a', 'b', 2))
+        assert edge.join_offsets == {'A': 2, 'B': 0}
+        t = hg.solve('T', {'S': 0})
+        assert t.value == (2, 0), "Incorrect indices combined."
+        a = TNode('A#x', 'A', 9)
+        a.index = 3
+        found_tnodes = hg.context.get_found_tnodes(edge)
+        combos = list(edge.get_source_tnode_combinations(a, False,
+                                                         found_tnodes))
+        assert len(combos) > 0
+        for combo in combos:
+            assert combo[0].index - 2 == combo[1].index
+
+    def test_level_join(self):
+        """Tests that a LEVEL edge only combines source nodes with the
+        same index."""
+        hg = Hypergraph()
+        hg.add_edge('S', 'A', R.Rfirst)
+        hg.add_edge('A', 'A', R.Rincrement, index_offset=1)
+        hg.add_edge('S', 'B', R.Rfirst)
+        hg.add_edge('B', 'B', R.Rincrement, index_offset=1)
+        edge = hg.add_edge({'s1': 'A', 's2': 'B'}, 'T', R.Rsum,
+                           edge_props='LEVEL', via=R.geq('s1', 3))
+        assert edge.join_offsets == {'A': 0, 'B': 0}
+        t = hg.solve('T', {'S': 0})
+        assert t.value == 6
+
     def test_min_index(self):
         """Tests whether the minumum index of a target node can be searched for."""
         hg = Hypergraph()
@@ -137,6 +242,20 @@ class TestHypergraphInterface:
         t = hg2.solve('E', inputs)
         assert t.value == 109
 
+    def test_copy_settings(self):
+        """Tests that a shallow copy keeps the caching and frame
+        settings of the Hypergraph."""
+        hg1 = Hypergraph(cache_plans=True, cache_relations=8, max_frames=2)
+        hg1.add_edge(['A', 'B'], 'C', R.Rsum)
+        hg2 = hg1.__copy__()
+        assert hg2.cache_plans
+        assert hg2.relation_cache is hg1.relation_cache
+        assert hg2.frames.max_frames == 2
+        for value in range(3):
+            hg2.solve('C', {'A': value, 'B': 1})
+        assert len(hg2.frames) == 2
+        assert len(hg2.solve_plans) == 1
+
     def test_add(self):
         """Tests add (+) dunder overwrite."""
         hg1 = Hypergraph()
@@ -163,6 +282,25 @@ class TestHypergraphInterface:
         assert t.value != 4, 'Input resolved for'
         assert t.value == 14
 
+    def test_debug_logging_guarded(self, caplog):
+        """Tests that search diagnostics are only built when the debug
+        level is enabled."""
+        class Loud:
+            printed = 0
+            def __str__(self):
+                Loud.printed += 1
+                return 'loud'
+
+        hg = Hypergraph()
+        hg.add_edge('A', 'B', R.Rfirst)
+        with caplog.at_level(logging.WARNING, logger='constrainthg'):
+            hg.solve('B', {'A': Loud()}, debug_nodes=['A'], debug_edges=['B'])
+        assert Loud.printed == 0, "Diagnostics built at WARNING level"
+        with caplog.at_level(logging.DEBUG, logger='constrainthg'):
+            hg.solve('B', {'A': Loud()})
+        assert Loud.printed > 0
+        assert 'Exploring <A#0>' in caplog.text
+
     def test_print_nodes(self):
         """Tests proper formatting of Hypergraph.print_nodes()"""
         hg = Hypergraph()
@@ -359,6 +497,22 @@ class TestHypergraphRelationProcessing:
         assert json_d['frames']['frame0']['C'][0] == 3
         assert json_d['frames']['frame1']['B'][0] == 102
         assert json_d['frames']['frame1']['C'][0] == 203
+
+    def test_frame_store(self):
+        """Tests that frames are stored as typed columns and that the
+        number of retained frames is bounded."""
+        hg = Hypergraph(max_frames=2)
+        hg.add_edge(['A', 'B'], 'C', R.Rsum, label='EDGE1')
+        hg.add_edge('C', 'D', lambda *args: str(args[0]), label='EDGE2')
+        for i in range(3):
+            hg.solve('D', {'A': i, 'B': 0.5})
+        assert len(hg.frames) == 2
+        assert hg.frames.get_column('A').dtype == int
+        assert hg.frames.get_column('C').dtype == float
+        assert hg.frames.get_column('D').dtype == object
+        assert hg.get_frames()[0]['A'] == [1]
+        assert hg.get_frames()[-1]['D'] == ['2.5']
+        assert all(tn is None for tn in hg.frames.tnodes)
         
     def test_json_to_node(self):
         """Tests whether a node can be read from a JSON file."""
@@ -399,4 +553,488 @@ class TestHypergraphRelationProcessing:
 
 
 
-        
\ No newline at end of file
+        
+    def test_binders_precompiled(self):
+        """Tests whether argument binders are compiled with the edge and
+        recompiled after adding a source node."""
+        hg = Hypergraph()
+        edge = hg.add_edge({'top': 'A', 'bottom': 'B'}, 'C', self.divide)
+        assert (edge.rel, ('top', 'bottom')) in edge.binders
+        edge.add_source_node({'extra': hg.add_node('D')})
+        assert (edge.rel, ('top', 'bottom', 'extra')) in edge.binders
+        C = hg.solve('C', {'A': 16, 'B': 8, 'D': 1})
+        assert C.value == 2
+
+    def test_solve_plan_replay(self):
+        """Tests whether a cached solve plan is replayed for new inputs
+        and whether the search is repeated when a via fails on replay."""
+        hg = Hypergraph(cache_plans=True)
+        hg.add_edge('A', 'B', R.Rmean, via=lambda *args, **kw: kw['s1'] > 0)
+        hg.add_edge(['A', 'B'], 'C', R.Rsum)
+        assert hg.solve('C', {'A': 2}).value == 4
+        assert len(hg.solve_plans) == 1
+        assert hg.solve('C', {'A': 3}).value == 6
+        assert hg.solve('C', {'A': -3}) is None
+        hg.add_edge('C', 'D', R.Rmean)
+        assert hg.solve('C', {'A': 4}).value == 8
+        hg.solve('C', {'A': 4}, strategy='depth')
+        assert len(hg.solve_plans) == 3, "Plan reused for another strategy"
+
+    def test_solve_plan_switching(self):
+        """Tests that no solve plan is cached when new values could
+        switch the search to a cheaper edge."""
+        hg = Hypergraph(cache_plans=True)
+        hg.add_edge({'a': 'A'}, 'B', lambda a: a + 1, via=lambda a: a > 0,
+                    weight=1.)
+        hg.add_edge({'a': 'A'}, 'B', lambda a: a - 100, weight=5.)
+        hg.add_edge({'b': 'B'}, 'C', lambda b: b * 2)
+        values = [hg.solve('C', {'A': a}).value for a in [1, -1, 2]]
+        assert values == [4, -202, 6]
+        assert len(hg.solve_plans) == 0
+
+    def test_solve_batch(self):
+        """Tests whether a batch solve over input arrays matches solving
+        for each element, including elements where a via fails."""
+        hg = Hypergraph()
+        hg.add_edge('A', 'B', R.Rmean, via=lambda s1: s1 > 0, weight=1.)
+        hg.add_edge('A', 'B', R.Rnegate, weight=5.)
+        hg.add_edge(['A', 'B', 'K'], 'C', R.Rsum)
+        a = np.array([2, -3, 1, -1, 4])
+        C = hg.solve_batch('C', {'A': a, 'K': 10})
+        expected = [hg.solve('C', {'A': val, 'K': 10}).value for val in a]
+        assert isinstance(C, np.ndarray)
+        assert list(C) == expected
+
+    def test_solve_batch_scalars(self):
+        """Tests whether a batch solve follows Python arithmetic for
+        each element, rather than overflowing or dividing by zero."""
+        hg = Hypergraph()
+        hg.add_edge(['A', 'K'], 'B', R.Rmultiply)
+        hg.add_edge('A', 'C', R.Rinvert)
+        B = hg.solve_batch('B', {'A': np.array([2**62, 1]), 'K': 4})
+        assert list(B) == [2**64, 4]
+        assert list(hg.solve_batch('C', {'A': [2., 4.]})) == [0.5, 0.25]
+        with pytest.raises(ZeroDivisionError):
+            hg.solve_batch('C', {'A': np.array([1., 0.])})
+
+    def test_evaluate_batch_failure(self):
+        """Tests whether every element of a batch is marked as failed
+        when an edge without column inputs is not viable."""
+        hg = Hypergraph()
+        edge = hg.add_edge('K', 'C', R.Rfirst, via=lambda s1: s1 > 0)
+        failed = np.zeros(3, dtype=bool)
+        k = TNode('K#0', 'K', -1, cost=0.)
+        assert SolvePlan.evaluate_batch(edge, (k,), failed) is None
+        assert failed.all()
+
+    def test_sweep(self):
+        """Tests whether a sweep over worker processes returns the solved
+        values in order."""
+        hg = Hypergraph()
+        hg.add_edge(['A', 'B'], 'C', R.Rsum)
+        hg.add_edge('C', 'D', lambda s1: s1 * 2)
+        inputs = [{'A': a, 'B': 1} for a in range(10)]
+        D = hg.sweep('D', inputs, workers=2)
+        assert D == [(a + 1) * 2 for a in range(10)]
+        assert hg.sweep('D', inputs[:3], workers=1) == D[:3]
+
+    def test_pickle_without_solves(self):
+        """Tests that pickling a Hypergraph leaves out the state of its
+        previous solves."""
+        hg = Hypergraph(cache_plans=True, max_frames=50)
+        hg.add_edge(['A', 'B'], 'C', R.Rsum)
+        size = len(pickle.dumps(hg))
+        for a in range(100):
+            hg.solve('C', {'A': a, 'B': 1})
+        assert len(pickle.dumps(hg)) <= size + 100
+        hg2 = pickle.loads(pickle.dumps(hg))
+        assert len(hg2.frames) == 0 and hg2.frames.max_frames == 50
+        assert hg2.solve('C', {'A': 2, 'B': 1}).value == 3
+
+    def test_sweep_generator(self):
+        """Tests whether a sweep of a picklable hypergraph reads its
+        inputs lazily from a generator, in order."""
+        hg = Hypergraph()
+        hg.add_edge(['A', 'B'], 'C', R.Rsum)
+        read = []
+        def make_inputs():
+            for a in range(20):
+                read.append(a)
+                yield {'A': a, 'B': 1}
+        assert hg.get_sweep_context()[0].get_start_method() != 'fork'
+        C = hg.sweep('C', make_inputs(), workers=2, chunksize=3)
+        assert C == [a + 1 for a in range(20)]
+        assert read == list(range(20))
+
+    def test_concurrent_contexts(self):
+        """Tests whether concurrent solves of one hypergraph, each with
+        its own context, are independent of each other."""
+        hg = Hypergraph()
+        hg.add_edge('A', 'B', R.Rfirst)
+        hg.add_edge('B', 'B', R.Rincrement, index_offset=1)
+        hg.add_edge({'b': 'B', 'c': 'C'}, 'D', R.Rsum)
+        serial = [hg.solve('D', {'A': a, 'C': a}, min_index=20).value
+                  for a in range(40)]
+        hg.reset()
+
+        def solve(a: int):
+            context = SolveContext()
+            return hg.solve('D', {'A': a, 'C': a}, min_index=20,
+                            context=context).value
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            values = list(executor.map(solve, range(40)))
+        assert values == serial
+        assert values[1] - values[0] == 2
+        assert len(hg.context.found_tnodes) == 0
+
+    def test_asolve(self, make_fan_hg):
+        """Tests whether coroutine relations are awaited, with the number
+        of pending relations bounded by the concurrency limit."""
+        pending, max_pending = [0], [0]
+
+        async def slow_double(s1):
+            pending[0] += 1
+            max_pending[0] = max(max_pending[0], pending[0])
+            await asyncio.sleep(0.01)
+            pending[0] -= 1
+            return 2 * s1
+
+        hg = make_fan_hg(slow_double)
+        t = asyncio.run(hg.asolve('T', {'A': 1}, max_concurrency=2))
+        assert t.value == 8
+        assert max_pending[0] == 2
+
+    def test_asolve_cycle(self, make_cycle_hg):
+        """Tests whether an asynchronous solve of a cycle with disposable
+        sources matches the synchronous solve."""
+        async def asum(s1, s2):
+            await asyncio.sleep(0)
+            return s1 + s2
+
+        inputs = {'A': 0, 'C': 3}
+        t_sync = make_cycle_hg().solve('T', inputs)
+        t_async = asyncio.run(make_cycle_hg(asum).asolve('T', inputs))
+        assert t_async.value == t_sync.value == 12
+        assert t_async.index == t_sync.index
+
+    def test_thread_executor(self, make_fan_hg):
+        """Tests whether relations offloaded to a thread pool are run
+        concurrently."""
+        barrier = threading.Barrier(4, timeout=5)
+
+        def wait_double(s1):
+            barrier.wait()
+            return 2 * s1
+
+        hg = make_fan_hg(wait_double, executor='thread')
+        assert hg.solve('T', {'A': 1}).value == 8
+
+    def test_timeout(self, slow_hg):
+        """Tests that a search is stopped after its timeout, including
+        while waiting on a slow relation in a pool of workers."""
+        start = time.monotonic()
+        with pytest.raises(SearchCancelled) as exc_info:
+            slow_hg.solve('T', {'A': 1}, timeout=0.1)
+        assert time.monotonic() - start < 2
+        assert exc_info.value.timed_out
+        assert exc_info.value.search_counter == 1
+        assert exc_info.value.explored_edges['B->T'] == [1, 1, 1]
+
+    def test_cancel_token(self, make_cycle_hg):
+        """Tests that a search is stopped by cancelling its token, with
+        the statistics of the partial search."""
+        token = CancelToken()
+        def count(s1, s2):
+            if s1 >= 5:
+                token.cancel()
+            return s1 + s2
+
+        hg = make_cycle_hg(count, stop=100)
+        with pytest.raises(SearchCancelled) as exc_info:
+            hg.solve('T', {'A': 0, 'C': 1}, cancel_token=token)
+        assert not exc_info.value.timed_out
+        assert exc_info.value.search_counter < 20
+        assert exc_info.value.frontier_size > 0
+
+    def test_cancel_token_while_waiting(self, slow_hg):
+        """Tests that cancelling a token stops a search waiting on a slow
+        relation in a pool of workers."""
+        hg = slow_hg
+        for solve in [hg.solve, lambda *args, **kwargs:
+                      asyncio.run(hg.asolve(*args, **kwargs))]:
+            token = CancelToken()
+            threading.Timer(0.1, token.cancel).start()
+            start = time.monotonic()
+            with pytest.raises(SearchCancelled) as exc_info:
+                solve('T', {'A': 1}, cancel_token=token)
+            assert time.monotonic() - start < 2
+            assert not exc_info.value.timed_out
+
+    def test_cancel_entry_points(self, make_cycle_hg):
+        """Tests that simulations, batches, and solve plans are stopped
+        by a cancel token or timeout."""
+        hg = make_cycle_hg(stop=100)
+        token = CancelToken()
+        token.cancel()
+        with pytest.raises(SearchCancelled):
+            hg.simulate('T', {'A': 0, 'C': 1}, min_index=50,
+                        cancel_token=token)
+        with pytest.raises(SearchCancelled):
+            hg.solve_batch('T', {'A': [0, 1], 'C': 1}, cancel_token=token)
+        t = hg.solve('T', {'A': 0, 'C': 1})
+        plan = SolvePlan(t, hg.edges)
+        with pytest.raises(SearchCancelled):
+            plan.replay(hg.nodes, hg.context, cancel_token=token)
+        assert plan.replay(hg.nodes, hg.context).value == t.value
+
+        def slow(s1):
+            time.sleep(0.05)
+            return s1 + 1
+
+        hg = Hypergraph()
+        hg.add_edge('A', 'T', slow)
+        start = time.monotonic()
+        with pytest.raises(SearchCancelled) as exc_info:
+            hg.solve_batch('T', {'A': list(range(100))}, timeout=0.3)
+        assert time.monotonic() - start < 2
+        assert exc_info.value.timed_out
+
+    def test_process_executor(self, make_cycle_hg):
+        """Tests whether a simulation offloading relations to a process
+        pool matches the serial simulation."""
+        inputs = {'A': 0, 'C': 3}
+        t_serial = make_cycle_hg().solve('T', inputs)
+        t_process = make_cycle_hg(executor='process').solve('T', inputs)
+        assert t_process.value == t_serial.value == 12
+        assert t_process.label == t_serial.label
+        assert t_process.values == t_serial.values
+
+    def test_executor_disposal(self):
+        """Tests that offloaded relations returning None neither dispose
+        of their source TNodes nor count as found, as in serial mode."""
+        def make_hg(executor):
+            hg = Hypergraph()
+            hg.add_edge('A', 'B', R.Rfirst)
+            hg.add_edge('B', 'T', lambda s1: None, disposable=['s1'],
+                        executor=executor, label='B->T')
+            return hg
+
+        results = []
+        for executor in [None, 'thread']:
+            hg = make_hg(executor)
+            assert hg.solve('T', {'A': 0}) is None
+            found_tnodes = hg.context.found_tnodes['B->T']
+            results.append(([t.label for t in found_tnodes['B']],
+                             next(hg.context.uids)))
+            hg.close_executors()
+        assert results[0] == results[1]
+        assert len(results[0][0]) == 1
+
+    def test_shared_executors(self):
+        """Tests that the pools of workers are reused between solves
+        until closed."""
+        hg = Hypergraph()
+        hg.add_edge('A', 'T', R.Rincrement, executor='thread')
+        assert hg.solve('T', {'A': 1}).value == 2
+        pool = hg.executors['thread']
+        assert hg.solve('T', {'A': 2}).value == 3
+        assert hg.executors['thread'] is pool
+        hg.close_executors()
+        assert hg.executors == {}
+        assert hg.solve('T', {'A': 3}).value == 4
+        hg.close_executors()
+
+    def test_resolve(self):
+        """Tests whether resolving only recomputes the edges downstream of
+        the changed inputs."""
+        calls = []
+
+        def record(label):
+            def rel(*args):
+                calls.append(label)
+                return sum(args)
+            return rel
+
+        hg = Hypergraph()
+        hg.add_edge('A', 'C', record('C'))
+        hg.add_edge('B', 'D', record('D'))
+        hg.add_edge(['C', 'D'], 'T', record('T'))
+        assert hg.solve('T', {'A': 1, 'B': 2}).value == 3
+        calls.clear()
+        t = hg.resolve({'B': 5})
+        assert t.value == 6
+        assert sorted(calls) == ['D', 'T']
+        assert t.values == hg.solve('T', {'A': 1, 'B': 5}).values
+
+    def test_resolve_fallback(self):
+        """Tests whether resolving solves again if the last solved tree is
+        not viable for the changed inputs."""
+        hg = Hypergraph()
+        hg.add_edge('A', 'T', R.Rfirst, via=R.geq('s1', 0))
+        hg.add_edge('A', 'T', R.Rnegate, via=lambda s1: s1 < 0, weight=2.0)
+        assert hg.solve('T', {'A': 1}).value == 1
+        assert hg.resolve({'A': -3}).value == 3
+
+    def test_simulate(self):
+        """Tests whether stepping a cycle matches searching for a high
+        index of the target."""
+        hg = Hypergraph()
+        hg.add_edge('X0', 'X', R.Rfirst)
+        hg.add_edge('V0', 'V', R.Rfirst)
+        hg.add_edge({'s1': 'X', 's2': 'V'}, 'A', lambda s1, s2: -s1 - 0.1 * s2,
+                    disposable=['s1', 's2'], edge_props='LEVEL')
+        hg.add_edge({'a': 'A', 'v': 'V'}, 'V', lambda a, v: v + 0.1 * a,
+                    index_offset=1, disposable=['a', 'v'])
+        hg.add_edge({'v': 'V', 'x': 'X'}, 'X', lambda v, x: x + 0.1 * v,
+                    index_via=R.offset_by('v', 'x'), disposable=['v', 'x'])
+        hg.add_edge('X', 'T', R.Rfirst, via=lambda s1: s1 < 0)
+        inputs = {'X0': 1.0, 'V0': 0.0}
+
+        t = hg.solve('X', inputs, min_index=40)
+        sim_t = hg.simulate('X', inputs, min_index=40)
+        assert sim_t.index == t.index == 40
+        assert sim_t.values == t.values
+
+        t = hg.solve('T', inputs, min_index=5)
+        sim_t = hg.simulate('T', inputs, min_index=5)
+        assert sim_t.value == t.value < 0
+        assert sim_t.index == t.index
+
+    def test_simulate_fallback(self):
+        """Tests whether simulating searches instead when the stepped
+        path stops being viable."""
+        hg = Hypergraph()
+        hg.add_edge('S', 'A', R.Rfirst)
+        hg.add_edge('A', 'A', R.Rincrement, index_offset=1,
+                    via=lambda s1: s1 < 10)
+        hg.add_edge('A', 'A', lambda s1: s1 + 2, index_offset=1,
+                    via=lambda s1: s1 >= 10, weight=5.0)
+        t = hg.solve('A', {'S': 0}, min_index=20)
+        sim_t = hg.simulate('A', {'S': 0}, min_index=20)
+        assert sim_t.value == t.value
+
+    def test_simulate_records(self):
+        """Tests that a simulation records a single frame and can be
+        solved again for changed inputs at the same index."""
+        hg = Hypergraph()
+        hg.add_edge('S', 'A', R.Rfirst)
+        hg.add_edge('A', 'A', R.Rincrement, index_offset=1)
+        sim_t = hg.simulate('A', {'S': 0}, min_index=100)
+        assert sim_t.index == 100
+        assert len(hg.frames) == 1
+        t = hg.resolve({'S': 5})
+        assert t.index == sim_t.index
+        assert t.value == sim_t.value + 5
+        assert len(hg.frames) == 2
+
+    def test_iter_solve(self):
+        """Tests whether each index of the target is yielded as it is
+        found, matching the value solved for that index."""
+        hg = Hypergraph()
+        hg.add_edge('S', 'A', R.Rfirst)
+        hg.add_edge('A', 'B', R.Rincrement)
+        hg.add_edge({'s1': 'A', 's2': 'B'}, 'A', R.Rsum, index_offset=1,
+                    disposable=['s1', 's2'], edge_props='LEVEL')
+        results = list(hg.iter_solve('A', {'S': 1}, until_index=6,
+                                     watch=['B']))
+        a_results = [(i, v) for label, i, v in results if label == 'A']
+        assert [i for i, _ in a_results] == [1, 2, 3, 4, 5, 6]
+        for i, v in a_results:
+            assert v == hg.solve('A', {'S': 1}, min_index=i).value
+        assert any(label == 'B' for label, _, _ in results)
+
+    def test_iter_solve_memory(self):
+        """Tests whether the trees of explored TNodes are released while
+        iterating, so that disposed TNodes are not kept alive."""
+        hg = Hypergraph()
+        hg.add_edge('A', 'B', R.Rfirst)
+        hg.add_edge('B', 'B', R.Rincrement, index_offset=1, disposable=['s1'])
+        live = []
+        for _, index, _ in hg.iter_solve('B', {'A': 0}, until_index=300):
+            if index % 100 == 0:
+                gc.collect()
+                live.append(sum(isinstance(o, TNode)
+                                for o in gc.get_objects()))
+        assert len(live) == 3
+        assert max(live) < 10, "Explored TNodes kept alive"
+
+    def test_ancestor_pruning(self):
+        """Tests that edges the target does not depend on are never
+        explored, and that the ancestors are cached for each target."""
+        calls = []
+        def Rcount(*args, **kwargs):
+            calls.append(1)
+            return 0
+        hg = Hypergraph()
+        hg.add_edge(['A', 'B'], 'C', R.Rsum)
+        hg.add_edge('A', 'D', Rcount)
+        hg.add_edge('D', 'E', Rcount)
+        t = hg.solve('C', {'A': 1, 'B': 2})
+        assert t.value == 3
+        assert len(calls) == 0, "Explored edge outside of target's ancestors"
+        assert hg.solve('E', {'A': 1}).value == 0
+        assert len(hg.ancestor_edges) == 2
+        hg.add_edge('C', 'E', R.Rfirst, label='C->E')
+        assert 'C->E' in hg.get_ancestor_edges('E')
+
+    def test_missing_sources(self):
+        """Tests that an unreachable target is reported with its missing
+        sources before any relation is called."""
+        calls = []
+        def Rcount(*args, **kwargs):
+            calls.append(1)
+            return sum(args) + sum(kwargs.values())
+        hg = Hypergraph()
+        hg.add_edge(['A', 'B'], 'C', Rcount)
+        hg.add_edge(['C', 'D'], 'E', Rcount)
+        hg.add_edge('E', 'E', Rcount, index_offset=1)
+        assert hg.find_missing_sources('E', ['A', 'B']) == ['D']
+        assert hg.find_missing_sources('E', ['A']) == ['B', 'D']
+        assert hg.find_missing_sources('E', ['C', 'D']) is None
+        with pytest.raises(UnreachableTarget) as exc_info:
+            hg.solve('E', {'A': 1, 'B': 2}, min_index=5)
+        assert exc_info.value.target == 'E'
+        assert exc_info.value.missing_sources == ['D']
+        with pytest.raises(UnreachableTarget):
+            list(hg.iter_solve('E', {'A': 1, 'B': 2}, until_index=5))
+        with pytest.raises(UnreachableTarget):
+            hg.simulate('E', {'A': 1, 'B': 2}, min_index=10)
+        with pytest.raises(UnreachableTarget):
+            asyncio.run(hg.asolve('E', {'A': 1, 'B': 2}))
+        assert len(calls) == 0, "Relation called for unreachable target"
+        assert hg.solve('E', {'A': 1, 'B': 2, 'D': 3}).value == 6
+
+    def test_astar(self, weighted_chain):
+        """Tests that an A* search finds the minimum-cost solution while
+        exploring fewer TNodes."""
+        hg = weighted_chain
+        t = hg.solve('T', {'S': 1}, memory_mode=True)
+        num_explored = len(hg.solved_tnodes)
+        t_astar = hg.solve('T', {'S': 1}, memory_mode=True, astar=True)
+        assert t_astar.value == t.value == -1
+        assert t_astar.cost == t.cost
+        assert len(hg.solved_tnodes) < num_explored
+        assert hg.get_cost_to_go('T')['A0'] == 10.
+
+    def test_search_strategies(self, weighted_chain):
+        """Tests that each search strategy finds a solution, and that a
+        depth-first search follows the branch closest to the target."""
+        t = weighted_chain.solve('T', {'S': 1}, astar=True)
+        for strategy in ['astar', 'depth', 'breadth']:
+            t_strategy = weighted_chain.solve('T', {'S': 1},
+                                              strategy=strategy)
+            assert t_strategy.value == t.value
+
+        hg = Hypergraph(no_weights=True)
+        hg.add_edge('S', 'near', R.Rnegate, label='a')
+        hg.add_edge('S', 'far', R.Rincrement, label='b')
+        prev = 'far'
+        for i in range(5):
+            hg.add_edge(prev, f'B{i}', R.Rincrement)
+            prev = f'B{i}'
+        hg.add_edge(prev, 'T', R.Rmean)
+        hg.add_edge('near', 'T', R.Rmean)
+        t = hg.solve('T', {'S': 1}, memory_mode=True, strategy='depth')
+        assert t.value == -1, "Depth-first search took the longer branch"
+        assert len(hg.solved_tnodes) == 3